@@ -0,0 +1,24 @@
+"""Image variant URLs for properties
+
+Revision ID: a7c4e91f2d35
+Revises: f3b8d21c6a90
+Create Date: 2026-10-17 17:12:08.552170
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c4e91f2d35'
+down_revision = 'f3b8d21c6a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE properties ADD COLUMN IF NOT EXISTS image_variants JSONB")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE properties DROP COLUMN IF EXISTS image_variants")
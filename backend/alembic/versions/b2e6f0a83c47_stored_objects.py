@@ -0,0 +1,39 @@
+"""Reference-counted stored objects for image deduplication
+
+Revision ID: b2e6f0a83c47
+Revises: a7c4e91f2d35
+Create Date: 2026-10-17 18:03:52.270418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e6f0a83c47'
+down_revision = 'a7c4e91f2d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS stored_objects (
+            key VARCHAR(512) PRIMARY KEY,
+            sha256 VARCHAR(64),
+            size BIGINT,
+            content_type VARCHAR(100),
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            released_at TIMESTAMP WITHOUT TIME ZONE,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_stored_objects_sha256 ON stored_objects (sha256)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_stored_objects_unreferenced "
+        "ON stored_objects (released_at) WHERE ref_count <= 0"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS stored_objects")
@@ -0,0 +1,29 @@
+"""Composite index for keyset pagination of properties
+
+Revision ID: c1d4e7a2f903
+Revises: e2c7a9b40d13
+Create Date: 2026-10-17 09:12:04.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1d4e7a2f903'
+down_revision = 'e2c7a9b40d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Base.metadata.create_all on startup also creates this index, so guard
+    # against it already existing.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_properties_created_at_id "
+        "ON properties (created_at, id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_properties_created_at_id")
@@ -0,0 +1,100 @@
+"""Property images table replacing the images JSONB arrays
+
+Revision ID: c9d2a4f61e08
+Revises: b2e6f0a83c47
+Create Date: 2026-10-17 19:41:26.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d2a4f61e08'
+down_revision = 'b2e6f0a83c47'
+branch_labels = None
+depends_on = None
+
+
+def _storage_url_prefix() -> str:
+    """
+    URL prefix of stored objects, as the storage backends built it when this
+    revision was written. Override with `alembic -x storage_url_prefix=...`.
+    """
+    prefix = op.get_context().get_x_argument(as_dictionary=True).get("storage_url_prefix")
+    if prefix is not None:
+        return prefix
+    if settings.STORAGE_BACKEND == "local":
+        return f"{settings.MEDIA_BASE_URL}/"
+    base_url = settings.S3_PUBLIC_URL_OVERRIDE or settings.S3_ENDPOINT
+    return f"{base_url}/{settings.S3_BUCKET}/"
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS property_images (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            property_id UUID NOT NULL REFERENCES properties (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL DEFAULT 0,
+            url VARCHAR(1024) NOT NULL,
+            sha256 VARCHAR(64),
+            width INTEGER,
+            height INTEGER,
+            variants JSONB,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            CONSTRAINT uq_property_images_property_url UNIQUE (property_id, url)
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_property_images_property_position "
+        "ON property_images (property_id, position)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_property_images_sha256 ON property_images (sha256)")
+
+    # Databases bootstrapped by the current create_all never had the arrays
+    conn = op.get_bind()
+    has_images = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'properties' AND column_name = 'images'"
+    )).first()
+
+    if has_images:
+        # Copy the arrays over, keeping order, rendered variants and known content
+        # hashes. Our URLs are the storage URL prefix plus the object key, so hashes
+        # are found by primary key lookups on the derived key.
+        prefix = _storage_url_prefix()
+        conn.execute(sa.text("""
+            INSERT INTO property_images (property_id, position, url, sha256, variants, created_at)
+            SELECT p.id, image.ordinality - 1, image.url, so.sha256,
+                   p.image_variants -> image.url, p.created_at
+            FROM properties p
+            CROSS JOIN LATERAL jsonb_array_elements_text(p.images) WITH ORDINALITY AS image (url, ordinality)
+            LEFT JOIN stored_objects so ON so.key = CASE
+                WHEN left(image.url, length(:prefix)) = :prefix THEN substr(image.url, length(:prefix) + 1)
+            END
+            WHERE jsonb_typeof(p.images) = 'array'
+            ON CONFLICT (property_id, url) DO NOTHING
+        """), {"prefix": prefix})
+
+    op.execute("ALTER TABLE properties DROP COLUMN IF EXISTS images")
+    op.execute("ALTER TABLE properties DROP COLUMN IF EXISTS image_variants")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE properties ADD COLUMN IF NOT EXISTS images JSONB")
+    op.execute("ALTER TABLE properties ADD COLUMN IF NOT EXISTS image_variants JSONB")
+    op.execute("""
+        UPDATE properties p
+        SET images = gallery.images, image_variants = gallery.variants
+        FROM (
+            SELECT property_id,
+                   jsonb_agg(url ORDER BY position, created_at, id) AS images,
+                   jsonb_object_agg(url, variants) FILTER (WHERE variants IS NOT NULL) AS variants
+            FROM property_images
+            GROUP BY property_id
+        ) gallery
+        WHERE p.id = gallery.property_id
+    """)
+    op.execute("DROP TABLE IF EXISTS property_images")
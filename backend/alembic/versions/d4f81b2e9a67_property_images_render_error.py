@@ -0,0 +1,24 @@
+"""Render error for property images that cannot be decoded
+
+Revision ID: d4f81b2e9a67
+Revises: c9d2a4f61e08
+Create Date: 2026-10-17 20:15:26.310954
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f81b2e9a67'
+down_revision = 'c9d2a4f61e08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE property_images ADD COLUMN IF NOT EXISTS render_error VARCHAR(255)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE property_images DROP COLUMN IF EXISTS render_error")
@@ -0,0 +1,36 @@
+"""Weighted full-text search vector for properties
+
+Revision ID: d82f3b6c1e54
+Revises: c1d4e7a2f903
+Create Date: 2026-10-17 10:03:41.552817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd82f3b6c1e54'
+down_revision = 'c1d4e7a2f903'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+        ") STORED"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_properties_search_vector "
+        "ON properties USING gin (search_vector)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_properties_search_vector")
+    op.execute("ALTER TABLE properties DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,70 @@
+"""Properties table
+
+Revision ID: e2c7a9b40d13
+Revises: b6710d09b9a2
+Create Date: 2026-10-17 09:05:41.526093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c7a9b40d13'
+down_revision = 'b6710d09b9a2'
+branch_labels = None
+depends_on = None
+
+
+ENUMS = {
+    "propertytype": ("APARTMENT", "HOUSE", "VILLA", "COMMERCIAL", "LAND"),
+    "propertypurpose": ("SALE", "RENT", "STAY"),
+    "propertystatus": ("DRAFT", "PUBLISHED", "ARCHIVED"),
+}
+
+
+def upgrade() -> None:
+    # Databases bootstrapped by Base.metadata.create_all on startup already
+    # have the table; later migrations only add to it. Created as it stood
+    # before them, images array included.
+    for name, labels in ENUMS.items():
+        values = ", ".join(f"'{label}'" for label in labels)
+        op.execute(
+            f"DO $$ BEGIN CREATE TYPE {name} AS ENUM ({values}); "
+            f"EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+        )
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS properties (
+            id UUID PRIMARY KEY,
+            title VARCHAR(500) NOT NULL,
+            slug VARCHAR(500) NOT NULL,
+            description TEXT,
+            type propertytype NOT NULL,
+            purpose propertypurpose NOT NULL,
+            price NUMERIC(15, 2) NOT NULL,
+            location VARCHAR(255) NOT NULL,
+            address TEXT,
+            latitude NUMERIC(10, 8),
+            longitude NUMERIC(11, 8),
+            bedrooms INTEGER,
+            bathrooms INTEGER,
+            area_sqft INTEGER,
+            features JSONB,
+            images JSONB,
+            status propertystatus NOT NULL,
+            views INTEGER,
+            agent_id UUID NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            published_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_properties_slug ON properties (slug)")
+    for column in ("type", "purpose", "price", "location", "status"):
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_properties_{column} ON properties ({column})")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS properties")
+    for name in ENUMS:
+        op.execute(f"DROP TYPE IF EXISTS {name}")
@@ -0,0 +1,43 @@
+"""Geohash column for spatial property filters
+
+Revision ID: e5a9c0d47b18
+Revises: d82f3b6c1e54
+Create Date: 2026-10-17 11:20:17.904436
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.geo import geohash_encode
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c0d47b18'
+down_revision = 'd82f3b6c1e54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE properties ADD COLUMN IF NOT EXISTS geohash VARCHAR(12)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_properties_geohash "
+        "ON properties (geohash varchar_pattern_ops)"
+    )
+
+    # Backfill existing rows
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, latitude, longitude FROM properties "
+        "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    )).fetchall()
+    for row in rows:
+        conn.execute(
+            sa.text("UPDATE properties SET geohash = :geohash WHERE id = :id"),
+            {"geohash": geohash_encode(float(row.latitude), float(row.longitude)), "id": row.id}
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_properties_geohash")
+    op.execute("ALTER TABLE properties DROP COLUMN IF EXISTS geohash")
@@ -0,0 +1,27 @@
+"""Pattern index on property slugs for slug allocation
+
+Revision ID: f3b8d21c6a90
+Revises: e5a9c0d47b18
+Create Date: 2026-10-17 16:02:41.318902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d21c6a90'
+down_revision = 'e5a9c0d47b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_properties_slug_pattern "
+        "ON properties (slug varchar_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_properties_slug_pattern")
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional
@@ -6,7 +7,13 @@ from datetime import datetime
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import UserResponse
+from app.models.property import PropertyStatus
+from app.schemas.property import PropertyImportFormat, PropertyImportReport, PropertyExportFormat
 from app.core.dependencies import get_current_admin_user
+from app.services.import_service import import_service
+from app.services.export_service import export_service
+from app.services.stored_object_service import stored_object_service
+from app.services.password_service import password_hasher
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -83,6 +90,52 @@ async def update_user_role(
     
     return {"message": f"User role updated to {role}"}
 
+@router.post("/properties/import", response_model=PropertyImportReport)
+async def import_properties(
+    request: Request,
+    format: Optional[PropertyImportFormat] = None,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk import properties from a streamed CSV or JSON Lines request body (Admin only)"""
+    
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = PropertyImportFormat.CSV if "csv" in content_type else PropertyImportFormat.JSONL
+    
+    # The body is parsed as it arrives rather than spooled to disk first
+    return await import_service.run(db, request.stream(), format, current_user.id)
+
+@router.get("/properties/export")
+async def export_properties(
+    format: PropertyExportFormat = PropertyExportFormat.NDJSON,
+    gzip: bool = False,
+    property_status: Optional[PropertyStatus] = Query(None, alias="status"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Stream the whole property catalogue as NDJSON or CSV (Admin only)"""
+    
+    filename = f"properties-{datetime.utcnow():%Y%m%d}.{format.value}"
+    media_type = "application/x-ndjson" if format == PropertyExportFormat.NDJSON else "text/csv"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        export_service.stream(format, compress=gzip, status=property_status),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/storage/gc")
+async def collect_storage_garbage(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Delete stored images no property has referenced for the grace period (Admin only)"""
+    
+    collected = await stored_object_service.collect_garbage()
+    return {"collected": collected}
+
 @router.get("/system/health")
 async def get_system_health(
     current_user: User = Depends(get_current_admin_user),
@@ -99,6 +152,9 @@ async def get_system_health(
         db_status = "degraded"
         db_latency = "timeout"
         
+    # bcrypt pool depth; a queue means logins are waiting for a worker
+    hashing = password_hasher.stats()
+    
     # Mock other services for now
     return {
         "status": "operational",
@@ -107,7 +163,8 @@ async def get_system_health(
             "api": {"status": "healthy", "uptime": "99.9%"},
             "database": {"status": db_status, "latency": db_latency},
             "cache": {"status": "healthy", "latency": "2ms"},
-            "email": {"status": "healthy", "queue": 0}
+            "email": {"status": "healthy", "queue": 0},
+            "password_hashing": {"status": "degraded" if hashing["queued"] else "healthy", **hashing}
         },
         "resources": {
             "cpu": 45,
@@ -10,11 +10,11 @@ from app.schemas.user import (
     MessageResponse
 )
 from app.core.security import (
-    get_password_hash, verify_password,
     create_access_token, create_refresh_token,
     generate_verification_token, generate_reset_token
 )
 from app.services.email_service import email_service
+from app.services.password_service import password_hasher
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -43,7 +43,7 @@ async def register(
     
     new_user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await password_hasher.hash(user_data.password),
         name=user_data.name,
         phone=user_data.phone,
         verification_token=verification_token,
@@ -160,7 +160,7 @@ async def login(
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await password_hasher.verify(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -288,7 +288,7 @@ async def reset_password(
         )
     
     # Update password
-    user.password_hash = get_password_hash(reset_data.new_password)
+    user.password_hash = await password_hasher.hash(reset_data.new_password)
     user.reset_token = None
     user.reset_token_expires = None
     
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException, status, Request, Response
+from fastapi.responses import FileResponse
+from app.config import settings
+from app.core.media import parse_range, PartialFileResponse
+from app.services.storage_backends import LocalBackend
+from app.services.storage_service import storage_service
+import asyncio
+import mimetypes
+import os
+import stat
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+@router.api_route("/{file_key:path}", methods=["GET", "HEAD"])
+async def get_media(
+    file_key: str,
+    request: Request
+):
+    """Serve a file from the local storage backend"""
+    
+    backend = storage_service.backend
+    not_found = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    # Hidden names include in-progress .upload-* temporary files
+    if not isinstance(backend, LocalBackend) or any(part.startswith(".") for part in file_key.split("/")):
+        raise not_found
+    
+    try:
+        path = backend.path(file_key)
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except (ValueError, FileNotFoundError, NotADirectoryError):
+        raise not_found
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise not_found
+    
+    # Keys are content hashes or one-off upload ids, so a file never changes under its URL
+    headers = {
+        "Cache-Control": f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable",
+        "Accept-Ranges": "bytes"
+    }
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    
+    if settings.MEDIA_ACCEL_REDIRECT:
+        # nginx sends the file itself with sendfile, Range requests included
+        headers["X-Accel-Redirect"] = f"{settings.MEDIA_ACCEL_REDIRECT.rstrip('/')}/{file_key}"
+        return Response(media_type=media_type, headers=headers)
+    
+    byte_range = parse_range(request.headers.get("range"), stat_result.st_size)
+    if byte_range is not None:
+        return PartialFileResponse(
+            path, byte_range, stat_result, headers=headers, media_type=media_type, method=request.method
+        )
+    return FileResponse(path, headers=headers, media_type=media_type, stat_result=stat_result, method=request.method)
@@ -1,29 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, File, UploadFile, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
-from typing import Optional, List
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, func, tuple_, or_, any_
+from typing import Optional, List, Union
 from datetime import datetime
+from app.config import settings
 from app.database import get_db
 from app.models.property import Property, PropertyType, PropertyPurpose, PropertyStatus
+from app.models.property_image import PropertyImage
 from app.models.user import User
-from app.schemas.property import PropertyCreate, PropertyUpdate, PropertyResponse, PropertyListResponse
+from app.schemas.property import (
+    PropertyCreate, PropertyUpdate, PropertyResponse, PropertyListResponse,
+    PropertyFilters, PropertySort, PropertyClusterResponse, PropertyFacetsResponse,
+    LocationSuggestion, PropertyView, PropertyCard, PropertyCardListResponse,
+    PropertyBatchRequest, PropertyBatchResponse, PropertyImagePresignRequest,
+    PropertyImagePresignResponse, PresignedUpload, PropertyImageCommitRequest, PropertyImageOrder
+)
 from app.core.dependencies import get_current_user, get_current_active_user
-from app.services.storage_service import storage_service
-import re
+from app.core.pagination import encode_cursor, decode_cursor, CURSOR_NEXT, CURSOR_PREV
+from app.core.geo import parse_point, parse_bbox
+from app.core.uploads import (
+    validate_uploads, check_extension, check_content_type, check_size, check_magic_bytes, SNIFF_SIZE
+)
+from app.core.http_cache import make_etag, body_etag, etag_matches, public_headers, pack, unpack
+from app.services.storage_service import storage_service, StoredFile
+from app.services.stored_object_service import stored_object_service
+from app.services.property_image_service import property_image_service
+from app.services.image_service import image_service
+from app.services.count_service import count_service
+from app.services.cache_service import cache_service, PROPERTIES_SCOPE
+from app.services.view_counter import view_counter
+from app.services.search_service import search_condition, search_rank
+from app.services.geo_service import bbox_condition, radius_condition, distance_km
+from app.services.cluster_index import cluster_index, MAX_ZOOM
+from app.services.facet_service import facet_source, count_facets
+from app.services.location_index import location_index
+from app.services.spelling_index import spelling_index
+from app.services.slug_service import slug_service, create_slug, MAX_ATTEMPTS
+import asyncio
+import uuid
 
 router = APIRouter(prefix="/properties", tags=["Properties"])
 
-def create_slug(title: str) -> str:
-    """Create URL-friendly slug from title"""
-    slug = title.lower()
-    slug = re.sub(r'[^a-z0-9]+', '-', slug)
-    slug = slug.strip('-')
-    return slug
-
-@router.get("", response_model=PropertyListResponse)
-async def list_properties(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
+def get_property_filters(
     type: Optional[PropertyType] = None,
     purpose: Optional[PropertyPurpose] = None,
     status: Optional[PropertyStatus] = None,
@@ -32,75 +51,416 @@ async def list_properties(
     location: Optional[str] = None,
     bedrooms: Optional[int] = None,
     search: Optional[str] = None,
-    current_user: Optional[User] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """List properties with filters and pagination"""
-    
-    # Build query
-    query = select(Property)
+    near: Optional[str] = Query(None, description="lat,lng"),
+    radius_km: Optional[float] = Query(None, gt=0, le=500),
+    bbox: Optional[str] = Query(None, description="min_lng,min_lat,max_lng,max_lat")
+) -> PropertyFilters:
+    """Collect listing filters from query parameters"""
+    # `status` is shadowed by the filter parameter here
+    try:
+        near_point = parse_point(near) if near else None
+        bounds = parse_bbox(bbox) if bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if radius_km and not near_point:
+        raise HTTPException(status_code=400, detail="radius_km requires near")
+    
+    return PropertyFilters(
+        type=type,
+        purpose=purpose,
+        status=status,
+        min_price=min_price,
+        max_price=max_price,
+        location=location,
+        bedrooms=bedrooms,
+        search=search,
+        near=near_point,
+        radius_km=radius_km,
+        bbox=bounds
+    )
+
+async def correct_filters(db: AsyncSession, filters: PropertyFilters, is_admin: bool) -> PropertyFilters:
+    """
+    Filters with typos fixed against the listing vocabulary.
+
+    Corrections only apply when the query as typed matches nothing, so a
+    rare but valid term is never swapped for a more common neighbour.
+    """
+    corrections = {}
+    if filters.search:
+        corrected = spelling_index.correct(filters.search)
+        if corrected:
+            corrections["search"] = corrected
+    if filters.location and not location_index.suggest(filters.location, limit=1):
+        corrected = spelling_index.correct(filters.location)
+        if corrected:
+            corrections["location"] = corrected
+    if not corrections:
+        return filters
+    
+    matches = apply_property_filters(select(Property.id), filters, is_admin)
+    if (await db.execute(select(matches.exists()))).scalar():
+        return filters
+    return filters.model_copy(update={**corrections, "corrections": corrections})
+
+def is_property_admin(user: Optional[User]) -> bool:
+    """Whether user may see unpublished properties"""
+    return bool(user and user.role in ["admin", "super_admin", "agent"])
+
+async def get_editable_property(db: AsyncSession, property_id: str, user: User) -> Property:
+    """Load a property user may modify, or raise 404/403"""
+    stmt = select(Property).where(Property.id == property_id)
+    result = await db.execute(stmt)
+    property = result.scalar_one_or_none()
     
-    # Visibility Logic
-    is_admin = current_user and current_user.role in ["admin", "super_admin", "agent"]
+    if not property:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Property not found"
+        )
+    if user.role not in ["admin", "super_admin"] and str(property.agent_id) != str(user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to modify this property"
+        )
+    return property
+
+def upload_prefix(property_id: uuid.UUID) -> str:
+    """Storage key prefix for a property's directly uploaded images"""
+    return f"properties/{property_id}/"
+
+def apply_property_filters(query, filters: PropertyFilters, is_admin: bool):
+    """Apply visibility rules and listing filters to a Property query"""
     
     if not is_admin:
         # Public: Only show published
         query = query.where(Property.status == PropertyStatus.PUBLISHED)
     else:
         # Admin: Filter by status if provided, otherwise show all
-        if status:
-            query = query.where(Property.status == status)
+        if filters.status:
+            query = query.where(Property.status == filters.status)
 
-    # Apply other filters
-    if type:
-        query = query.where(Property.type == type)
-    if purpose:
-        query = query.where(Property.purpose == purpose)
-    if min_price:
-        query = query.where(Property.price >= min_price)
-    if max_price:
-        query = query.where(Property.price <= max_price)
-    if location:
-        query = query.where(Property.location.ilike(f"%{location}%"))
-    if bedrooms:
-        query = query.where(Property.bedrooms >= bedrooms)
-    if search:
-        query = query.where(
-            or_(
-                Property.title.ilike(f"%{search}%"),
-                Property.description.ilike(f"%{search}%"),
-                Property.location.ilike(f"%{search}%")
-            )
+    if filters.type:
+        query = query.where(Property.type == filters.type)
+    if filters.purpose:
+        query = query.where(Property.purpose == filters.purpose)
+    if filters.min_price:
+        query = query.where(Property.price >= filters.min_price)
+    if filters.max_price:
+        query = query.where(Property.price <= filters.max_price)
+    if filters.location:
+        query = query.where(Property.location.ilike(f"%{filters.location}%"))
+    if filters.bedrooms:
+        query = query.where(Property.bedrooms >= filters.bedrooms)
+    if filters.search:
+        query = query.where(search_condition(filters.search))
+    if filters.bbox:
+        query = query.where(bbox_condition(filters.bbox))
+    if filters.near and filters.radius_km:
+        query = query.where(radius_condition(*filters.near, filters.radius_km))
+    return query
+
+def card_columns() -> list:
+    """Columns to select for PropertyCard, labelled to match its fields"""
+    return [
+        Property.id,
+        Property.slug,
+        Property.title,
+        Property.type,
+        Property.purpose,
+        Property.price,
+        Property.location,
+        Property.latitude,
+        Property.longitude,
+        Property.bedrooms,
+        Property.bathrooms,
+        Property.area_sqft,
+        # Card-sized rendition of the first image once it has been processed;
+        # a per-row index probe, so other gallery rows are never read
+        select(func.coalesce(PropertyImage.variants["card"].astext, PropertyImage.url))
+        .where(PropertyImage.property_id == Property.id)
+        .order_by(PropertyImage.position, PropertyImage.created_at, PropertyImage.id)
+        .limit(1)
+        .scalar_subquery()
+        .label("cover_image"),
+        Property.status,
+        Property.created_at
+    ]
+
+@router.get("", response_model=Union[PropertyListResponse, PropertyCardListResponse])
+async def list_properties(
+    request: Request,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    sort: Optional[PropertySort] = None,
+    view: PropertyView = PropertyView.FULL,
+    filters: PropertyFilters = Depends(get_property_filters),
+    current_user: Optional[User] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """List properties with filters and pagination (page number or keyset cursor)"""
+    
+    is_admin = is_property_admin(current_user)
+    
+    by_distance = sort == PropertySort.DISTANCE
+    if by_distance and not filters.near:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sort=distance requires near"
+        )
+    if sort == PropertySort.RELEVANCE and not filters.search:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sort=relevance requires search"
+        )
+    if cursor and sort not in (None, PropertySort.NEWEST):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination only supports newest-first order"
         )
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Public listings are served from the response cache when possible. Totals
+    # and view counts can change without a write, so the ETag hashes the body
+    if_none_match = request.headers.get("if-none-match")
+    cache_key = None
+    cache_version = None
+    if not is_admin:
+        cache_key = f"list:{filters.cache_key()}:{page}:{page_size}:{cursor}:{include_total}:{sort}:{view.value}"
+        cache_version, cached = await cache_service.get(PROPERTIES_SCOPE, cache_key)
+        headers, _, body = unpack(cached) if cached is not None else (None, {}, None)
+        if headers is not None:
+            if etag_matches(if_none_match, headers["ETag"]):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+    
+    # Reject bad cursors before spending any queries on the listing
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    filters = await correct_filters(db, filters, is_admin)
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(Property.created_at.desc())
+    # Cards are built straight from the selected columns, skipping the ORM
+    cards = view == PropertyView.CARD
+    columns = card_columns() if cards else [Property]
+    query = apply_property_filters(select(*columns), filters, is_admin)
+    
+    # Exact for small result sets, cached or estimated for large ones
+    total = None
+    total_exact = None
+    if include_total:
+        total, total_exact = await count_service.count(db, query, filters.cache_key(is_admin))
     
-    # Execute query
-    result = await db.execute(query)
-    properties = result.scalars().all()
+    # Searches are ordered by relevance unless another order is requested;
+    # cursors only apply to newest-first order
+    ranked = sort == PropertySort.RELEVANCE or (bool(filters.search) and not cursor and sort is None)
+    keyset = not ranked and not by_distance
     
-    return PropertyListResponse(
-        properties=[PropertyResponse.from_orm(p) for p in properties],
+    # Apply pagination
+    if position is not None:
+        # Seek past the cursor row on the (created_at, id) index
+        key = tuple_(Property.created_at, Property.id)
+        if position.direction == CURSOR_PREV:
+            query = query.where(key > tuple_(position.created_at, position.id))
+            query = query.order_by(Property.created_at.asc(), Property.id.asc())
+        else:
+            query = query.where(key < tuple_(position.created_at, position.id))
+            query = query.order_by(Property.created_at.desc(), Property.id.desc())
+        
+        result = await db.execute(query.limit(page_size + 1))
+        properties = list(result.all() if cards else result.scalars().all())
+        has_more = len(properties) > page_size
+        properties = properties[:page_size]
+        
+        if position.direction == CURSOR_PREV:
+            properties.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, True
+    else:
+        offset = (page - 1) * page_size
+        if by_distance:
+            query = query.order_by(distance_km(*filters.near).asc().nulls_last(), Property.created_at.desc(), Property.id.desc())
+        elif ranked:
+            query = query.order_by(search_rank(filters.search).desc(), Property.created_at.desc(), Property.id.desc())
+        else:
+            query = query.order_by(Property.created_at.desc(), Property.id.desc())
+        query = query.offset(offset).limit(page_size + 1)
+        
+        result = await db.execute(query)
+        properties = list(result.all() if cards else result.scalars().all())
+        has_next = len(properties) > page_size
+        properties = properties[:page_size]
+        has_prev = page > 1
+    
+    next_cursor = None
+    prev_cursor = None
+    if properties and keyset:
+        if has_next:
+            last = properties[-1]
+            next_cursor = encode_cursor(last.created_at, last.id, CURSOR_NEXT)
+        if has_prev:
+            first = properties[0]
+            prev_cursor = encode_cursor(first.created_at, first.id, CURSOR_PREV)
+    
+    response_class = PropertyCardListResponse if cards else PropertyListResponse
+    response = response_class(
+        properties=[
+            PropertyCard.from_row(p) if cards else PropertyResponse.from_orm(p)
+            for p in properties
+        ],
         total=total,
+        total_exact=total_exact,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        corrections=filters.corrections or None
+    )
+    
+    if cache_key is None:
+        return response
+    
+    body = response.model_dump_json().encode()
+    headers = public_headers(body_etag(body))
+    await cache_service.set(PROPERTIES_SCOPE, cache_key, cache_version, pack(headers, body))
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/clusters", response_model=PropertyClusterResponse)
+async def get_property_clusters(
+    bbox: str = Query(..., description="min_lng,min_lat,max_lng,max_lat"),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM),
+    db: AsyncSession = Depends(get_db)
+):
+    """Clustered marker counts and centroids for published listings in a map view"""
+    try:
+        bounds = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    await cluster_index.ensure_fresh(db)
+    
+    return PropertyClusterResponse(
+        zoom=zoom,
+        clusters=cluster_index.query(bounds, zoom)
     )
 
+@router.get("/facets", response_model=PropertyFacetsResponse)
+async def get_property_facets(
+    filters: PropertyFilters = Depends(get_property_filters),
+    current_user: Optional[User] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Counts per type, purpose, bedroom bucket and price band for the given filters"""
+    
+    is_admin = is_property_admin(current_user)
+    cache_key = f"facets:{filters.cache_key(is_admin)}"
+    cache_version, cached = await cache_service.get(PROPERTIES_SCOPE, cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    filters = await correct_filters(db, filters, is_admin)
+    source = apply_property_filters(facet_source(), filters, is_admin)
+    response = PropertyFacetsResponse(**await count_facets(db, source))
+    
+    body = response.model_dump_json().encode()
+    await cache_service.set(PROPERTIES_SCOPE, cache_key, cache_version, body)
+    return Response(content=body, media_type="application/json")
+
+@router.get("/locations/suggest", response_model=List[LocationSuggestion])
+async def suggest_locations(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Autocomplete locations from the in-memory prefix index"""
+    return location_index.suggest(q, limit)
+
+@router.post("/batch", response_model=PropertyBatchResponse)
+async def get_properties_batch(
+    batch: PropertyBatchRequest,
+    current_user: Optional[User] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get many properties by ID or slug in one query"""
+    # Each key is looked up as an id if it parses as a UUID, otherwise as a slug
+    keys = list(dict.fromkeys(batch.ids))
+    lookups = {}
+    ids = []
+    slugs = []
+    for key in keys:
+        try:
+            property_id = uuid.UUID(key)
+        except ValueError:
+            lookups[key] = key
+            slugs.append(key)
+        else:
+            lookups[key] = property_id
+            ids.append(property_id)
+    
+    conditions = []
+    if ids:
+        conditions.append(Property.id == any_(ids))
+    if slugs:
+        conditions.append(Property.slug == any_(slugs))
+    stmt = select(Property).where(or_(*conditions))
+    if not is_property_admin(current_user):
+        stmt = stmt.where(Property.status == PropertyStatus.PUBLISHED)
+    result = await db.execute(stmt)
+    
+    found = {}
+    for property in result.scalars().all():
+        found[property.id] = property
+        found[property.slug] = property
+    
+    properties = []
+    missing = []
+    for key in keys:
+        property = found.get(lookups[key])
+        if property is None:
+            missing.append(key)
+        else:
+            properties.append(PropertyResponse.from_orm(property))
+    
+    return PropertyBatchResponse(properties=properties, missing=missing)
+
 @router.get("/{slug}", response_model=PropertyResponse)
 async def get_property(
     slug: str,
+    request: Request,
     current_user: Optional[User] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get property by slug"""
     
+    is_admin = is_property_admin(current_user)
+    
+    if_none_match = request.headers.get("if-none-match")
+    cache_key = f"detail:{slug}"
+    cache_version = None
+    if not is_admin:
+        cache_version, cached = await cache_service.get(PROPERTIES_SCOPE, cache_key)
+        headers, meta, body = unpack(cached) if cached is not None else (None, {}, None)
+        if headers is not None:
+            # Counted by id: the slug may be renamed before the views are flushed
+            view_counter.record(property_id=uuid.UUID(meta["id"]))
+            if etag_matches(if_none_match, headers["ETag"]):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+    
     stmt = select(Property).where(Property.slug == slug)
     result = await db.execute(stmt)
     property = result.scalar_one_or_none()
@@ -113,18 +473,31 @@ async def get_property(
     
     # Check visibility
     if property.status != PropertyStatus.PUBLISHED:
-        is_admin = current_user and current_user.role in ["admin", "super_admin", "agent"]
         if not is_admin:
              raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Property not found"
             )
     
-    # Increment views
-    property.views += 1
-    await db.commit()
+    # Views are buffered and written in batches, keeping this a pure read
+    view_counter.record(property_id=property.id)
     
-    return PropertyResponse.from_orm(property)
+    if is_admin or property.status != PropertyStatus.PUBLISHED:
+        return PropertyResponse.from_orm(property)
+    
+    # Answer revalidations before serializing; view counts alone do not change the
+    # version, so the tag is weak. Gallery edits leave the property row alone, so
+    # the gallery is part of the version
+    gallery = [(photo.id, photo.position, photo.variants is not None) for photo in property.photos]
+    headers = public_headers(make_etag(property.id, property.updated_at, gallery, weak=True))
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    body = PropertyResponse.from_orm(property).model_dump_json().encode()
+    await cache_service.set(
+        PROPERTIES_SCOPE, cache_key, cache_version, pack(headers, body, {"id": str(property.id)})
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.get("/id/{property_id}", response_model=PropertyResponse)
 async def get_property_by_id(
@@ -158,30 +531,24 @@ async def create_property(
             detail="Only agents and admins can create properties"
         )
     
-    # Create slug
-    base_slug = create_slug(property_data.title)
-    slug = base_slug
-    counter = 1
-    
-    # Ensure unique slug
-    while True:
-        stmt = select(Property).where(Property.slug == slug)
-        result = await db.execute(stmt)
-        if not result.scalar_one_or_none():
-            break
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-    
-    # Create property
-    new_property = Property(
-        **property_data.dict(),
-        slug=slug,
-        agent_id=current_user.id
+    # Create property under a unique slug
+    new_property = await slug_service.insert(
+        db,
+        {**property_data.dict(exclude={"images"}), "agent_id": current_user.id},
+        create_slug(property_data.title)
     )
+    if new_property is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Could not allocate a unique slug, please retry"
+        )
     
-    db.add(new_property)
+    await property_image_service.append(db, new_property.id, ((url, None) for url in property_data.images or []))
     await db.commit()
     await db.refresh(new_property)
+    await cache_service.invalidate(PROPERTIES_SCOPE)
+    cluster_index.sync(new_property)
+    location_index.mark_stale()
     
     return PropertyResponse.from_orm(new_property)
 
@@ -215,30 +582,44 @@ async def update_property(
     update_data = property_data.dict(exclude_unset=True)
     
     # Update slug if title changed
-    if "title" in update_data:
-        base_slug = create_slug(update_data["title"])
-        slug = base_slug
-        counter = 1
-        
-        while True:
-            stmt = select(Property).where(Property.slug == slug, Property.id != property_id)
-            result = await db.execute(stmt)
-            if not result.scalar_one_or_none():
-                break
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-        
-        update_data["slug"] = slug
+    base_slug = create_slug(update_data["title"]) if "title" in update_data else None
+    if base_slug and slug_service.is_sibling(property.slug, base_slug):
+        base_slug = None
     
     # Set published_at if status changed to published
     if update_data.get("status") == PropertyStatus.PUBLISHED and property.status != PropertyStatus.PUBLISHED:
         update_data["published_at"] = datetime.utcnow()
     
+    if "images" in update_data:
+        await property_image_service.replace(db, property, update_data.pop("images"))
     for key, value in update_data.items():
         setattr(property, key, value)
     
+    if base_slug:
+        # Write the other changes first: a failed savepoint must only undo the slug,
+        # and expires what it touched, so nothing is read back from property in the loop
+        property_id = property.id
+        await db.flush()
+        
+        # Retry in a savepoint if a concurrent write takes the slug first
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                async with db.begin_nested():
+                    property.slug = await slug_service.allocate(db, base_slug, exclude_id=property_id)
+                    await db.flush()
+                break
+            except IntegrityError:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Could not allocate a unique slug, please retry"
+                    )
+    
     await db.commit()
     await db.refresh(property)
+    await cache_service.invalidate(PROPERTIES_SCOPE)
+    cluster_index.sync(property)
+    location_index.mark_stale()
     
     return PropertyResponse.from_orm(property)
 
@@ -267,8 +648,13 @@ async def delete_property(
             detail="Not authorized to delete this property"
         )
     
+    # Gallery rows go with the property (ON DELETE CASCADE); their storage references here
+    await stored_object_service.update_refs(db, property.images, [])
     await db.delete(property)
     await db.commit()
+    await cache_service.invalidate(PROPERTIES_SCOPE)
+    cluster_index.remove(property.id)
+    location_index.mark_stale()
     
     return None
 
@@ -279,19 +665,22 @@ async def track_property_view(
 ):
     """Track property view"""
     
-    stmt = select(Property).where(Property.id == property_id)
-    result = await db.execute(stmt)
-    property = result.scalar_one_or_none()
+    try:
+        id = uuid.UUID(property_id)
+    except ValueError:
+        return None
     
-    if property:
-        property.views += 1
-        await db.commit()
+    # Only buffer views of real properties; unknown ids would sit in the buffer for good
+    exists = select(Property.id).where(Property.id == id).exists()
+    if (await db.execute(select(exists))).scalar():
+        view_counter.record(property_id=id)
     
     return None
 
 @router.post("/{property_id}/images", response_model=PropertyResponse)
 async def upload_property_images(
     property_id: str,
+    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
@@ -315,16 +704,176 @@ async def upload_property_images(
             detail="Not authorized to upload images for this property"
         )
     
-    uploaded_urls = []
-    for file in files:
-        url = await storage_service.upload_file(file)
-        uploaded_urls.append(url)
+    validate_uploads(files)
+    stored = await stored_object_service.store_uploads(files)
+    
+    # New rows only; concurrent uploads to the same property do not overwrite each other
+    await property_image_service.append(db, property.id, ((file.url, file.sha256) for file in stored))
+    
+    await db.commit()
+    await db.refresh(property)
+    await cache_service.invalidate(PROPERTIES_SCOPE)
+    
+    # Thumbnails and WebP variants are rendered after the response is sent
+    background_tasks.add_task(image_service.process_property, property.id)
+    
+    return property
+
+@router.post("/{property_id}/images/presign", response_model=PropertyImagePresignResponse)
+async def presign_property_images(
+    property_id: str,
+    upload_request: PropertyImagePresignRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Issue presigned URLs for uploading images straight to storage"""
+    
+    property = await get_editable_property(db, property_id, current_user)
+    
+    if len(upload_request.files) > settings.MAX_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_UPLOAD_FILES} files per upload"
+        )
+    
+    uploads = []
+    pending = []
+    for upload in upload_request.files:
+        extension = check_extension(upload.filename)
+        check_content_type(upload.filename, upload.content_type)
+        check_size(upload.filename, upload.size)
+        
+        key = f"{upload_prefix(property.id)}{uuid.uuid4()}.{extension}"
+        # The storage policy holds the client to the declared type and size
+        presigned = storage_service.presign_upload(key, upload.content_type, upload.size)
+        if presigned is None:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Direct uploads are not supported by this storage backend"
+            )
+        uploads.append(PresignedUpload(key=key, url=presigned["url"], fields=presigned["fields"]))
+        pending.append(StoredFile(
+            key=key,
+            url=storage_service.public_url(key),
+            sha256=None,
+            size=upload.size,
+            content_type=upload.content_type
+        ))
+    
+    # Uploads that are never committed stay unreferenced and are collected
+    await stored_object_service.claim(pending)
+    
+    return PropertyImagePresignResponse(uploads=uploads, expires_in=settings.PRESIGNED_UPLOAD_EXPIRY)
+
+@router.post("/{property_id}/images/commit", response_model=PropertyResponse)
+async def commit_property_images(
+    property_id: str,
+    commit_request: PropertyImageCommitRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Attach images uploaded through presigned URLs to a property"""
+    
+    property = await get_editable_property(db, property_id, current_user)
+    
+    prefix = upload_prefix(property.id)
+    keys = list(dict.fromkeys(commit_request.keys))
+    foreign = [key for key in keys if not key.startswith(prefix) or "/" in key[len(prefix):]]
+    if foreign:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Not uploads for this property: {', '.join(foreign)}"
+        )
+    
+    heads = await asyncio.gather(*(storage_service.head(key) for key in keys))
+    missing = [key for key, head in zip(keys, heads) if head is None]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Uploads not found: {', '.join(missing)}"
+        )
+    
+    # Only object metadata and the first bytes of each file pass through the API
+    starts = await asyncio.gather(*(storage_service.read_head(key, SNIFF_SIZE) for key in keys))
+    for key, head, start in zip(keys, heads, starts):
+        try:
+            check_extension(key)
+            check_size(key, head.size)
+            check_magic_bytes(key, start)
+        except HTTPException:
+            await storage_service.delete_url(storage_service.public_url(key))
+            raise
+    
+    await stored_object_service.claim([
+        StoredFile(
+            key=key,
+            url=storage_service.public_url(key),
+            sha256=None,
+            size=head.size,
+            content_type=head.content_type
+        )
+        for key, head in zip(keys, heads)
+    ])
+    
+    await property_image_service.append(db, property.id, ((storage_service.public_url(key), None) for key in keys))
+    
+    await db.commit()
+    await db.refresh(property)
+    await cache_service.invalidate(PROPERTIES_SCOPE)
+    
+    background_tasks.add_task(image_service.process_property, property.id)
+    
+    return property
+
+@router.put("/{property_id}/images/order", response_model=PropertyResponse)
+async def reorder_property_images(
+    property_id: str,
+    order: PropertyImageOrder,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Reorder a property's images; the first becomes the cover"""
+    
+    property = await get_editable_property(db, property_id, current_user)
+    
+    photos = {photo.id: photo for photo in property.photos}
+    if len(order.ids) != len(photos) or set(order.ids) != set(photos):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Order must list every image of the property exactly once"
+        )
     
-    # Update property images list
-    current_images = property.images or []
-    property.images = current_images + uploaded_urls
+    # Only rows whose position changes are written
+    for position, image_id in enumerate(order.ids):
+        photos[image_id].position = position
     
     await db.commit()
     await db.refresh(property)
+    await cache_service.invalidate(PROPERTIES_SCOPE)
     
     return property
+
+@router.delete("/{property_id}/images/{image_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_property_image(
+    property_id: str,
+    image_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove an image from a property"""
+    
+    property = await get_editable_property(db, property_id, current_user)
+    
+    photo = next((photo for photo in property.photos if photo.id == image_id), None)
+    if photo is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+    
+    await property_image_service.remove(db, photo)
+    await db.commit()
+    await cache_service.invalidate(PROPERTIES_SCOPE)
+    
+    return None
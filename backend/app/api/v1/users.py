@@ -5,7 +5,7 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserUpdate, UserResponse, PasswordChange, MessageResponse
 from app.core.dependencies import get_current_active_user
-from app.core.security import verify_password, get_password_hash
+from app.services.password_service import password_hasher
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -45,13 +45,13 @@ async def change_password(
 ):
     """Change current user password"""
     
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await password_hasher.verify(password_data.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
         )
     
-    current_user.password_hash = get_password_hash(password_data.new_password)
+    current_user.password_hash = await password_hasher.hash(password_data.new_password)
     
     await db.commit()
     
@@ -25,12 +25,23 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_URL: str
     
+    # Response cache
+    CACHE_ENABLED: bool = True
+    CACHE_TTL: int = 300  # seconds
+    CACHE_SOCKET_TIMEOUT: float = 0.25  # seconds
+    CACHE_RETRY_AFTER: int = 30  # seconds to bypass Redis after a failure
+    HTTP_CACHE_MAX_AGE: int = 60  # Cache-Control max-age for public responses
+    
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing
+    PASSWORD_HASH_WORKERS: int = 2  # threads running bcrypt
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32  # waiting hash/verify calls before 503
+    
     # Email
     SMTP_HOST: str
     SMTP_PORT: int
@@ -53,10 +64,32 @@ class Settings(BaseSettings):
     # Analytics
     MIXPANEL_TOKEN: str = ""
     
+    # Listings
+    COUNT_EXACT_THRESHOLD: int = 1000  # planner estimate below which totals are counted exactly
+    COUNT_CACHE_TTL: int = 300  # seconds
+    VIEW_FLUSH_INTERVAL: float = 10.0  # seconds between view count flushes
+    VIEW_FLUSH_BATCH_SIZE: int = 500
+    CLUSTER_REFRESH_INTERVAL: int = 300  # seconds between full map cluster rebuilds
+    LOCATION_INDEX_REFRESH_INTERVAL: int = 300  # seconds between location autocomplete rebuilds
+    LOCATION_INDEX_MIN_REFRESH_INTERVAL: int = 30  # seconds; property writes rebuild the index at most this often
+    SPELLING_INDEX_REFRESH_INTERVAL: int = 300  # seconds between search vocabulary rebuilds
+    TERM_STATS_REFRESH_INTERVAL: int = 900  # seconds between relevance statistics rebuilds
+    INDEX_WATCH_INTERVAL: float = 10.0  # seconds between checks for bulk changes made by other processes
+    IMPORT_BATCH_SIZE: int = 1000  # rows per COPY + upsert transaction
+    IMPORT_MAX_ERRORS: int = 1000  # row errors kept in an import report
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round trip
+    FACET_PRICE_BANDS: str = "10000,50000,100000,500000,1000000,5000000"  # upper bounds
+    
     # File Upload
     MAX_FILE_SIZE: int = 10485760
+    MAX_UPLOAD_FILES: int = 10  # files per upload request
     ALLOWED_EXTENSIONS: str = "jpg,jpeg,png,pdf"
-    UPLOAD_DIR: str = "./uploads"
+    STORAGE_BACKEND: str = "s3"  # s3 or local
+    UPLOAD_DIR: str = "./uploads"  # root of the local storage backend
+    MEDIA_BASE_URL: str = "http://localhost:8000/api/v1/media"  # public URL of locally stored files
+    MEDIA_CACHE_MAX_AGE: int = 31536000  # stored files never change under a key
+    # Without it, the API streams files and byte ranges through Python rather than with sendfile
+    MEDIA_ACCEL_REDIRECT: str = ""  # e.g. /protected-media/: hand file sends to nginx via X-Accel-Redirect
 
     # MinIO / S3 Storage
 
@@ -70,6 +103,16 @@ class Settings(BaseSettings):
     S3_USE_SSL: bool = False
     S3_REGION: str = "us-east-1"
     S3_PUBLIC_URL_OVERRIDE: str = "" # Useful for Docker
+    S3_PRESIGN_ENDPOINT: str = ""  # browser-reachable endpoint for presigned uploads; defaults to S3_ENDPOINT
+    PRESIGNED_UPLOAD_EXPIRY: int = 900  # seconds a presigned upload stays valid
+    STORAGE_GC_GRACE_PERIOD: int = 86400  # seconds an unreferenced object is kept before deletion
+    S3_MAX_WORKERS: int = 8  # threads (and pooled connections) for blocking S3 calls
+    S3_MULTIPART_THRESHOLD: int = 8388608  # bytes; larger files upload in parts
+    S3_MULTIPART_CHUNK_SIZE: int = 8388608
+    UPLOAD_CONCURRENCY: int = 4  # files uploaded in parallel per request
+    IMAGE_WORKERS: int = 2  # processes rendering image variants
+    IMAGE_VARIANT_FORMAT: str = "webp"  # webp or jpeg
+    IMAGE_VARIANT_QUALITY: int = 80
     
     # Admin
     ADMIN_EMAIL: str
@@ -83,6 +126,10 @@ class Settings(BaseSettings):
     def allowed_extensions_list(self) -> List[str]:
         return [ext.strip() for ext in self.ALLOWED_EXTENSIONS.split(",")]
     
+    @property
+    def facet_price_bands_list(self) -> List[int]:
+        return sorted(int(band.strip()) for band in self.FACET_PRICE_BANDS.split(","))
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,112 @@
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9  # ~5m cells, plenty for listings
+MAX_COVER_CELLS = 32
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# (min_lng, min_lat, max_lng, max_lat)
+BBox = Tuple[float, float, float, float]
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a coordinate as a geohash string"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        rng, coord = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """Width and height in degrees of a geohash cell"""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 360.0 / (1 << lng_bits), 180.0 / (1 << lat_bits)
+
+def geohash_cover(bbox: BBox, max_cells: int = MAX_COVER_CELLS) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover bbox.
+
+    Uses the finest precision that needs at most max_cells prefixes, so
+    each prefix becomes a cheap range scan on the geohash index.
+    """
+    min_lng, min_lat, max_lng, max_lat = bbox
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        width, height = geohash_cell_size(precision)
+        cols = math.floor(max_lng / width) - math.floor(min_lng / width) + 1
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        if cols * rows > max_cells:
+            continue
+        cells = set()
+        for row in range(rows):
+            lat = min(min_lat + row * height, max_lat)
+            for col in range(cols):
+                lng = min(min_lng + col * width, max_lng)
+                cells.add(geohash_encode(lat, lng, precision))
+        # Make sure the far edges are covered despite float stepping
+        for lat in (min_lat, max_lat):
+            for lng in (min_lng, max_lng):
+                cells.add(geohash_encode(lat, lng, precision))
+        return sorted(cells)
+    return []
+
+def radius_bboxes(latitude: float, longitude: float, radius_km: float) -> List[BBox]:
+    """
+    Bounding boxes together enclosing a circle of radius_km around a point.
+
+    A circle crossing the antimeridian gets one box on each side of it; one
+    reaching a pole spans every longitude.
+    """
+    distance = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(distance)
+    min_lat, max_lat = max(latitude - dlat, -90.0), min(latitude + dlat, 90.0)
+    # Widest longitude offset on the circle, which lies poleward of the centre
+    sin_ratio = math.sin(distance) / max(math.cos(math.radians(latitude)), 1e-12)
+    if min_lat <= -90.0 or max_lat >= 90.0 or sin_ratio >= 1:
+        return [(-180.0, min_lat, 180.0, max_lat)]
+    dlng = math.degrees(math.asin(sin_ratio))
+    min_lng, max_lng = longitude - dlng, longitude + dlng
+    if min_lng < -180.0:
+        return [(min_lng + 360.0, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lng, max_lat)]
+    if max_lng > 180.0:
+        return [(min_lng, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lng - 360.0, max_lat)]
+    return [(min_lng, min_lat, max_lng, max_lat)]
+
+def parse_point(value: str) -> Tuple[float, float]:
+    """Parse 'lat,lng', raising ValueError if malformed or out of range"""
+    parts = [float(p) for p in value.split(",")]
+    if len(parts) != 2:
+        raise ValueError("Expected 'lat,lng'")
+    lat, lng = parts
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError("Coordinates out of range")
+    return lat, lng
+
+def parse_bbox(value: str) -> BBox:
+    """Parse 'min_lng,min_lat,max_lng,max_lat', raising ValueError if malformed"""
+    parts = [float(p) for p in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("Expected 'min_lng,min_lat,max_lng,max_lat'")
+    min_lng, min_lat, max_lng, max_lat = parts
+    if not (-180 <= min_lng <= max_lng <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise ValueError("Invalid bounding box")
+    return min_lng, min_lat, max_lng, max_lat
@@ -0,0 +1,59 @@
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+from app.config import settings
+
+def make_etag(*parts, weak: bool = False) -> str:
+    """
+    ETag over the given version parts.
+
+    Weak tags are for versions that do not cover every byte of the body,
+    e.g. a detail whose view count moves without its version changing.
+    """
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+    return f'{"W/" if weak else ""}"{digest[:32]}"'
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag over a rendered response body"""
+    return f'"{hashlib.sha1(body).hexdigest()[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag.removeprefix("W/"):
+            return True
+    return False
+
+def public_headers(etag: str) -> Dict[str, str]:
+    """
+    Validator and caching headers for a public response.
+
+    There is no Last-Modified: gallery reorders and removals change a
+    property's representation without leaving a timestamp behind.
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}",
+        # Admins and agents, signed in through the access_token cookie,
+        # see different content for the same URL
+        "Vary": "Cookie"
+    }
+
+def pack(headers: Dict[str, str], body: bytes, meta: Optional[Dict[str, str]] = None) -> bytes:
+    """Store response headers, and anything the handler needs on a hit, alongside a cached body"""
+    return json.dumps({"headers": headers, "meta": meta or {}}).encode() + b"\n" + body
+
+def unpack(value: bytes) -> Tuple[Optional[Dict[str, str]], Dict[str, str], bytes]:
+    """Split a packed cache entry into (headers, meta, body)"""
+    head, _, body = value.partition(b"\n")
+    try:
+        entry = json.loads(head)
+    except ValueError:
+        return None, {}, value
+    # Entries in an older layout are treated as misses
+    if not isinstance(entry, dict) or "ETag" not in (entry.get("headers") or {}):
+        return None, {}, value
+    return entry["headers"], entry.get("meta") or {}, body
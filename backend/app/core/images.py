@@ -0,0 +1,56 @@
+from PIL import Image, ImageOps
+from typing import Dict, Tuple
+import io
+import os
+
+# Bounding boxes for each derivative; aspect ratio is preserved
+VARIANTS = {
+    "thumb": (320, 240),
+    "card": (800, 600),
+    "full": (1920, 1440),
+}
+
+CONTENT_TYPES = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+
+# Uploads that can be decoded and resized; PDFs are stored as they are
+RASTER_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+
+SAVE_OPTIONS = {
+    "webp": {"method": 4},
+    "jpeg": {"optimize": True, "progressive": True},
+}
+
+def is_raster(key: str) -> bool:
+    return os.path.splitext(key)[1].lower() in RASTER_EXTENSIONS
+
+def render_variants(data: bytes, format: str = "webp", quality: int = 80) -> Tuple[Tuple[int, int], Dict[str, bytes]]:
+    """
+    Encode every variant of an image; returns the upright (width, height) and the variants.
+
+    CPU bound and self-contained, so it can run in a worker process: it only
+    takes and returns bytes.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        # Apply camera rotation before EXIF is dropped by re-encoding
+        image = ImageOps.exif_transpose(original)
+        # Palette and greyscale images may carry transparency in their info
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        if format == "jpeg" and has_alpha:
+            # JPEG has no alpha channel: flatten onto white, not black
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, "white")
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif format == "jpeg" or image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        variants = {}
+        for name, size in VARIANTS.items():
+            variant = image.copy()
+            variant.thumbnail(size, Image.LANCZOS)
+            buffer = io.BytesIO()
+            variant.save(buffer, format=format.upper(), quality=quality, **SAVE_OPTIONS[format])
+            variants[name] = buffer.getvalue()
+        return image.size, variants
@@ -0,0 +1,75 @@
+from fastapi import HTTPException, status
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+from typing import Optional, Tuple
+import anyio
+import os
+import re
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive byte range requested by a Range header, or None for the whole file.
+
+    Only single ranges are served; multipart/byteranges requests get the whole
+    file, which RFC 9110 allows. Malformed ranges, including ones that end
+    before they start, are ignored as RFC 9110 requires.
+    """
+    match = _RANGE_RE.fullmatch(header.strip()) if header else None
+    if not match or not any(match.groups()):
+        return None
+    start, end = match.groups()
+    if start:
+        first = int(start)
+        if end and int(end) < first:
+            return None
+        last = min(int(end), size - 1) if end else size - 1
+    else:
+        # Suffix range: the last N bytes
+        first = max(size - int(end), 0)
+        last = size - 1
+    if first >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return first, last
+
+class PartialFileResponse(FileResponse):
+    """
+    206 response carrying one byte range of a file.
+
+    The range is read through Python in chunks, like FileResponse does for
+    whole files; only MEDIA_ACCEL_REDIRECT hands sends to nginx's sendfile.
+    """
+
+    def __init__(self, path: str, byte_range: Tuple[int, int], stat_result: os.stat_result, **kwargs):
+        super().__init__(path, status_code=status.HTTP_206_PARTIAL_CONTENT, stat_result=stat_result, **kwargs)
+        self.start, self.end = byte_range
+        self.headers["content-length"] = str(self.end - self.start + 1)
+        self.headers["content-range"] = f"bytes {self.start}-{self.end}/{stat_result.st_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.end - self.start + 1
+            while remaining:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining:
+                # File shrank underneath us; end the body rather than hang the client
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
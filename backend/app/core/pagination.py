@@ -0,0 +1,43 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from uuid import UUID
+
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position in a (created_at desc, id desc) ordered listing"""
+    created_at: datetime
+    id: UUID
+    direction: str = CURSOR_NEXT
+
+def encode_cursor(created_at: datetime, id: UUID, direction: str = CURSOR_NEXT) -> str:
+    """Encode a keyset position as an opaque URL-safe token"""
+    payload = json.dumps(
+        {"t": created_at.isoformat(), "i": str(id), "d": direction},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode a cursor token, raising ValueError if it is malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = payload.get("d", CURSOR_NEXT)
+        if direction not in (CURSOR_NEXT, CURSOR_PREV):
+            raise ValueError("Unknown cursor direction")
+        created_at = datetime.fromisoformat(payload["t"])
+        # created_at is stored as naive UTC; an aware value cannot be compared with it
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return Cursor(
+            created_at=created_at,
+            id=UUID(payload["i"]),
+            direction=direction
+        )
+    except (KeyError, TypeError, AttributeError, json.JSONDecodeError, UnicodeDecodeError, base64.binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {e}")
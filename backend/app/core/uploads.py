@@ -0,0 +1,198 @@
+from fastapi import HTTPException, UploadFile, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import List, Optional
+from app.config import settings
+import os
+
+# Leading bytes of each accepted file type
+MAGIC_BYTES = {
+    "jpg": [b"\xff\xd8\xff"],
+    "jpeg": [b"\xff\xd8\xff"],
+    "png": [b"\x89PNG\r\n\x1a\n"],
+    "gif": [b"GIF87a", b"GIF89a"],
+    "webp": [b"RIFF"],  # plus "WEBP" at offset 8, checked below
+    "pdf": [b"%PDF-"],
+}
+SNIFF_SIZE = 16
+
+MIME_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "pdf": "application/pdf",
+}
+
+# Room for multipart boundaries, part headers and ordinary form fields
+MULTIPART_OVERHEAD = 64 * 1024
+# Room for one part's headers on top of its content
+PART_HEADER_ALLOWANCE = 8 * 1024
+
+def sniff_extension(head: bytes) -> Optional[str]:
+    """File type recognised from its first bytes, as an extension"""
+    for extension, signatures in MAGIC_BYTES.items():
+        if any(head.startswith(signature) for signature in signatures):
+            if extension == "webp" and head[8:12] != b"WEBP":
+                continue
+            return extension
+    return None
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+def check_extension(filename: str) -> str:
+    """Extension of filename, if allowed by ALLOWED_EXTENSIONS"""
+    allowed = settings.allowed_extensions_list
+    extension = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    if extension not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"{filename}: file type not allowed (allowed: {', '.join(allowed)})"
+        )
+    return extension
+
+def check_content_type(filename: str, content_type: str):
+    """Check that a declared content type matches the file's extension"""
+    extension = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    if content_type != MIME_TYPES.get(extension):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"{filename}: content type {content_type} does not match a .{extension} file"
+        )
+
+def check_size(filename: str, size: Optional[int]):
+    if size is not None and size > settings.MAX_FILE_SIZE:
+        raise _too_large(f"{filename}: file exceeds {settings.MAX_FILE_SIZE} bytes")
+
+def check_magic_bytes(filename: str, head: bytes):
+    """Check that a file's first bytes carry the signature of its extension"""
+    extension = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    sniffed = sniff_extension(head)
+    if sniffed is None or MAGIC_BYTES[sniffed] != MAGIC_BYTES.get(extension):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"{filename}: content does not match a .{extension} file"
+        )
+
+def validate_upload(file: UploadFile):
+    """Check an uploaded file's size, extension and magic bytes"""
+    check_extension(file.filename)
+    check_size(file.filename, file.size)
+
+    # Only the first bytes are read; the image itself is never decoded here
+    head = file.file.read(SNIFF_SIZE)
+    file.file.seek(0)
+    check_magic_bytes(file.filename, head)
+
+def validate_uploads(files: List[UploadFile]):
+    """Check the number of uploaded files, then each file"""
+    if len(files) > settings.MAX_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_UPLOAD_FILES} files per upload"
+        )
+    for file in files:
+        validate_upload(file)
+
+def multipart_boundary(content_type: bytes) -> Optional[bytes]:
+    """Boundary parameter of a multipart/form-data Content-Type header"""
+    for parameter in content_type.split(b";")[1:]:
+        name, _, value = parameter.strip().partition(b"=")
+        if name.lower() == b"boundary" and value:
+            return value.strip(b'"')
+    return None
+
+class PartSizeCounter:
+    """
+    Size of the multipart part currently streaming in.
+
+    Counts bytes since the last boundary delimiter; the tail of each chunk is
+    kept so a delimiter split across chunks is still found.
+    """
+
+    def __init__(self, boundary: bytes):
+        self.delimiter = b"\r\n--" + boundary
+        # The first delimiter opens the body without a preceding CRLF
+        self.tail = b"\r\n"
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> int:
+        """Add a chunk; returns the largest part size seen in it"""
+        data = self.tail + chunk
+        # The tail was already counted with the previous chunk
+        counted = len(self.tail)
+        largest = 0
+        end = data.find(self.delimiter)
+        while end >= 0:
+            largest = max(largest, self.size + end - counted)
+            self.size = 0
+            counted = end + len(self.delimiter)
+            end = data.find(self.delimiter, counted)
+        self.size += len(data) - counted
+        self.tail = data[-(len(self.delimiter) - 1):]
+        # Trailing bytes that may be the start of the next delimiter are not content yet
+        pending = next(
+            (k for k in range(min(len(self.tail), self.size), 0, -1) if data.endswith(self.delimiter[:k])),
+            0
+        )
+        return max(largest, self.size - pending)
+
+class UploadLimitMiddleware:
+    """
+    Cap multipart request bodies as they stream in.
+
+    Requests declaring a larger Content-Length are refused before any of the
+    body is read; otherwise bytes are counted per chunk, in total and per
+    multipart part, and parsing aborts with 413 as soon as either limit is
+    passed, so neither a hostile upload nor one oversized file is ever
+    spooled in full. Exact per-file sizes are checked after parsing by
+    validate_uploads.
+
+    Register it before CORSMiddleware, so that its 413 responses still
+    carry CORS headers.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: Optional[int] = None, max_part_size: Optional[int] = None):
+        self.app = app
+        self.max_body_size = max_body_size or (
+            settings.MAX_FILE_SIZE * settings.MAX_UPLOAD_FILES + MULTIPART_OVERHEAD
+        )
+        self.max_part_size = max_part_size or settings.MAX_FILE_SIZE + PART_HEADER_ALLOWANCE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Upload exceeds {self.max_body_size} bytes"
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse({"detail": detail}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+        boundary = multipart_boundary(headers[b"content-type"])
+        parts = PartSizeCounter(boundary) if boundary else None
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                received += len(body)
+                # Raised inside body parsing, where FastAPI passes HTTPException through
+                if received > self.max_body_size:
+                    raise _too_large(detail)
+                if parts is not None and parts.feed(body) > self.max_part_size:
+                    raise _too_large(f"File exceeds {settings.MAX_FILE_SIZE} bytes")
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -2,7 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from app.config import settings
-from app.api.v1 import auth, properties, users, inquiries, analytics, admin, bookings
+from app.core.uploads import UploadLimitMiddleware
+from app.api.v1 import auth, properties, users, inquiries, analytics, admin, bookings, media
 import logging
 
 # Configure logging
@@ -18,6 +19,10 @@ app = FastAPI(
     redoc_url="/api/redoc" if settings.DEBUG else None,
 )
 
+# Reject oversized multipart uploads while they stream in; added before CORS
+# so that CORS wraps it and its 413 responses stay readable by browsers
+app.add_middleware(UploadLimitMiddleware)
+
 # CORS Middleware
 origins = settings.cors_origins_list
 logger.info(f"CORS allowed origins: {origins}")
@@ -46,6 +51,7 @@ app.include_router(inquiries.router, prefix=f"/api/{settings.API_VERSION}")
 app.include_router(analytics.router, prefix=f"/api/{settings.API_VERSION}")
 app.include_router(admin.router, prefix=f"/api/{settings.API_VERSION}")
 app.include_router(bookings.router, prefix=f"/api/{settings.API_VERSION}")
+app.include_router(media.router, prefix=f"/api/{settings.API_VERSION}")
 
 @app.get("/")
 async def root():
@@ -78,6 +84,8 @@ async def startup_event():
     from app.models.user import User
     from app.models.property import Property
     from app.models.booking import Booking
+    from app.models.property_image import PropertyImage
+    from app.models.stored_object import StoredObject
     
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -241,11 +249,53 @@ async def startup_event():
         logger.error(f"Failed to verifiy enums or inject stays: {e}")
 
     logger.info("Database tables and sample data verified/created")
+    
+    from app.services.view_counter import view_counter
+    view_counter.start()
+    
+    from app.services.location_index import location_index
+    location_index.start()
+    
+    from app.services.spelling_index import spelling_index
+    spelling_index.start()
+    
+    from app.services.term_stats import term_stats
+    term_stats.start()
+    
+    from app.services.index_watcher import index_watcher
+    index_watcher.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown"""
     logger.info(f"Shutting down {settings.APP_NAME} API")
+    
+    from app.services.view_counter import view_counter
+    await view_counter.stop()
+    
+    from app.services.location_index import location_index
+    await location_index.stop()
+    
+    from app.services.spelling_index import spelling_index
+    await spelling_index.stop()
+    
+    from app.services.term_stats import term_stats
+    await term_stats.stop()
+    
+    from app.services.index_watcher import index_watcher
+    await index_watcher.stop()
+    
+    from app.services.cache_service import cache_service
+    await cache_service.close()
+    
+    from app.services.image_service import image_service
+    image_service.close()
+    
+    from app.services.storage_service import storage_service
+    storage_service.close()
+    
+    from app.services.password_service import password_hasher
+    password_hasher.close()
 
 if __name__ == "__main__":
     import uvicorn
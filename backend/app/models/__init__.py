@@ -1,6 +1,8 @@
 # Models package
 from app.models.user import User
 from app.models.property import Property
+from app.models.property_image import PropertyImage
 from app.models.inquiry import Inquiry
+from app.models.stored_object import StoredObject
 
-__all__ = ["User", "Property", "Inquiry"]
+__all__ = ["User", "Property", "PropertyImage", "Inquiry", "StoredObject"]
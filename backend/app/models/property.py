@@ -1,9 +1,15 @@
-from sqlalchemy import Column, String, Integer, Numeric, Boolean, DateTime, Enum as SQLEnum, Text
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Integer, Numeric, Boolean, DateTime, Enum as SQLEnum, Text, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.ext.orderinglist import ordering_list
+from sqlalchemy import event
 from datetime import datetime
 import uuid
 import enum
 from app.database import Base
+from app.core.geo import geohash_encode
+from app.models.property_image import PropertyImage
 
 class PropertyType(str, enum.Enum):
     APARTMENT = "apartment"
@@ -22,8 +28,24 @@ class PropertyStatus(str, enum.Enum):
     PUBLISHED = "published"
     ARCHIVED = "archived"
 
+# Weighted search document: title (A) above location (B) above description (C)
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+
 class Property(Base):
     __tablename__ = "properties"
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id)
+        Index("ix_properties_created_at_id", "created_at", "id"),
+        Index("ix_properties_search_vector", "search_vector", postgresql_using="gin"),
+        # Prefix (LIKE 'abc%') scans for geohash cell covers
+        Index("ix_properties_geohash", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+        # Byte-order range scans over slug-N siblings for slug allocation
+        Index("ix_properties_slug_pattern", "slug", postgresql_ops={"slug": "varchar_pattern_ops"}),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(500), nullable=False)
@@ -38,13 +60,28 @@ class Property(Base):
     address = Column(Text)
     latitude = Column(Numeric(10, 8))
     longitude = Column(Numeric(11, 8))
+    geohash = Column(String(12))  # derived from latitude/longitude on save
     
     # Details
     bedrooms = Column(Integer)
     bathrooms = Column(Integer)
     area_sqft = Column(Integer)
     features = Column(JSONB)  # amenities, parking, etc.
-    images = Column(JSONB)  # array of image URLs
+    
+    # Gallery rows, loaded with the property; new rows are numbered on append
+    photos = relationship(
+        PropertyImage,
+        order_by=(PropertyImage.position, PropertyImage.created_at, PropertyImage.id),
+        collection_class=ordering_list("position"),
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin"
+    )
+    # Image URLs in gallery order; assigning a list creates the rows
+    images = association_proxy("photos", "url", creator=lambda url: PropertyImage(url=url))
+    
+    # Full-text search (maintained by Postgres, never loaded with the row)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_DOCUMENT, persisted=True)))
     
     # Status & Analytics
     status = Column(SQLEnum(PropertyStatus), default=PropertyStatus.DRAFT, nullable=False, index=True)
@@ -58,5 +95,22 @@ class Property(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     published_at = Column(DateTime)
     
+    @property
+    def image_variants(self) -> dict:
+        """image URL -> {"thumb": url, "card": url, "full": url}, for rendered images"""
+        return {photo.url: photo.variants for photo in self.photos if photo.variants}
+    
     def __repr__(self):
         return f"<Property {self.title}>"
+
+def property_geohash(latitude, longitude):
+    """Geohash stored for a property's coordinates, or None without them"""
+    if latitude is None or longitude is None:
+        return None
+    return geohash_encode(float(latitude), float(longitude))
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def set_geohash(mapper, connection, target):
+    """Keep the geohash in step with the coordinates"""
+    target.geohash = property_geohash(target.latitude, target.longitude)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime
+import uuid
+from app.database import Base
+
+class PropertyImage(Base):
+    """One image in a property's gallery"""
+    __tablename__ = "property_images"
+    __table_args__ = (
+        # A listing holds each image once
+        UniqueConstraint("property_id", "url", name="uq_property_images_property_url"),
+        # Galleries and covers are read in position order
+        Index("ix_property_images_property_position", "property_id", "position"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
+    property_id = Column(UUID(as_uuid=True), ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
+    # Gallery order; concurrent appends may share a position and then sort by creation
+    position = Column(Integer, nullable=False, default=0)
+    url = Column(String(1024), nullable=False)
+    sha256 = Column(String(64), index=True)  # content hash, for images uploaded through the API
+    width = Column(Integer)
+    height = Column(Integer)
+    variants = Column(JSONB)  # {"thumb": url, "card": url, "full": url} once rendered
+    render_error = Column(String(255))  # why the image could not be decoded; variants are then {}
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<PropertyImage {self.url}>"
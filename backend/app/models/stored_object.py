@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+class StoredObject(Base):
+    """A file in object storage and how many property images point at it"""
+    __tablename__ = "stored_objects"
+    __table_args__ = (
+        # Garbage collection scans unreferenced objects by release time
+        Index("ix_stored_objects_unreferenced", "released_at", postgresql_where="ref_count <= 0"),
+    )
+    
+    key = Column(String(512), primary_key=True)
+    sha256 = Column(String(64), index=True)  # null for presigned uploads, which are keyed by uuid
+    size = Column(BigInteger)
+    content_type = Column(String(100))
+    ref_count = Column(Integer, default=0, nullable=False)
+    
+    # Set when ref_count drops to zero; collected after a grace period
+    released_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<StoredObject {self.key} refs={self.ref_count}>"
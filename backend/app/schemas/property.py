@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Generic, Optional, List, Tuple, Dict, TypeVar
 from datetime import datetime
 from decimal import Decimal
 from app.models.property import PropertyType, PropertyPurpose, PropertyStatus
+import enum
 
 # Request schemas
 class PropertyCreate(BaseModel):
@@ -38,9 +39,58 @@ class PropertyUpdate(BaseModel):
     images: Optional[List[str]] = None
     status: Optional[PropertyStatus] = None
 
+class PropertyBatchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=500)  # property ids or slugs
+
+class PropertySort(str, enum.Enum):
+    NEWEST = "newest"
+    DISTANCE = "distance"
+    RELEVANCE = "relevance"
+
+class PropertyFilters(BaseModel):
+    """Normalized listing filters shared by the property query endpoints"""
+    type: Optional[PropertyType] = None
+    purpose: Optional[PropertyPurpose] = None
+    status: Optional[PropertyStatus] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    location: Optional[str] = None
+    bedrooms: Optional[int] = None
+    search: Optional[str] = None
+    near: Optional[Tuple[float, float]] = None  # (lat, lng)
+    radius_km: Optional[float] = None
+    bbox: Optional[Tuple[float, float, float, float]] = None  # (min_lng, min_lat, max_lng, max_lat)
+    # Spelling corrections applied to search/location, keyed by field (not part of the cache key)
+    corrections: Dict[str, str] = Field(default_factory=dict, exclude=True)
+
+    @validator("location", "search")
+    def normalize_text(cls, v):
+        if v is None:
+            return None
+        v = " ".join(v.split()).lower()
+        return v or None
+
+    def cache_key(self, is_admin: bool = False) -> str:
+        """Stable key identifying this filter set and visibility scope"""
+        if is_admin:
+            return f"admin:{self.model_dump_json(exclude_none=True)}"
+        # Public listings are always restricted to published properties
+        return f"public:{self.model_dump_json(exclude_none=True, exclude={'status'})}"
+
 from uuid import UUID
 
 # Response schemas
+class PropertyImageResponse(BaseModel):
+    id: UUID
+    url: str
+    position: int
+    width: Optional[int]
+    height: Optional[int]
+    variants: Optional[Dict[str, str]]
+    
+    class Config:
+        from_attributes = True
+
 class PropertyResponse(BaseModel):
     id: UUID
     title: str
@@ -58,6 +108,8 @@ class PropertyResponse(BaseModel):
     area_sqft: Optional[int]
     features: Optional[dict]
     images: Optional[List[str]]
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
+    photos: List[PropertyImageResponse] = []
     status: PropertyStatus
     views: int
     agent_id: UUID
@@ -68,8 +120,122 @@ class PropertyResponse(BaseModel):
     class Config:
         from_attributes = True
 
-class PropertyListResponse(BaseModel):
-    properties: List[PropertyResponse]
-    total: int
+class PropertyImageUpload(BaseModel):
+    filename: str = Field(..., max_length=255)
+    content_type: str = Field(..., max_length=100)
+    size: int = Field(..., gt=0)
+
+class PropertyImagePresignRequest(BaseModel):
+    files: List[PropertyImageUpload] = Field(..., min_length=1)
+
+class PresignedUpload(BaseModel):
+    key: str
+    url: str
+    fields: Dict[str, str]  # form fields to POST along with the file
+
+class PropertyImagePresignResponse(BaseModel):
+    uploads: List[PresignedUpload]
+    expires_in: int
+
+class PropertyImageCommitRequest(BaseModel):
+    keys: List[str] = Field(..., min_length=1)
+
+class PropertyImageOrder(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1)  # every image of the property, in the new order
+
+class PropertyImportFormat(str, enum.Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+class PropertyExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class PropertyImportRow(PropertyCreate):
+    id: Optional[UUID] = None  # an existing id updates that property in place
+    status: PropertyStatus = PropertyStatus.DRAFT
+
+class PropertyImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class PropertyImportReport(BaseModel):
+    rows: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[PropertyImportError]
+    errors_truncated: bool = False
+    seconds: float
+    rows_per_second: float
+
+PropertyItem = TypeVar("PropertyItem")
+
+class PropertyPage(BaseModel, Generic[PropertyItem]):
+    """One page of a property listing, full or as cards"""
+    properties: List[PropertyItem]
+    total: Optional[int]
+    total_exact: Optional[bool] = None  # None when no total was asked for
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    corrections: Optional[Dict[str, str]] = None  # e.g. {"search": "kilimani"} for "kilimni"
+
+class PropertyListResponse(PropertyPage[PropertyResponse]):
+    pass
+
+class PropertyBatchResponse(BaseModel):
+    properties: List[PropertyResponse]  # in request order
+    missing: List[str]
+
+class PropertyView(str, enum.Enum):
+    FULL = "full"
+    CARD = "card"
+
+class PropertyCard(BaseModel):
+    """Compact listing card, built directly from the columns of card_columns()"""
+    id: UUID
+    slug: str
+    title: str
+    type: PropertyType
+    purpose: PropertyPurpose
+    price: Decimal
+    location: str
+    latitude: Optional[Decimal]
+    longitude: Optional[Decimal]
+    bedrooms: Optional[int]
+    bathrooms: Optional[int]
+    area_sqft: Optional[int]
+    cover_image: Optional[str]
+    status: PropertyStatus
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, row) -> "PropertyCard":
+        # Values come typed from the database, so skip validation
+        return cls.model_construct(**row._mapping)
+
+class PropertyCardListResponse(PropertyPage[PropertyCard]):
+    pass
+
+class PropertyCluster(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    property_id: Optional[UUID] = None  # set when the cluster is a single listing
+
+class PropertyClusterResponse(BaseModel):
+    zoom: int
+    clusters: List[PropertyCluster]
+
+class PropertyFacetsResponse(BaseModel):
+    total: int
+    type: Dict[str, int]
+    purpose: Dict[str, int]
+    bedrooms: Dict[str, int]
+    price_band: Dict[str, int]
+
+class LocationSuggestion(BaseModel):
+    location: str
+    count: int
@@ -0,0 +1,63 @@
+from typing import Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class BackgroundIndex:
+    """
+    Base for in-memory indexes rebuilt from the database in the background.
+
+    Subclasses implement refresh(). The index is rebuilt every
+    refresh_interval seconds, and soon after mark_stale() is called, so
+    request handlers only ever read the current snapshot. Rebuilds asked
+    for by mark_stale() start at most once per min_refresh_interval, so a
+    burst of writes costs one rebuild.
+    """
+
+    name = "index"
+
+    def __init__(self, refresh_interval: float, min_refresh_interval: float = 0):
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_requested = asyncio.Event()
+
+    async def refresh(self):
+        raise NotImplementedError
+
+    def mark_stale(self):
+        """Ask the background task to rebuild soon, after a property change"""
+        self._refresh_requested.set()
+
+    async def _run(self):
+        while True:
+            self._refresh_requested.clear()
+            started = time.monotonic()
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"{self.name} refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                continue
+            # Requests made while waiting out the debounce join this rebuild
+            delay = self.min_refresh_interval - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def start(self):
+        """Build the index and keep it refreshed in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
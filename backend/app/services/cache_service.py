@@ -0,0 +1,102 @@
+import redis.asyncio as redis
+from typing import Optional, Tuple
+from app.config import settings
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Scope for public property listing and detail responses
+PROPERTIES_SCOPE = "properties"
+# Version only, never holds entries: bumped after bulk property changes so
+# that every worker rebuilds its in-memory indexes
+INDEXES_SCOPE = "indexes"
+
+class CacheService:
+    """
+    Redis cache for serialized public API responses.
+
+    Entries live under a per-scope version number. Writes bump the version
+    instead of deleting keys, so every cached page for the scope becomes
+    unreachable at once and simply expires.
+    """
+
+    def __init__(self):
+        self.enabled = settings.CACHE_ENABLED
+        self.ttl = settings.CACHE_TTL
+        self.prefix = f"{settings.APP_NAME.lower()}:cache"
+        self.redis = redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.CACHE_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_SOCKET_TIMEOUT
+        )
+        # Skip Redis for a while after a failure instead of timing out on every request
+        self._down_until = 0.0
+
+    def _available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._down_until
+
+    def _mark_down(self, e: Exception):
+        logger.warning(f"Cache unavailable, bypassing for {settings.CACHE_RETRY_AFTER}s: {e}")
+        self._down_until = time.monotonic() + settings.CACHE_RETRY_AFTER
+
+    def _version_key(self, scope: str) -> str:
+        return f"{self.prefix}:{scope}:version"
+
+    def _entry_key(self, scope: str, version: int, key: str) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return f"{self.prefix}:{scope}:v{version}:{digest}"
+
+    async def version(self, scope: str) -> Optional[int]:
+        """Current version of scope, or None if the cache is unavailable"""
+        if not self._available():
+            return None
+        key = self._version_key(scope)
+        try:
+            version = await self.redis.get(key)
+            if version is None:
+                # Start from the clock so versions never repeat after Redis
+                # loses the key, which would revive entries from before it
+                await self.redis.set(key, time.time_ns() // 1000, nx=True)
+                version = await self.redis.get(key)
+            return int(version or 0)
+        except (redis.RedisError, OSError) as e:
+            self._mark_down(e)
+            return None
+
+    async def get(self, scope: str, key: str) -> Tuple[Optional[int], Optional[bytes]]:
+        """Return (version, cached body); pass the version back to set() on a miss"""
+        version = await self.version(scope)
+        if version is None:
+            return None, None
+        try:
+            return version, await self.redis.get(self._entry_key(scope, version, key))
+        except (redis.RedisError, OSError) as e:
+            self._mark_down(e)
+            return None, None
+
+    async def set(self, scope: str, key: str, version: Optional[int], body: bytes, ttl: Optional[int] = None):
+        """Store body under the version it was computed for"""
+        if version is None or not self._available():
+            return
+        try:
+            await self.redis.set(self._entry_key(scope, version, key), body, ex=ttl or self.ttl)
+        except (redis.RedisError, OSError) as e:
+            self._mark_down(e)
+
+    async def invalidate(self, scope: str) -> Optional[int]:
+        """Make every cached entry in scope stale, returning the new version"""
+        if not self.enabled:
+            return None
+        try:
+            return await self.redis.incr(self._version_key(scope))
+        except (redis.RedisError, OSError) as e:
+            # Stale entries still expire after the TTL
+            logger.error(f"Cache invalidation failed for {scope}: {e}")
+            return None
+
+    async def close(self):
+        await self.redis.aclose()
+
+cache_service = CacheService()
@@ -0,0 +1,204 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.core.geo import BBox
+from app.models.property import Property, PropertyStatus
+import asyncio
+import logging
+import math
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+MAX_ZOOM = 20
+CLUSTER_RADIUS_PX = 60
+TILE_SIZE_PX = 256
+
+def project(latitude: float, longitude: float) -> Tuple[float, float]:
+    """Web Mercator projection onto the unit square"""
+    sin_lat = math.sin(math.radians(max(min(latitude, 85.05112878), -85.05112878)))
+    x = longitude / 360 + 0.5
+    y = 0.5 - 0.25 * math.log((1 + sin_lat) / (1 - sin_lat)) / math.pi
+    return x, y
+
+def unproject(x: float, y: float) -> Tuple[float, float]:
+    """Inverse of project(), returning (latitude, longitude)"""
+    latitude = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+    return latitude, (x - 0.5) * 360
+
+class _Cell:
+    __slots__ = ("count", "sum_x", "sum_y", "id_xor")
+
+    def __init__(self):
+        self.count = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        # XOR of member ids: equals the remaining id when count is 1
+        self.id_xor = 0
+
+class ClusterIndex:
+    """
+    Hierarchical grid index of published listing coordinates.
+
+    Every zoom level holds a grid whose cells are CLUSTER_RADIUS_PX wide on
+    screen; a cell's count and coordinate sums give the cluster and its
+    centroid. Adding or removing a listing touches one cell per zoom level,
+    so publishes and archives update the index in place. Changes made
+    while a rebuild is running are replayed onto the new grids.
+    """
+
+    def __init__(self):
+        self.refresh_interval = settings.CLUSTER_REFRESH_INTERVAL
+        self._levels: List[Dict[Tuple[int, int], _Cell]] = [{} for _ in range(MAX_ZOOM + 1)]
+        self._points: Dict[uuid.UUID, Tuple[float, float]] = {}
+        self._built_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        # (id, (latitude, longitude) or None for a removal) while a rebuild runs
+        self._changes: Optional[List[Tuple[uuid.UUID, Optional[Tuple[float, float]]]]] = None
+
+    @staticmethod
+    def _cell_size(zoom: int) -> float:
+        return CLUSTER_RADIUS_PX / (TILE_SIZE_PX * (1 << zoom))
+
+    def _cell_key(self, zoom: int, x: float, y: float) -> Tuple[int, int]:
+        size = self._cell_size(zoom)
+        return int(x / size), int(y / size)
+
+    def add(self, property_id: uuid.UUID, latitude: float, longitude: float):
+        """Insert or move a listing"""
+        if self._changes is not None:
+            self._changes.append((property_id, (latitude, longitude)))
+        self._remove(property_id)
+        self._insert(self._levels, self._points, property_id, latitude, longitude)
+
+    def _insert(self, levels, points, property_id: uuid.UUID, latitude: float, longitude: float):
+        x, y = project(latitude, longitude)
+        points[property_id] = (x, y)
+        for zoom, level in enumerate(levels):
+            key = self._cell_key(zoom, x, y)
+            cell = level.get(key)
+            if cell is None:
+                cell = level[key] = _Cell()
+            cell.count += 1
+            cell.sum_x += x
+            cell.sum_y += y
+            cell.id_xor ^= property_id.int
+
+    def remove(self, property_id: uuid.UUID):
+        """Drop a listing if it is indexed"""
+        if self._changes is not None:
+            self._changes.append((property_id, None))
+        self._remove(property_id)
+
+    def _remove(self, property_id: uuid.UUID):
+        point = self._points.pop(property_id, None)
+        if point is None:
+            return
+        x, y = point
+        for zoom, level in enumerate(self._levels):
+            key = self._cell_key(zoom, x, y)
+            cell = level.get(key)
+            if cell is None:
+                continue
+            cell.count -= 1
+            cell.sum_x -= x
+            cell.sum_y -= y
+            cell.id_xor ^= property_id.int
+            if cell.count <= 0:
+                del level[key]
+
+    def sync(self, property: Property):
+        """Reflect a created, edited, published or archived listing"""
+        if (
+            property.status == PropertyStatus.PUBLISHED
+            and property.latitude is not None
+            and property.longitude is not None
+        ):
+            self.add(property.id, float(property.latitude), float(property.longitude))
+        else:
+            self.remove(property.id)
+
+    async def rebuild(self, db: AsyncSession):
+        """Reload every published listing with coordinates"""
+        stmt = select(Property.id, Property.latitude, Property.longitude).where(
+            Property.status == PropertyStatus.PUBLISHED,
+            Property.latitude.isnot(None),
+            Property.longitude.isnot(None)
+        )
+        # Syncs from here on still update the current grids, and are
+        # recorded so that the new grids do not miss them
+        self._changes = []
+        try:
+            result = await db.execute(stmt)
+            rows = result.all()
+            # Build off the event loop, then swap the new grids in at once
+            levels, points = await asyncio.to_thread(self._build, rows)
+        finally:
+            changes, self._changes = self._changes, None
+
+        self._levels, self._points = levels, points
+        for property_id, point in changes:
+            self._remove(property_id)
+            if point is not None:
+                self._insert(self._levels, self._points, property_id, *point)
+        self._built_at = time.monotonic()
+        logger.info(f"Cluster index rebuilt with {len(rows)} listings")
+
+    def _build(self, rows):
+        levels = [{} for _ in range(MAX_ZOOM + 1)]
+        points = {}
+        for property_id, latitude, longitude in rows:
+            self._insert(levels, points, property_id, float(latitude), float(longitude))
+        return levels, points
+
+    def mark_stale(self):
+        """Rebuild on next use, after changes too broad to sync one by one"""
+        self._built_at = None
+
+    async def ensure_fresh(self, db: AsyncSession):
+        """Build on first use and periodically pick up other workers' writes"""
+        if self._built_at is not None and time.monotonic() - self._built_at < self.refresh_interval:
+            return
+        async with self._lock:
+            if self._built_at is None or time.monotonic() - self._built_at >= self.refresh_interval:
+                await self.rebuild(db)
+
+    def query(self, bbox: BBox, zoom: int) -> List[dict]:
+        """Clusters at zoom whose cells intersect bbox"""
+        zoom = max(0, min(zoom, MAX_ZOOM))
+        level = self._levels[zoom]
+        min_lng, min_lat, max_lng, max_lat = bbox
+        min_x, min_y = project(max_lat, min_lng)
+        max_x, max_y = project(min_lat, max_lng)
+        (min_cx, min_cy) = self._cell_key(zoom, min_x, min_y)
+        (max_cx, max_cy) = self._cell_key(zoom, max_x, max_y)
+
+        span = (max_cx - min_cx + 1) * (max_cy - min_cy + 1)
+        if span <= len(level):
+            keys = (
+                (cx, cy)
+                for cx in range(min_cx, max_cx + 1)
+                for cy in range(min_cy, max_cy + 1)
+                if (cx, cy) in level
+            )
+        else:
+            keys = (
+                key for key in level
+                if min_cx <= key[0] <= max_cx and min_cy <= key[1] <= max_cy
+            )
+
+        clusters = []
+        for key in keys:
+            cell = level[key]
+            latitude, longitude = unproject(cell.sum_x / cell.count, cell.sum_y / cell.count)
+            clusters.append({
+                "latitude": round(latitude, 6),
+                "longitude": round(longitude, 6),
+                "count": cell.count,
+                "property_id": uuid.UUID(int=cell.id_xor) if cell.count == 1 else None
+            })
+        return clusters
+
+cluster_index = ClusterIndex()
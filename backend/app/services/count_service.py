@@ -0,0 +1,92 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql import Select
+from typing import Set, Tuple
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.cache_service import cache_service, PROPERTIES_SCOPE
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper that keeps the statement's bound parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+class CountService:
+    """
+    Picks the cheapest acceptable total for a filtered listing.
+
+    Small result sets (by planner estimate) are counted exactly. Large ones
+    are answered from exact counts cached in Redis, falling back to the
+    planner estimate while the count is refreshed in the background.
+    Cached counts live under the properties cache version, so a property
+    write on any worker retires them all, and a count taken before a write
+    lands under a version nobody reads any more.
+    """
+
+    def __init__(self):
+        self.exact_threshold = settings.COUNT_EXACT_THRESHOLD
+        self.ttl = settings.COUNT_CACHE_TTL
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def estimate(self, db: AsyncSession, query: Select) -> int:
+        """Row estimate from the planner, without executing the query"""
+        result = await db.execute(Explain(query))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def exact(self, db: AsyncSession, query: Select) -> int:
+        """Exact count of the rows matched by query"""
+        result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+        return result.scalar() or 0
+
+    async def count(self, db: AsyncSession, query: Select, key: str) -> Tuple[int, bool]:
+        """Return (total, is_exact) for query, whose filters are identified by key"""
+        estimate = await self.estimate(db, query)
+        if estimate <= self.exact_threshold:
+            return await self.exact(db, query), True
+
+        cache_key = f"count:{key}"
+        version, cached = await cache_service.get(PROPERTIES_SCOPE, cache_key)
+        if cached is not None:
+            return int(cached), False
+
+        if version is not None:
+            self._schedule_refresh(query, cache_key, version)
+        return estimate, False
+
+    def _schedule_refresh(self, query: Select, cache_key: str, version: int):
+        if cache_key in self._refreshing:
+            return
+        self._refreshing.add(cache_key)
+        task = asyncio.create_task(self._refresh(query, cache_key, version))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, query: Select, cache_key: str, version: int):
+        try:
+            async with AsyncSessionLocal() as session:
+                total = await self.exact(session, query)
+            # Stored under the version read before counting, never a later one
+            await cache_service.set(PROPERTIES_SCOPE, cache_key, version, str(total).encode(), ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"Background count refresh failed: {e}")
+        finally:
+            self._refreshing.discard(cache_key)
+
+count_service = CountService()
@@ -0,0 +1,128 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from typing import AsyncIterator, Iterable, Optional
+from datetime import datetime
+from decimal import Decimal
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.property import Property, PropertyStatus
+from app.models.property_image import PropertyImage
+from app.schemas.property import PropertyExportFormat
+import csv
+import enum
+import io
+import json
+import uuid
+import zlib
+
+# Field order for both formats; a superset of what the bulk import accepts,
+# so an export can be re-imported as is
+EXPORT_COLUMNS = [
+    Property.id,
+    Property.title,
+    Property.slug,
+    Property.description,
+    Property.type,
+    Property.purpose,
+    Property.price,
+    Property.location,
+    Property.address,
+    Property.latitude,
+    Property.longitude,
+    Property.bedrooms,
+    Property.bathrooms,
+    Property.area_sqft,
+    Property.features,
+    # Gallery URLs in order, aggregated per row from property_images
+    select(func.jsonb_agg(aggregate_order_by(
+        PropertyImage.url, PropertyImage.position, PropertyImage.created_at, PropertyImage.id
+    )))
+    .where(PropertyImage.property_id == Property.id)
+    .scalar_subquery()
+    .label("images"),
+    Property.status,
+    Property.views,
+    Property.agent_id,
+    Property.created_at,
+    Property.updated_at,
+    Property.published_at
+]
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+def _plain(value):
+    """JSON/CSV friendly form of a column value"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+class ExportService:
+    """
+    Streaming property export.
+
+    Rows are read through a server-side cursor in EXPORT_BATCH_SIZE
+    partitions and encoded one partition at a time, so memory use does not
+    grow with the catalogue. The export runs on its own session because the
+    response body is produced after the request handler has returned.
+    """
+
+    def __init__(self):
+        self.batch_size = settings.EXPORT_BATCH_SIZE
+
+    def _encode_ndjson(self, rows: Iterable) -> bytes:
+        lines = (
+            json.dumps({field: _plain(value) for field, value in zip(EXPORT_FIELDS, row)}, separators=(",", ":"))
+            for row in rows
+        )
+        return "".join(line + "\n" for line in lines).encode()
+
+    def _encode_csv(self, rows: Iterable, header: bool = False) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow([
+                "" if value is None
+                else json.dumps(value) if isinstance(value, (dict, list))
+                else _plain(value)
+                for value in row
+            ])
+        return buffer.getvalue().encode()
+
+    async def stream(
+        self,
+        format: PropertyExportFormat,
+        compress: bool = False,
+        status: Optional[PropertyStatus] = None
+    ) -> AsyncIterator[bytes]:
+        """Encoded export, optionally gzipped, one cursor partition per chunk"""
+        stmt = select(*EXPORT_COLUMNS).order_by(Property.created_at, Property.id)
+        if status:
+            stmt = stmt.where(Property.status == status)
+
+        compressor = zlib.compressobj(wbits=31) if compress else None  # gzip container
+        if format == PropertyExportFormat.CSV:
+            first = self._encode_csv([], header=True)
+            yield compressor.compress(first) if compressor else first
+
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=self.batch_size))
+            async for partition in result.partitions():
+                if format == PropertyExportFormat.CSV:
+                    chunk = self._encode_csv(partition)
+                else:
+                    chunk = self._encode_ndjson(partition)
+                if compressor:
+                    chunk = compressor.compress(chunk)
+                    if not chunk:
+                        continue
+                yield chunk
+
+        if compressor:
+            yield compressor.flush()
+
+export_service = ExportService()
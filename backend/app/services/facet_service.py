@@ -0,0 +1,61 @@
+from sqlalchemy import select, func, case, tuple_, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from typing import Dict, List
+from app.config import settings
+from app.models.property import Property
+
+FACETS = ("type", "purpose", "bedrooms", "price_band")
+
+def _price_band_labels(bands: List[int]) -> List[str]:
+    edges = [0] + bands
+    labels = [f"{low}-{high}" for low, high in zip(edges, edges[1:])]
+    return labels + [f"{edges[-1]}+"]
+
+def facet_source() -> Select:
+    """Per-property facet values; apply listing filters to this before counting"""
+    bands = settings.facet_price_bands_list
+    labels = _price_band_labels(bands)
+    price_band = case(
+        *[(Property.price < high, label) for high, label in zip(bands, labels)],
+        else_=labels[-1]
+    )
+    bedroom_bucket = case(
+        (Property.bedrooms.is_(None), "unknown"),
+        (Property.bedrooms == 0, "studio"),
+        (Property.bedrooms >= 4, "4+"),
+        else_=Property.bedrooms.cast(String)
+    )
+    return select(
+        Property.type.label("type"),
+        Property.purpose.label("purpose"),
+        bedroom_bucket.label("bedrooms"),
+        price_band.label("price_band")
+    )
+
+async def count_facets(db: AsyncSession, source: Select) -> Dict:
+    """Count every facet value, plus the total, in one GROUPING SETS scan"""
+    inner = source.subquery()
+    columns = [inner.c[name] for name in FACETS]
+    stmt = select(
+        *columns,
+        func.grouping(*columns).label("grouping"),
+        func.count().label("count")
+    ).group_by(func.grouping_sets(*columns, tuple_()))
+    result = await db.execute(stmt)
+
+    # grouping() sets one bit per column that is aggregated away, first column highest
+    all_bits = (1 << len(FACETS)) - 1
+    bit_to_facet = {all_bits ^ (1 << (len(FACETS) - 1 - i)): name for i, name in enumerate(FACETS)}
+
+    facets = {name: {} for name in FACETS}
+    total = 0
+    for row in result:
+        if row.grouping == all_bits:
+            total = row.count
+            continue
+        name = bit_to_facet[row.grouping]
+        value = getattr(row, name)
+        key = getattr(value, "value", value)
+        facets[name][str(key)] = row.count
+    return {"total": total, **facets}
@@ -0,0 +1,42 @@
+from sqlalchemy import and_, or_, func, Float
+from app.core.geo import BBox, EARTH_RADIUS_KM, geohash_cover, radius_bboxes
+from app.models.property import Property
+import math
+
+def bbox_condition(bbox: BBox):
+    """
+    WHERE clause for properties inside bbox.
+
+    The geohash prefixes narrow the scan to a few index ranges; the
+    coordinate comparison then trims the cells' overhang.
+    """
+    min_lng, min_lat, max_lng, max_lat = bbox
+    conditions = [
+        Property.latitude.between(min_lat, max_lat),
+        Property.longitude.between(min_lng, max_lng)
+    ]
+    cover = geohash_cover(bbox)
+    if cover:
+        conditions.insert(0, or_(*[Property.geohash.like(f"{prefix}%") for prefix in cover]))
+    return and_(*conditions)
+
+def distance_km(latitude: float, longitude: float):
+    """Great-circle (haversine) distance in km from a point to each property"""
+    lat = func.radians(Property.latitude.cast(Float), type_=Float)
+    lng = func.radians(Property.longitude.cast(Float), type_=Float)
+    origin_lat = math.radians(latitude)
+    origin_lng = math.radians(longitude)
+    a = (
+        func.power(func.sin((lat - origin_lat) * 0.5, type_=Float), 2, type_=Float)
+        + math.cos(origin_lat) * func.cos(lat, type_=Float)
+        * func.power(func.sin((lng - origin_lng) * 0.5, type_=Float), 2, type_=Float)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(a, 1.0, type_=Float), type_=Float), type_=Float)
+
+def radius_condition(latitude: float, longitude: float, radius_km: float):
+    """WHERE clause for properties within radius_km of a point"""
+    boxes = [bbox_condition(bbox) for bbox in radius_bboxes(latitude, longitude, radius_km)]
+    return and_(
+        or_(*boxes) if len(boxes) > 1 else boxes[0],
+        distance_km(latitude, longitude) <= radius_km
+    )
@@ -0,0 +1,161 @@
+from sqlalchemy import select, update
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import List, Optional
+from app.config import settings
+from app.core.images import render_variants, is_raster, VARIANTS, CONTENT_TYPES
+from app.database import AsyncSessionLocal
+from app.models.property_image import PropertyImage
+from app.services.storage_service import storage_service
+from app.services.cache_service import cache_service, PROPERTIES_SCOPE
+import asyncio
+import logging
+import multiprocessing
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+class ImageService:
+    """
+    Thumbnail, card and full-size variants of uploaded property images.
+
+    Decoding and re-encoding is CPU bound, so it runs on a process pool
+    and neither the event loop nor the GIL is held while images render.
+    Variant URLs and the original's dimensions are stored on its
+    property_images row.
+    """
+
+    def __init__(self):
+        self.format = settings.IMAGE_VARIANT_FORMAT
+        self.quality = settings.IMAGE_VARIANT_QUALITY
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Created on first use; spawned workers do not inherit the loop or S3 threads
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def variant_key(self, key: str, variant: str, format: str) -> str:
+        """properties/<id>.jpg -> properties/variants/<id>/<variant>.<format>"""
+        folder, name = os.path.split(key)
+        return f"{folder}/variants/{os.path.splitext(name)[0]}/{variant}.{format}"
+
+    def variant_keys(self, key: str) -> List[str]:
+        """Every variant key that may exist for key, in any format"""
+        return [self.variant_key(key, variant, format) for variant in VARIANTS for format in CONTENT_TYPES]
+
+    async def render(self, url: str) -> Optional[dict]:
+        """
+        Render and store the variants of one stored image; None for foreign URLs.
+
+        Returns property_images values: the variant URLs and the dimensions.
+        Documents have no variants and are marked processed as they are, as
+        are images that cannot be decoded, with the reason.
+        """
+        key = storage_service.key_for_url(url)
+        if key is None:
+            return None
+        if not is_raster(key):
+            return {"variants": {}}
+
+        data = await storage_service.download_url(url)
+        loop = asyncio.get_running_loop()
+        try:
+            (width, height), variants = await loop.run_in_executor(
+                self.executor,
+                partial(render_variants, data, self.format, self.quality)
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); the next run tries again
+            raise
+        except Exception as e:
+            # Decoding the same bytes fails the same way every time (corrupt
+            # files, decompression bombs), so record it rather than retry forever
+            logger.warning(f"Image {url} cannot be rendered: {e}")
+            return {"variants": {}, "render_error": f"{type(e).__name__}: {e}"[:255]}
+
+        urls = {}
+        for variant, content in variants.items():
+            urls[variant] = await storage_service.upload_bytes(
+                content, self.variant_key(key, variant, self.format), CONTENT_TYPES[self.format]
+            )
+        return {"variants": urls, "width": width, "height": height}
+
+    async def process_property(self, property_id: uuid.UUID) -> int:
+        """Render variants for a property's images that have none yet; returns how many"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(PropertyImage.id, PropertyImage.url, PropertyImage.sha256)
+                .where(PropertyImage.property_id == property_id, PropertyImage.variants.is_(None))
+            )
+            pending = result.all()
+            if not pending:
+                return 0
+
+            # Content-addressed images shared with another listing are already rendered
+            hashes = [row.sha256 for row in pending if row.sha256]
+            known = {}
+            if hashes:
+                result = await session.execute(
+                    select(
+                        PropertyImage.sha256,
+                        PropertyImage.variants,
+                        PropertyImage.width,
+                        PropertyImage.height,
+                        PropertyImage.render_error
+                    )
+                    .where(PropertyImage.sha256.in_(hashes), PropertyImage.variants.isnot(None))
+                    .distinct(PropertyImage.sha256)
+                )
+                known = {
+                    row.sha256: {
+                        "variants": row.variants,
+                        "width": row.width,
+                        "height": row.height,
+                        "render_error": row.render_error
+                    }
+                    for row in result
+                }
+
+        # No connection is held while images download and render
+        rendered = {}
+        for row in pending:
+            if row.sha256 in known:
+                rendered[row.id] = known[row.sha256]
+                continue
+            try:
+                values = await self.render(row.url)
+            except Exception as e:
+                logger.error(f"Image variants failed for {row.url}: {e}")
+                continue
+            if values:
+                rendered[row.id] = values
+        if not rendered:
+            return 0
+
+        # Row by row: an image deleted meanwhile is simply not updated
+        async with AsyncSessionLocal() as session:
+            for image_id, values in rendered.items():
+                await session.execute(
+                    update(PropertyImage)
+                    .where(PropertyImage.id == image_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+
+        await cache_service.invalidate(PROPERTIES_SCOPE)
+        return len(rendered)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+image_service = ImageService()
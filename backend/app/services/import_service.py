@@ -0,0 +1,398 @@
+from sqlalchemy import Table, Column, MetaData, Text, Integer, Numeric, DateTime, select, cast, literal, literal_column, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB, insert
+from sqlalchemy import delete
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
+from pydantic import ValidationError
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+from app.config import settings
+from app.models.property import Property, PropertyStatus, property_geohash
+from app.models.property_image import PropertyImage
+from app.schemas.property import PropertyImportFormat, PropertyImportRow, PropertyImportError, PropertyImportReport
+from app.services.slug_service import slug_service, create_slug
+from app.services.stored_object_service import stored_object_service
+from app.services.cache_service import cache_service, PROPERTIES_SCOPE
+from app.services.index_watcher import index_watcher
+import codecs
+import csv
+import json
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Per-transaction staging table: enums arrive as member names and JSON as
+# text, and are cast on the way into properties
+staging = Table(
+    "property_import_staging",
+    MetaData(),
+    Column("id", UUID(as_uuid=True)),
+    Column("title", Text),
+    Column("slug", Text),
+    Column("description", Text),
+    Column("type", Text),
+    Column("purpose", Text),
+    Column("price", Numeric),
+    Column("location", Text),
+    Column("address", Text),
+    Column("latitude", Numeric),
+    Column("longitude", Numeric),
+    Column("geohash", Text),
+    Column("bedrooms", Integer),
+    Column("bathrooms", Integer),
+    Column("area_sqft", Integer),
+    Column("features", Text),
+    Column("images", Text),
+    Column("status", Text),
+    Column("agent_id", UUID(as_uuid=True)),
+    Column("created_at", DateTime),
+    Column("published_at", DateTime),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP"
+)
+
+STAGING_COLUMNS = [c.name for c in staging.columns]
+
+# Columns an import overwrites on an existing property; slug, agent, views
+# and creation time are kept
+UPDATE_COLUMNS = [
+    "title", "description", "type", "purpose", "price", "location", "address",
+    "latitude", "longitude", "geohash", "bedrooms", "bathrooms", "area_sqft",
+    "features", "status"
+]
+
+# Staging columns that are not properties columns
+GALLERY_COLUMNS = ["images"]
+
+# Raw record, or the reason it could not be parsed
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream into lines, keeping line endings"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+def _csv_value(field: str, value: str):
+    value = value.strip()
+    if value == "":
+        return None
+    if field in ("features", "images"):
+        if value[0] in "[{":
+            return json.loads(value)
+        if field == "images":
+            return [url.strip() for url in value.split("|") if url.strip()]
+    return value
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Parse CSV records as they stream in.
+
+    Quoted fields may span lines: lines are gathered until their quotes
+    balance, then parsed as one record. JSON in the features and images
+    columns is decoded; images may also be "|"-separated URLs.
+    """
+    header: Optional[List[str]] = None
+    pending = ""
+    row = 0
+    async for line in iter_lines(chunks):
+        pending += line
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        try:
+            yield row, {field: _csv_value(field, value) for field, value in zip(header, values)}, None
+        except ValueError as e:
+            yield row, None, f"Invalid JSON: {e}"
+    if pending.strip():
+        yield row + 1, None, "Unterminated quoted field"
+
+async def iter_jsonl(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """Parse one JSON object per line as they stream in"""
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Expected a JSON object"
+            continue
+        yield row, record, None
+
+def _error_messages(e: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+
+class ImportService:
+    """
+    Bulk property import from streamed CSV or JSON Lines.
+
+    Rows are validated against PropertyImportRow as they arrive and loaded
+    in batches: one query allocates slugs for the whole batch, asyncpg's
+    COPY fills a temporary staging table, and a single INSERT ... SELECT
+    upserts it into properties. Each batch commits on its own, so memory
+    stays bounded and a bad batch does not undo earlier ones; a batch the
+    database rejects is loaded again row by row, so only the offending rows
+    are reported.
+    """
+
+    def __init__(self):
+        self.batch_size = settings.IMPORT_BATCH_SIZE
+        self.max_errors = settings.IMPORT_MAX_ERRORS
+
+    def _upsert(self):
+        columns = [name for name in STAGING_COLUMNS if name not in GALLERY_COLUMNS] + ["updated_at", "views"]
+        source = select(
+            staging.c.id,
+            staging.c.title,
+            staging.c.slug,
+            staging.c.description,
+            cast(staging.c.type, Property.type.type),
+            cast(staging.c.purpose, Property.purpose.type),
+            staging.c.price,
+            staging.c.location,
+            staging.c.address,
+            staging.c.latitude,
+            staging.c.longitude,
+            staging.c.geohash,
+            staging.c.bedrooms,
+            staging.c.bathrooms,
+            staging.c.area_sqft,
+            cast(staging.c.features, JSONB),
+            cast(staging.c.status, Property.status.type),
+            staging.c.agent_id,
+            staging.c.created_at,
+            staging.c.published_at,
+            staging.c.created_at,
+            literal(0)
+        )
+        stmt = insert(Property).from_select(columns, source)
+        return stmt.on_conflict_do_update(
+            index_elements=[Property.id],
+            set_={
+                **{name: stmt.excluded[name] for name in UPDATE_COLUMNS},
+                "updated_at": stmt.excluded.updated_at,
+                "published_at": func.coalesce(Property.published_at, stmt.excluded.published_at)
+            }
+        ).returning(literal_column("xmax = 0").label("inserted"))
+
+    def _gallery(self, now: datetime):
+        """
+        Statements setting the galleries of rows that came with images.
+
+        Images missing from the feed are removed; listed ones are added or
+        moved into feed order, keeping their rendered variants.
+        """
+        images = cast(staging.c.images, JSONB)
+        removed = (
+            delete(PropertyImage)
+            .where(
+                PropertyImage.property_id == staging.c.id,
+                staging.c.images.isnot(None),
+                ~images.has_key(PropertyImage.url)
+            )
+        )
+        elements = func.jsonb_array_elements_text(images).table_valued("value", with_ordinality="ordinality")
+        source = (
+            select(
+                func.gen_random_uuid(),
+                staging.c.id,
+                elements.c.ordinality - 1,
+                elements.c.value,
+                literal(now, DateTime)
+            )
+            .select_from(staging)
+            .join(elements, literal(True))
+            .where(staging.c.images.isnot(None))
+        )
+        stmt = insert(PropertyImage).from_select(["id", "property_id", "position", "url", "created_at"], source)
+        upserted = stmt.on_conflict_do_update(
+            index_elements=[PropertyImage.property_id, PropertyImage.url],
+            set_={"position": stmt.excluded.position}
+        )
+        return removed, upserted
+
+    async def _allocate_slugs(self, db: AsyncSession, items: List[PropertyImportRow]) -> List[str]:
+        """Slugs for the batch: existing properties keep theirs, new ones get fresh ones"""
+        result = await db.execute(
+            select(Property.id, Property.slug).where(Property.id.in_([item.id for item in items]))
+        )
+        existing = dict(result.all())
+        bases = [create_slug(item.title) for item in items if item.id not in existing]
+        highest = await slug_service.highest_suffixes(db, bases) if bases else {}
+        slugs = []
+        for item in items:
+            if item.id in existing:
+                slugs.append(existing[item.id])
+                continue
+            base = create_slug(item.title)
+            suffix = highest.get(base)
+            slugs.append(base if suffix is None else f"{base}-{suffix + 1}")
+            highest[base] = 0 if suffix is None else suffix + 1
+        return slugs
+
+    def _record(self, item: PropertyImportRow, slug: str, agent_id: uuid.UUID, now: datetime) -> tuple:
+        return (
+            item.id,
+            item.title,
+            slug,
+            item.description,
+            item.type.name,
+            item.purpose.name,
+            item.price,
+            item.location,
+            item.address,
+            item.latitude,
+            item.longitude,
+            property_geohash(item.latitude, item.longitude),
+            item.bedrooms,
+            item.bathrooms,
+            item.area_sqft,
+            json.dumps(item.features) if item.features is not None else None,
+            # A gallery holds each URL once
+            json.dumps(list(dict.fromkeys(item.images))) if item.images is not None else None,
+            item.status.name,
+            agent_id,
+            now,
+            now if item.status == PropertyStatus.PUBLISHED else None
+        )
+
+    async def _load(self, db: AsyncSession, items: List[PropertyImportRow], agent_id: uuid.UUID) -> Tuple[int, int]:
+        """COPY one batch into staging and upsert it; returns (inserted, updated)"""
+        slugs = await self._allocate_slugs(db, items)
+        now = datetime.utcnow()
+        records = [self._record(item, slug, agent_id, now) for item, slug in zip(items, slugs)]
+
+        connection = await db.connection()
+        await connection.execute(CreateTable(staging))
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            staging.name,
+            records=records,
+            columns=STAGING_COLUMNS
+        )
+        result = await connection.execute(self._upsert())
+        inserted = sum(1 for row in result if row.inserted)
+
+        # Galleries given in the feed replace the stored ones; storage references move with them
+        gallery_ids = [item.id for item in items if item.images is not None]
+        before = []
+        if gallery_ids:
+            before = (await connection.execute(
+                select(PropertyImage.url).where(PropertyImage.property_id.in_(gallery_ids))
+            )).scalars().all()
+        for stmt in self._gallery(now):
+            await connection.execute(stmt)
+        after = [url for item in items if item.images is not None for url in dict.fromkeys(item.images)]
+        await stored_object_service.update_refs(db, before, after)
+        await db.commit()
+        return inserted, len(records) - inserted
+
+    async def run(
+        self,
+        db: AsyncSession,
+        chunks: AsyncIterator[bytes],
+        format: PropertyImportFormat,
+        agent_id: uuid.UUID
+    ) -> PropertyImportReport:
+        """Import a streamed feed, assigning new properties to agent_id"""
+        started = time.perf_counter()
+        rows = inserted = updated = failed = 0
+        errors: List[PropertyImportError] = []
+        batch: Dict[uuid.UUID, Tuple[int, PropertyImportRow]] = {}
+
+        def fail(row: int, messages: List[str]):
+            nonlocal failed
+            failed += 1
+            if len(errors) < self.max_errors:
+                errors.append(PropertyImportError(row=row, errors=messages))
+
+        async def load(entries: List[Tuple[int, PropertyImportRow]]):
+            nonlocal inserted, updated
+            counts = await self._load(db, [item for _, item in entries], agent_id)
+            inserted += counts[0]
+            updated += counts[1]
+
+        async def flush():
+            entries = list(batch.values())
+            batch.clear()
+            try:
+                await load(entries)
+                return
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Import batch failed, loading its rows one by one: {e}")
+
+            # Isolates the rows the database rejects; slugs taken meanwhile
+            # by a concurrent create are allocated afresh
+            for entry in entries:
+                try:
+                    await load([entry])
+                except Exception as e:
+                    await db.rollback()
+                    fail(entry[0], [str(e.orig if isinstance(e, DBAPIError) else e)])
+
+        parse = iter_csv if format == PropertyImportFormat.CSV else iter_jsonl
+        async for row, record, error in parse(chunks):
+            rows += 1
+            if error is not None:
+                fail(row, [error])
+                continue
+            try:
+                item = PropertyImportRow.model_validate(record)
+            except ValidationError as e:
+                fail(row, _error_messages(e))
+                continue
+            key = item.id or uuid.uuid4()
+            item.id = key
+            # One upsert cannot touch a row twice, so a repeated id starts a new batch
+            if key in batch:
+                await flush()
+            batch[key] = (row, item)
+            if len(batch) >= self.batch_size:
+                await flush()
+        if batch:
+            await flush()
+
+        if inserted or updated:
+            await cache_service.invalidate(PROPERTIES_SCOPE)
+            # Reaches the other workers too when run from the import CLI
+            await index_watcher.notify()
+
+        seconds = time.perf_counter() - started
+        return PropertyImportReport(
+            rows=rows,
+            inserted=inserted,
+            updated=updated,
+            failed=failed,
+            errors=errors,
+            errors_truncated=failed > len(errors),
+            seconds=round(seconds, 3),
+            rows_per_second=round((inserted + updated) / seconds, 1) if seconds > 0 else 0.0
+        )
+
+import_service = ImportService()
@@ -0,0 +1,72 @@
+from typing import Optional
+from app.config import settings
+from app.services.cache_service import cache_service, INDEXES_SCOPE
+from app.services.cluster_index import cluster_index
+from app.services.location_index import location_index
+from app.services.spelling_index import spelling_index
+from app.services.term_stats import term_stats
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class IndexWatcher:
+    """
+    Carries bulk property changes to the in-memory indexes of every worker.
+
+    The process making the change, an API worker or the import CLI, bumps
+    the shared INDEXES_SCOPE version in Redis. Each worker polls that
+    version and marks its indexes stale when it moves, so they rebuild
+    within INDEX_WATCH_INTERVAL instead of on their next periodic refresh.
+    """
+
+    def __init__(self):
+        self.interval = settings.INDEX_WATCH_INTERVAL
+        self._version: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_stale(self):
+        """Rebuild this process's indexes soon"""
+        cluster_index.mark_stale()
+        location_index.mark_stale()
+        spelling_index.mark_stale()
+        term_stats.mark_stale()
+
+    async def notify(self):
+        """Announce a bulk change to every worker, this one included"""
+        version = await cache_service.invalidate(INDEXES_SCOPE)
+        if version is not None:
+            # Already handled here; the poll need not rebuild again
+            self._version = version
+        self.mark_stale()
+
+    async def check(self):
+        """Mark the indexes stale if another process announced a change"""
+        version = await cache_service.version(INDEXES_SCOPE)
+        if version is None:
+            return
+        if self._version is not None and version != self._version:
+            logger.info("Bulk property change announced, rebuilding indexes")
+            self.mark_stale()
+        self._version = version
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start polling for announced changes"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+index_watcher = IndexWatcher()
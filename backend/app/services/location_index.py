@@ -0,0 +1,82 @@
+from sqlalchemy import select, func
+from bisect import bisect_left
+from typing import List, Set, Tuple
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.property import Property, PropertyStatus
+from app.services.background_index import BackgroundIndex
+import re
+import unicodedata
+
+# Bound the work per lookup for very short prefixes
+MAX_SCAN = 2000
+
+_WORD_START_RE = re.compile(r"(?:^|[\s,/-])(?=\w)")
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+class LocationIndex(BackgroundIndex):
+    """
+    In-memory prefix index over distinct published property locations.
+
+    Every word of a location is a searchable start, so "nai" finds
+    "Kilimani, Nairobi". Keys live in one sorted array searched with bisect;
+    the array is rebuilt in the background, so lookups never wait on Postgres.
+    """
+
+    name = "Location index"
+
+    def __init__(self):
+        super().__init__(
+            settings.LOCATION_INDEX_REFRESH_INTERVAL,
+            min_refresh_interval=settings.LOCATION_INDEX_MIN_REFRESH_INTERVAL
+        )
+        self._keys: List[str] = []
+        self._entries: List[int] = []
+        self._locations: List[Tuple[str, int]] = []
+
+    def build(self, rows: List[Tuple[str, int]]):
+        """Replace the index with (location, listing count) rows"""
+        pairs = []
+        for i, (location, _) in enumerate(rows):
+            text = normalize(location)
+            for match in _WORD_START_RE.finditer(text):
+                pairs.append((text[match.end():], i))
+        pairs.sort()
+        # Swap everything at once so concurrent lookups see a consistent snapshot
+        self._keys, self._entries, self._locations = [k for k, _ in pairs], [i for _, i in pairs], rows
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """Locations with a word starting with prefix, most listings first"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        keys, entries, locations = self._keys, self._entries, self._locations
+
+        seen: Set[int] = set()
+        start = bisect_left(keys, prefix)
+        for pos in range(start, min(start + MAX_SCAN, len(keys))):
+            if not keys[pos].startswith(prefix):
+                break
+            seen.add(entries[pos])
+
+        matches = sorted(seen, key=lambda i: (-locations[i][1], locations[i][0]))[:limit]
+        return [{"location": locations[i][0], "count": locations[i][1]} for i in matches]
+
+    async def refresh(self):
+        """Reload distinct locations and their published listing counts"""
+        async with AsyncSessionLocal() as session:
+            stmt = (
+                select(Property.location, func.count())
+                .where(Property.status == PropertyStatus.PUBLISHED)
+                .group_by(Property.location)
+            )
+            result = await session.execute(stmt)
+            rows = [(location, count) for location, count in result.all() if location]
+        self.build(rows)
+
+location_index = LocationIndex()
@@ -0,0 +1,76 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, List, Optional, Tuple
+from datetime import datetime
+from app.models.property import Property
+from app.models.property_image import PropertyImage
+from app.services.stored_object_service import stored_object_service
+import uuid
+
+class PropertyImageService:
+    """
+    Property galleries, one property_images row per image.
+
+    Adding an image inserts a row and never rewrites the property row or
+    the rest of its gallery. Storage references are moved in the same
+    transaction.
+    """
+
+    async def append(
+        self,
+        db: AsyncSession,
+        property_id: uuid.UUID,
+        images: Iterable[Tuple[str, Optional[str]]]
+    ) -> List[str]:
+        """Add (url, sha256) images at the end of a gallery; returns the URLs that were new"""
+        images = list(dict(images).items())
+        if not images:
+            return []
+
+        # Evaluated once per statement, so the rows number on from the current end
+        next_position = (
+            select(func.coalesce(func.max(PropertyImage.position) + 1, 0))
+            .where(PropertyImage.property_id == property_id)
+            .scalar_subquery()
+        )
+        now = datetime.utcnow()
+        stmt = (
+            insert(PropertyImage)
+            .values([
+                {
+                    "id": uuid.uuid4(),
+                    "property_id": property_id,
+                    "position": next_position + offset,
+                    "url": url,
+                    "sha256": sha256,
+                    "created_at": now,
+                }
+                for offset, (url, sha256) in enumerate(images)
+            ])
+            .on_conflict_do_nothing(index_elements=[PropertyImage.property_id, PropertyImage.url])
+            .returning(PropertyImage.url)
+        )
+        added = (await db.execute(stmt)).scalars().all()
+        await stored_object_service.update_refs(db, [], added)
+        return added
+
+    async def replace(self, db: AsyncSession, property: Property, urls: Optional[List[str]]):
+        """
+        Set a loaded property's gallery to urls, in order.
+
+        Images kept from the old gallery keep their rows, hashes and variants;
+        only rows that moved, appeared or disappeared are written.
+        """
+        before = list(property.images)
+        existing = {photo.url: photo for photo in property.photos}
+        property.photos = [existing.get(url) or PropertyImage(url=url) for url in dict.fromkeys(urls or [])]
+        property.photos.reorder()
+        await stored_object_service.update_refs(db, before, property.images)
+
+    async def remove(self, db: AsyncSession, photo: PropertyImage):
+        """Delete one image; the rest of the gallery keeps its positions"""
+        await db.delete(photo)
+        await stored_object_service.update_refs(db, [photo.url], [])
+
+property_image_service = PropertyImageService()
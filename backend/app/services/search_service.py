@@ -0,0 +1,64 @@
+from sqlalchemy import func, false, literal, literal_column, Float
+from typing import List, Optional
+from app.models.property import Property
+from app.services.term_stats import term_stats
+from functools import reduce
+import operator
+import re
+
+# Must match the text search configuration used by Property.search_vector
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+MAX_TERMS = 8
+
+# ts_rank weights for {D, C, B, A}: description (C) < location (B) < title (A)
+FIELD_WEIGHTS = literal_column("'{0, 0.2, 0.5, 1.0}'::float4[]")
+# 1: divide by 1 + log(document length); 32: saturate as rank / (rank + 1)
+RANK_NORMALIZATION = 1 | 32
+
+_TERM_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+def tokenize(text: str) -> List[str]:
+    """Split free text into lowercase search terms"""
+    return _TERM_RE.findall(text.lower())[:MAX_TERMS]
+
+def build_tsquery(text: str) -> Optional[str]:
+    """Build a to_tsquery expression that prefix-matches every term"""
+    terms = tokenize(text)
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+def search_condition(text: str):
+    """
+    WHERE clause matching properties against the search vector (GIN indexed).
+
+    Text without any searchable term (e.g. "!!!") matches nothing.
+    """
+    tsquery = build_tsquery(text)
+    if tsquery is None:
+        return false()
+    return Property.search_vector.op("@@")(func.to_tsquery(SEARCH_CONFIG, tsquery))
+
+def search_rank(text: str):
+    """
+    BM25-style relevance score for text, computed in the database.
+
+    Each term contributes its IDF (from the term statistics snapshot) times a
+    saturating, length-normalized ts_rank_cd over the weighted search vector,
+    so a title match outranks a location match, which outranks a description
+    match, and rare terms outweigh common ones.
+    """
+    terms = tokenize(text)
+    if not terms:
+        return literal(0.0)
+    scores = [
+        term_stats.idf(term) * func.ts_rank_cd(
+            FIELD_WEIGHTS,
+            Property.search_vector,
+            func.to_tsquery(SEARCH_CONFIG, f"{term}:*"),
+            RANK_NORMALIZATION,
+            type_=Float
+        )
+        for term in terms
+    ]
+    return reduce(operator.add, scores)
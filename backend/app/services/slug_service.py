@@ -0,0 +1,98 @@
+from sqlalchemy import select, func, cast, values, column, and_, Integer, String
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, Optional
+from app.models.property import Property, property_geohash
+import re
+import uuid
+
+# Longer numeric suffixes are not counters (and would overflow integer)
+SUFFIX_PATTERN = "-([0-9]{1,9})"
+# Allocations to try before giving up when concurrent creates keep winning
+MAX_ATTEMPTS = 5
+
+def create_slug(title: str) -> str:
+    """Create URL-friendly slug from title"""
+    slug = title.lower()
+    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    slug = slug.strip('-')
+    return slug or "property"
+
+def slug_pattern(base: str) -> str:
+    """Regex matching base and its base-N siblings"""
+    return f"^{re.escape(base)}({SUFFIX_PATTERN})?$"
+
+class SlugService:
+    """
+    Unique slug allocation for properties.
+
+    Instead of probing base-1, base-2, ... one query at a time, a single
+    query finds the highest suffix in use among base's siblings through a
+    byte-order range scan on the slug pattern index. Inserts use
+    ON CONFLICT DO NOTHING, so losing a race to a concurrent create costs
+    one more allocation rather than an error.
+    """
+
+    async def highest_suffixes(
+        self,
+        db: AsyncSession,
+        bases: Iterable[str],
+        exclude_id: Optional[uuid.UUID] = None
+    ) -> Dict[str, int]:
+        """
+        Highest suffix in use per base (0 for base itself) in one query.
+
+        Free bases are absent from the result. Bases come from create_slug,
+        so they hold no regex metacharacters.
+        """
+        bases = values(column("base", String), name="bases").data([(base,) for base in set(bases)])
+        suffix = func.substring(Property.slug, func.concat("^", bases.c.base, SUFFIX_PATTERN, "$"))
+        stmt = (
+            select(bases.c.base, func.max(func.coalesce(cast(suffix, Integer), 0)))
+            .join(Property, and_(
+                # Every sibling sorts in [base, base + ":"): "-" and digits sort below ":"
+                Property.slug.op("~>=~")(bases.c.base),
+                Property.slug.op("~<~")(func.concat(bases.c.base, ":")),
+                Property.slug.op("~")(func.concat("^", bases.c.base, "(", SUFFIX_PATTERN, ")?$"))
+            ))
+            .group_by(bases.c.base)
+        )
+        if exclude_id is not None:
+            stmt = stmt.where(Property.id != exclude_id)
+        result = await db.execute(stmt)
+        return dict(result.all())
+
+    async def allocate(self, db: AsyncSession, base: str, exclude_id: Optional[uuid.UUID] = None) -> str:
+        """base if free, otherwise base-N one past the highest suffix in use"""
+        highest = (await self.highest_suffixes(db, [base], exclude_id)).get(base)
+        return base if highest is None else f"{base}-{highest + 1}"
+
+    def is_sibling(self, slug: str, base: str) -> bool:
+        """Whether slug is base or one of its base-N siblings"""
+        return re.match(slug_pattern(base), slug) is not None
+
+    async def insert(self, db: AsyncSession, fields: dict, base: str) -> Optional[Property]:
+        """
+        Insert a property under a freshly allocated slug.
+
+        Returns None if every attempt lost its slug to a concurrent insert.
+        """
+        fields = {
+            **fields,
+            # Core inserts skip ORM events, so set the geohash here
+            "geohash": property_geohash(fields.get("latitude"), fields.get("longitude"))
+        }
+        for _ in range(MAX_ATTEMPTS):
+            slug = await self.allocate(db, base)
+            stmt = (
+                insert(Property)
+                .values(**fields, slug=slug)
+                .on_conflict_do_nothing(index_elements=[Property.slug])
+                .returning(Property)
+            )
+            property = (await db.execute(stmt)).scalar_one_or_none()
+            if property is not None:
+                return property
+        return None
+
+slug_service = SlugService()
@@ -0,0 +1,124 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.property import Property, PropertyStatus
+from app.services.background_index import BackgroundIndex
+from app.services.search_service import tokenize
+
+MIN_TERM_LENGTH = 4
+PREFIX_LENGTH = 7
+
+def _max_distance(term: str) -> int:
+    return 1 if len(term) <= 5 else 2
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """All strings reachable from word by removing up to distance characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+class SpellingIndex(BackgroundIndex):
+    """
+    Symmetric-delete spelling corrector over the listing vocabulary.
+
+    Words and their document frequencies come from ts_stat over the search
+    vectors, across all weights, so any word a search can match (title,
+    location or description) counts as known. Each word is stored under every
+    variant with up to two characters deleted, so a misspelling finds its
+    candidates with a handful of dict lookups instead of a vocabulary scan.
+    """
+
+    name = "Spelling index"
+
+    def __init__(self):
+        super().__init__(settings.SPELLING_INDEX_REFRESH_INTERVAL)
+        self._frequencies: Dict[str, int] = {}
+        self._sorted: List[str] = []
+        self._deletes: Dict[str, List[str]] = {}
+
+    def build(self, rows: List[Tuple[str, int]]):
+        """Replace the vocabulary with (word, document frequency) rows"""
+        frequencies = {word: ndoc for word, ndoc in rows if word.isalpha()}
+        deletes: Dict[str, List[str]] = {}
+        for word in frequencies:
+            if len(word) < MIN_TERM_LENGTH:
+                continue
+            for variant in _deletes(word[:PREFIX_LENGTH], 2):
+                deletes.setdefault(variant, []).append(word)
+        self._frequencies, self._sorted, self._deletes = frequencies, sorted(frequencies), deletes
+
+    def _is_known_prefix(self, term: str) -> bool:
+        pos = bisect_left(self._sorted, term)
+        return pos < len(self._sorted) and self._sorted[pos].startswith(term)
+
+    def correct_term(self, term: str) -> str:
+        """Closest known word to term, or term itself if it is known or uncorrectable"""
+        if (
+            len(term) < MIN_TERM_LENGTH
+            or not term.isalpha()
+            or not self._frequencies
+            or self._is_known_prefix(term)
+        ):
+            return term
+
+        limit = _max_distance(term)
+        candidates: Set[str] = set()
+        for variant in _deletes(term[:PREFIX_LENGTH], limit):
+            candidates.update(self._deletes.get(variant, ()))
+
+        best: Optional[Tuple[int, int, str]] = None
+        for word in candidates:
+            distance = edit_distance(term, word, limit)
+            if distance > limit:
+                continue
+            rank = (distance, -self._frequencies[word], word)
+            if best is None or rank < best:
+                best = rank
+        return best[2] if best else term
+
+    def correct(self, text: str) -> Optional[str]:
+        """Corrected form of text, or None if no term needed correcting"""
+        terms = tokenize(text)
+        corrected = [self.correct_term(term) for term in terms]
+        if corrected == terms:
+            return None
+        return " ".join(corrected)
+
+    async def refresh(self):
+        """Reload the vocabulary of published properties"""
+        documents = select(Property.search_vector).where(Property.status == PropertyStatus.PUBLISHED)
+        documents_sql = str(documents.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True}
+        ))
+        stats = func.ts_stat(documents_sql).table_valued("word", "ndoc")
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(stats.c.word, stats.c.ndoc))
+            rows = result.all()
+        self.build(rows)
+
+spelling_index = SpellingIndex()
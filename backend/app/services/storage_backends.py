@@ -0,0 +1,212 @@
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional
+from app.config import settings
+import logging
+import mimetypes
+import os
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ObjectInfo:
+    size: int
+    content_type: Optional[str]
+
+class StorageBackend:
+    """
+    Where stored files live.
+
+    Methods are blocking; StorageService runs them on its thread pool.
+    """
+
+    def public_url(self, file_key: str) -> str:
+        raise NotImplementedError
+
+    def head(self, file_key: str) -> Optional[ObjectInfo]:
+        """Object metadata, or None if it does not exist"""
+        raise NotImplementedError
+
+    def put_file(self, fileobj: BinaryIO, file_key: str, content_type: Optional[str]):
+        raise NotImplementedError
+
+    def put_bytes(self, data: bytes, file_key: str, content_type: str):
+        raise NotImplementedError
+
+    def read(self, file_key: str, length: Optional[int] = None) -> bytes:
+        """Content of an object, or its first length bytes"""
+        raise NotImplementedError
+
+    def delete(self, file_keys: List[str]):
+        raise NotImplementedError
+
+    def presign_upload(self, file_key: str, content_type: str, max_size: int) -> Optional[dict]:
+        """Presigned POST for a direct client upload, or None if unsupported"""
+        return None
+
+class S3Backend(StorageBackend):
+    """MinIO or any S3-compatible object store"""
+
+    def __init__(self):
+        self.s3_client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_ENDPOINT,
+            aws_access_key_id=settings.S3_ACCESS_KEY,
+            aws_secret_access_key=settings.S3_SECRET_KEY,
+            use_ssl=settings.S3_USE_SSL,
+            region_name=settings.S3_REGION,
+            config=Config(max_pool_connections=settings.S3_MAX_WORKERS)
+        )
+        self.bucket = settings.S3_BUCKET
+        # Presigned URLs are signed for the host the browser will contact
+        self.presign_client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_PRESIGN_ENDPOINT or settings.S3_ENDPOINT,
+            aws_access_key_id=settings.S3_ACCESS_KEY,
+            aws_secret_access_key=settings.S3_SECRET_KEY,
+            use_ssl=settings.S3_USE_SSL,
+            region_name=settings.S3_REGION,
+            config=Config(signature_version="s3v4")
+        )
+        # Parts are uploaded one after another on the calling thread, so
+        # concurrency is bounded by the service's thread pool
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE,
+            use_threads=False
+        )
+
+    def public_url(self, file_key: str) -> str:
+        base_url = settings.S3_PUBLIC_URL_OVERRIDE or settings.S3_ENDPOINT
+        return f"{base_url}/{self.bucket}/{file_key}"
+
+    def head(self, file_key: str) -> Optional[ObjectInfo]:
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket, Key=file_key)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return None
+            if code in ("403", "AccessDenied", "Forbidden"):
+                # S3 answers 403 for missing keys when ListBucket is not granted
+                logger.warning(f"Access denied to {file_key}, treating it as missing")
+                return None
+            raise
+        return ObjectInfo(size=response["ContentLength"], content_type=response.get("ContentType"))
+
+    def put_file(self, fileobj: BinaryIO, file_key: str, content_type: Optional[str]):
+        self.s3_client.upload_fileobj(
+            fileobj,
+            self.bucket,
+            file_key,
+            ExtraArgs={"ContentType": content_type} if content_type else None,
+            Config=self.transfer_config
+        )
+
+    def put_bytes(self, data: bytes, file_key: str, content_type: str):
+        self.s3_client.put_object(Bucket=self.bucket, Key=file_key, Body=data, ContentType=content_type)
+
+    def read(self, file_key: str, length: Optional[int] = None) -> bytes:
+        extra = {"Range": f"bytes=0-{length - 1}"} if length else {}
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=file_key, **extra)
+        return response["Body"].read()
+
+    def delete(self, file_keys: List[str]):
+        # Up to 1000 keys per request
+        for start in range(0, len(file_keys), 1000):
+            batch = file_keys[start:start + 1000]
+            self.s3_client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+            )
+
+    def presign_upload(self, file_key: str, content_type: str, max_size: int) -> Optional[dict]:
+        # The policy pins the key and content type and caps the size, so the
+        # storage server rejects anything else. Signing is local, no request is made.
+        return self.presign_client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=file_key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_size]
+            ],
+            ExpiresIn=settings.PRESIGNED_UPLOAD_EXPIRY
+        )
+
+class LocalBackend(StorageBackend):
+    """
+    Files under UPLOAD_DIR, served by the media endpoint.
+
+    Writes go to a temporary file in the destination directory and are
+    renamed into place, so readers never see a partial file. Content types
+    are not stored; they follow from the key's extension.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.realpath(root or settings.UPLOAD_DIR)
+
+    def path(self, file_key: str) -> str:
+        """Absolute path of a key; keys may not escape the upload directory"""
+        path = os.path.realpath(os.path.join(self.root, file_key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid storage key: {file_key}")
+        return path
+
+    def public_url(self, file_key: str) -> str:
+        return f"{settings.MEDIA_BASE_URL}/{file_key}"
+
+    def head(self, file_key: str) -> Optional[ObjectInfo]:
+        path = self.path(file_key)
+        if not os.path.isfile(path):
+            return None
+        return ObjectInfo(size=os.path.getsize(path), content_type=mimetypes.guess_type(path)[0])
+
+    def _write(self, file_key: str, write):
+        path = self.path(file_key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                write(temp)
+                temp.flush()
+                os.fsync(temp.fileno())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def put_file(self, fileobj: BinaryIO, file_key: str, content_type: Optional[str]):
+        self._write(file_key, lambda temp: shutil.copyfileobj(fileobj, temp))
+
+    def put_bytes(self, data: bytes, file_key: str, content_type: str):
+        self._write(file_key, lambda temp: temp.write(data))
+
+    def read(self, file_key: str, length: Optional[int] = None) -> bytes:
+        with open(self.path(file_key), "rb") as f:
+            return f.read(length if length else -1)
+
+    def delete(self, file_keys: List[str]):
+        for file_key in file_keys:
+            try:
+                os.unlink(self.path(file_key))
+            except FileNotFoundError:
+                pass
+
+BACKENDS = {
+    "s3": S3Backend,
+    "local": LocalBackend,
+}
+
+def create_backend(name: Optional[str] = None) -> StorageBackend:
+    name = name or settings.STORAGE_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
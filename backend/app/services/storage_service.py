@@ -1,54 +1,134 @@
-import boto3
-from botocore.exceptions import ClientError
 from fastapi import UploadFile
-import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Optional, Tuple
+import asyncio
+import hashlib
 import os
 from app.config import settings
+from app.services.storage_backends import create_backend, ObjectInfo
 import logging
 
 logger = logging.getLogger(__name__)
 
+HASH_CHUNK_SIZE = 1024 * 1024
+
+@dataclass
+class StoredFile:
+    key: str
+    url: str
+    sha256: Optional[str]  # None for presigned uploads, which are never read by the API
+    size: int
+    content_type: Optional[str]
+
 class StorageService:
+    """
+    Stored files, on the backend chosen by STORAGE_BACKEND (S3 or local disk).
+
+    Backend calls block, so every one runs on a thread pool, never on the
+    event loop.
+    """
+
     def __init__(self):
-        self.s3_client = boto3.client(
-            "s3",
-            endpoint_url=settings.S3_ENDPOINT,
-            aws_access_key_id=settings.S3_ACCESS_KEY,
-            aws_secret_access_key=settings.S3_SECRET_KEY,
-            use_ssl=settings.S3_USE_SSL,
-            region_name=settings.S3_REGION
+        self.backend = create_backend()
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.S3_MAX_WORKERS,
+            thread_name_prefix="storage"
         )
-        self.bucket = settings.S3_BUCKET
 
-    async def upload_file(self, file: UploadFile, folder: str = "properties") -> str:
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    def public_url(self, file_key: str) -> str:
+        return self.backend.public_url(file_key)
+
+    def _hash_file(self, fileobj) -> Tuple[str, int]:
+        """SHA-256 and size of a file, read in chunks"""
+        digest = hashlib.sha256()
+        size = 0
+        fileobj.seek(0)
+        while chunk := fileobj.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+        fileobj.seek(0)
+        return digest.hexdigest(), size
+
+    async def exists(self, file_key: str) -> bool:
+        return await self.head(file_key) is not None
+
+    async def hash_upload(self, file: UploadFile) -> Tuple[str, int]:
+        """SHA-256 and size of an uploaded file, read in chunks off the event loop"""
+        return await self._run(self._hash_file, file.file)
+
+    def content_key(self, file: UploadFile, sha256: str, folder: str = "properties") -> str:
+        """Content-addressed key: identical files share one object"""
+        file_extension = os.path.splitext(file.filename)[1].lower()
+        return f"{folder}/{sha256[:2]}/{sha256}{file_extension}"
+
+    async def put_upload(self, file: UploadFile, file_key: str):
         """
-        Uploads a file to MinIO/S3 and returns the URL.
+        Store an uploaded file under file_key.
+
+        The spooled request file is streamed to the backend in chunks rather
+        than being read into memory first.
         """
-        file_extension = os.path.splitext(file.filename)[1]
-        file_key = f"{folder}/{uuid.uuid4()}{file_extension}"
-        
         try:
-            # Upload the file
-            content = await file.read()
-            self.s3_client.put_object(
-                Bucket=self.bucket,
-                Key=file_key,
-                Body=content,
-                ContentType=file.content_type
-            )
-            
-            # Reset file pointer just in case
+            await self._run(self.backend.put_file, file.file, file_key, file.content_type)
             await file.seek(0)
-            
-            # Construct URL
-            base_url = settings.S3_PUBLIC_URL_OVERRIDE or settings.S3_ENDPOINT
-            return f"{base_url}/{self.bucket}/{file_key}"
-            
-        except ClientError as e:
-            logger.error(f"S3 upload error: {e}")
-            raise Exception("Failed to upload file to storage")
         except Exception as e:
-            logger.error(f"Unexpected storage error: {e}")
+            logger.error(f"Storage upload error: {e}")
             raise Exception(f"Internal storage error: {str(e)}")
 
+    def key_for_url(self, url: str) -> Optional[str]:
+        """Object key behind a URL returned by this service, or None for foreign URLs"""
+        prefix = self.public_url("")
+        return url[len(prefix):] if url.startswith(prefix) else None
+
+    async def upload_bytes(self, data: bytes, file_key: str, content_type: str) -> str:
+        """Store generated content under file_key and return its URL"""
+        await self._run(self.backend.put_bytes, data, file_key, content_type)
+        return self.public_url(file_key)
+
+    def presign_upload(self, file_key: str, content_type: str, max_size: int) -> Optional[dict]:
+        """Presigned POST letting a client upload file_key directly, or None if the backend cannot"""
+        return self.backend.presign_upload(file_key, content_type, max_size)
+
+    async def head(self, file_key: str) -> Optional[ObjectInfo]:
+        """Object metadata, or None if it does not exist"""
+        return await self._run(self.backend.head, file_key)
+
+    async def read_head(self, file_key: str, size: int) -> bytes:
+        """First size bytes of an object, via a ranged read"""
+        return await self._run(self.backend.read, file_key, size)
+
+    async def download_url(self, url: str) -> Optional[bytes]:
+        """Content of an object stored by this service, or None for foreign URLs"""
+        file_key = self.key_for_url(url)
+        if file_key is None:
+            return None
+        return await self._run(self.backend.read, file_key)
+
+    async def delete_url(self, url: str):
+        """Delete the object behind a URL returned by this service"""
+        file_key = self.key_for_url(url)
+        if file_key is None:
+            return
+        try:
+            await self._run(self.backend.delete, [file_key])
+        except Exception as e:
+            logger.error(f"Storage delete error: {e}")
+
+    async def delete_keys(self, keys: List[str]):
+        """Delete many objects"""
+        try:
+            await self._run(self.backend.delete, keys)
+        except Exception as e:
+            logger.error(f"Storage delete error: {e}")
+            raise
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
 storage_service = StorageService()
@@ -0,0 +1,180 @@
+from sqlalchemy import select, update, delete, values, column, case, func, String, Integer
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import UploadFile
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.stored_object import StoredObject
+from app.services.storage_service import storage_service, StoredFile
+from app.services.image_service import image_service
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+GC_BATCH_SIZE = 500
+
+class StoredObjectService:
+    """
+    Reference counts for objects in storage.
+
+    Identical uploads share one content-addressed object, so an object can
+    only be deleted once no property image points at it any more. Counts
+    change in the caller's transaction; objects left unreferenced for
+    STORAGE_GC_GRACE_PERIOD are deleted by collect_garbage.
+
+    Every key is claimed (its row upserted and committed) before anything
+    is written to or deduplicated onto it. collect_garbage deletes rows and
+    objects under a row lock and skips rows claimed after it started, so
+    an upload either sees the object gone and stores it again, or keeps it
+    alive for another grace period.
+    """
+
+    def __init__(self):
+        self.grace_period = settings.STORAGE_GC_GRACE_PERIOD
+
+    async def claim(self, files: List[StoredFile]):
+        """
+        Record keys as about to be used, unreferenced until acquired.
+
+        Commits on its own session, so a concurrent collector sees the claim
+        before the object is checked or written. Claimed keys that are never
+        acquired (failed uploads, presigned uploads never committed) are
+        collected after the grace period.
+        """
+        if not files:
+            return
+        now = datetime.utcnow()
+        stmt = insert(StoredObject).values([
+            {
+                "key": file.key,
+                "sha256": file.sha256,
+                "size": file.size,
+                "content_type": file.content_type,
+                "ref_count": 0,
+                "released_at": now,
+                "created_at": now,
+            }
+            for file in {file.key: file for file in files}.values()
+        ])
+        # Waits for a collector holding the row; an unreferenced object restarts its grace period
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StoredObject.key],
+            set_={
+                "released_at": stmt.excluded.released_at,
+                "size": func.coalesce(stmt.excluded.size, StoredObject.size),
+                "content_type": func.coalesce(stmt.excluded.content_type, StoredObject.content_type),
+            },
+            where=StoredObject.ref_count <= 0
+        )
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def store_upload(self, file: UploadFile, folder: str = "properties") -> StoredFile:
+        """Store an uploaded file under its content hash, skipping content already stored"""
+        sha256, size = await storage_service.hash_upload(file)
+        file_key = storage_service.content_key(file, sha256, folder)
+        stored = StoredFile(
+            key=file_key,
+            url=storage_service.public_url(file_key),
+            sha256=sha256,
+            size=size,
+            content_type=file.content_type
+        )
+
+        await self.claim([stored])
+        if not await storage_service.exists(file_key):
+            await storage_service.put_upload(file, file_key)
+        return stored
+
+    async def store_uploads(self, files: List[UploadFile], folder: str = "properties") -> List[StoredFile]:
+        """
+        Store files concurrently, at most UPLOAD_CONCURRENCY at a time, in the order given.
+
+        On failure the first error is raised. Objects already stored are left
+        to collect_garbage: other requests may have deduplicated onto them.
+        """
+        semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+
+        async def store(file: UploadFile) -> StoredFile:
+            async with semaphore:
+                return await self.store_upload(file, folder)
+
+        results = await asyncio.gather(*(store(file) for file in files), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+        return results
+
+    async def update_refs(self, db: AsyncSession, before: Optional[Iterable[str]], after: Optional[Iterable[str]]):
+        """Move references from one image list to another; foreign URLs are ignored"""
+        deltas = Counter(after or [])
+        deltas.subtract(before or [])
+        batch = [
+            (key, delta)
+            for key, delta in (
+                (storage_service.key_for_url(url), delta) for url, delta in deltas.items() if delta
+            )
+            if key is not None
+        ]
+        if not batch:
+            return
+
+        changes = values(
+            column("key", String),
+            column("delta", Integer),
+            name="deltas"
+        ).data(batch)
+        ref_count = StoredObject.ref_count + changes.c.delta
+        await db.execute(
+            update(StoredObject)
+            .where(StoredObject.key == changes.c.key)
+            .values(
+                ref_count=ref_count,
+                released_at=case((ref_count <= 0, datetime.utcnow()), else_=None)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def collect_garbage(self) -> int:
+        """Delete objects unreferenced for longer than the grace period; returns how many"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.grace_period)
+        collected = 0
+        while True:
+            # Rows are locked and skipped, so concurrent collectors split the work
+            unreferenced = (StoredObject.ref_count <= 0, StoredObject.released_at < cutoff)
+            candidates = (
+                select(StoredObject.key)
+                .where(*unreferenced)
+                .limit(GC_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            async with AsyncSessionLocal() as session:
+                # Rechecked on the locked row: a claim or reference since the scan keeps it
+                result = await session.execute(
+                    delete(StoredObject)
+                    .where(StoredObject.key.in_(candidates.scalar_subquery()), *unreferenced)
+                    .returning(StoredObject.key)
+                )
+                keys = result.scalars().all()
+                if not keys:
+                    break
+
+                # Rows are only removed once their objects and variants are gone
+                await storage_service.delete_keys(
+                    keys + [variant for key in keys for variant in image_service.variant_keys(key)]
+                )
+                await session.commit()
+
+            collected += len(keys)
+            if len(keys) < GC_BATCH_SIZE:
+                break
+
+        logger.info(f"Collected {collected} unreferenced objects")
+        return collected
+
+stored_object_service = StoredObjectService()
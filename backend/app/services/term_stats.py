@@ -0,0 +1,68 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql
+from bisect import bisect_left
+from itertools import accumulate
+from typing import List, Tuple
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.property import Property, PropertyStatus
+from app.services.background_index import BackgroundIndex
+import math
+
+class TermStatistics(BackgroundIndex):
+    """
+    Document frequencies of search lexemes across published properties.
+
+    Feeds the IDF part of relevance scoring. Search terms are prefix
+    matched, so a term's frequency is summed over every lexeme it prefixes
+    using a prefix-sum array over the sorted vocabulary.
+    """
+
+    name = "Term statistics"
+
+    def __init__(self):
+        super().__init__(settings.TERM_STATS_REFRESH_INTERVAL)
+        self.document_count = 0
+        self._words: List[str] = []
+        self._cumulative: List[int] = [0]
+
+    def build(self, document_count: int, rows: List[Tuple[str, int]]):
+        """Replace the statistics with (word, document frequency) rows"""
+        rows = sorted(rows)
+        self.document_count, self._words, self._cumulative = (
+            document_count,
+            [word for word, _ in rows],
+            [0] + list(accumulate(ndoc for _, ndoc in rows))
+        )
+
+    def document_frequency(self, prefix: str) -> int:
+        """Documents containing a lexeme starting with prefix (upper bound)"""
+        words = self._words
+        start = bisect_left(words, prefix)
+        end = bisect_left(words, prefix + "\uffff", lo=start)
+        return min(self._cumulative[end] - self._cumulative[start], self.document_count)
+
+    def idf(self, prefix: str) -> float:
+        """BM25 inverse document frequency of a prefix term"""
+        n = self.document_count
+        df = self.document_frequency(prefix)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    async def refresh(self):
+        """Reload lexeme document frequencies for published properties"""
+        documents = select(Property.search_vector).where(Property.status == PropertyStatus.PUBLISHED)
+        documents_sql = str(documents.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True}
+        ))
+        stats = func.ts_stat(documents_sql).table_valued("word", "ndoc")
+        async with AsyncSessionLocal() as session:
+            total = await session.execute(
+                select(func.count()).select_from(Property).where(Property.status == PropertyStatus.PUBLISHED)
+            )
+            document_count = total.scalar() or 0
+            result = await session.execute(select(stats.c.word, stats.c.ndoc))
+            rows = result.all()
+        self.build(document_count, rows)
+
+term_stats = TermStatistics()
@@ -0,0 +1,89 @@
+from sqlalchemy import update, values, column, func, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from collections import Counter
+from typing import Optional
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.property import Property
+import asyncio
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+class ViewCounter:
+    """
+    Write-behind buffer for property view counts.
+
+    Views are counted in memory and flushed as one batched
+    UPDATE ... FROM (VALUES ...) per interval, so reading a property never
+    takes a row lock.
+    """
+
+    def __init__(self):
+        self.interval = settings.VIEW_FLUSH_INTERVAL
+        self.batch_size = settings.VIEW_FLUSH_BATCH_SIZE
+        self._by_id: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, property_id: uuid.UUID):
+        """Count one view of a property"""
+        self._by_id[property_id] += 1
+
+    async def flush(self):
+        """Write buffered deltas to the database"""
+        # Swap buffers before awaiting so views recorded meanwhile are kept
+        by_id, self._by_id = self._by_id, Counter()
+        if not by_id:
+            return
+
+        try:
+            async with AsyncSessionLocal() as session:
+                for batch in self._batches(by_id):
+                    await session.execute(self._update_statement(batch))
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to flush property views, will retry: {e}")
+            self._by_id.update(by_id)
+
+    def _batches(self, counts: Counter):
+        items = list(counts.items())
+        for i in range(0, len(items), self.batch_size):
+            yield items[i:i + self.batch_size]
+
+    def _update_statement(self, batch):
+        deltas = values(
+            column("id", UUID(as_uuid=True)),
+            column("delta", Integer),
+            name="deltas"
+        ).data(batch)
+        return (
+            update(Property)
+            .where(Property.id == deltas.c.id)
+            # Keep updated_at untouched: a view is not an edit
+            .values(views=func.coalesce(Property.views, 0) + deltas.c.delta, updated_at=Property.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self):
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop flushing periodically and write out what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+view_counter = ViewCounter()
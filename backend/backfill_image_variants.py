@@ -0,0 +1,51 @@
+"""
+Image Variant Backfill
+Renders thumbnail, card and full-size variants for property images uploaded
+before the variant pipeline existed. Safe to re-run: images that already
+have variants, and images hosted outside our storage, are skipped.
+
+Usage:
+    python backfill_image_variants.py [--concurrency 4]
+"""
+import argparse
+import asyncio
+from dotenv import load_dotenv
+
+# Before importing app, whose settings are read at import time
+load_dotenv()
+
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.property_image import PropertyImage
+from app.services.image_service import image_service
+
+async def main(args):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(PropertyImage.property_id).where(PropertyImage.variants.is_(None)).distinct()
+        )
+        property_ids = result.scalars().all()
+
+    print(f"Checking {len(property_ids)} properties with images...")
+    semaphore = asyncio.Semaphore(args.concurrency)
+    done = 0
+    rendered = 0
+
+    async def process(property_id):
+        nonlocal done, rendered
+        async with semaphore:
+            rendered += await image_service.process_property(property_id)
+        done += 1
+        if done % 100 == 0:
+            print(f"  {done}/{len(property_ids)} properties, {rendered} images rendered")
+
+    try:
+        await asyncio.gather(*(process(property_id) for property_id in property_ids))
+    finally:
+        image_service.close()
+    print(f"Done: {rendered} images rendered across {len(property_ids)} properties")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render variants for existing property images")
+    parser.add_argument("--concurrency", type=int, default=4, help="Properties processed at once")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,26 @@
+"""
+Storage Garbage Collection
+Deletes stored images, and their variants, that no property has referenced
+for STORAGE_GC_GRACE_PERIOD seconds. Safe to run concurrently and from cron.
+
+Usage:
+    python collect_storage_garbage.py
+"""
+import asyncio
+from dotenv import load_dotenv
+
+# Before importing app, whose settings are read at import time
+load_dotenv()
+
+from app.services.stored_object_service import stored_object_service
+from app.services.storage_service import storage_service
+
+async def main():
+    try:
+        collected = await stored_object_service.collect_garbage()
+    finally:
+        storage_service.close()
+    print(f"Done: {collected} unreferenced objects deleted")
+
+if __name__ == "__main__":
+    asyncio.run(main())
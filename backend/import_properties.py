@@ -0,0 +1,67 @@
+"""
+Bulk Property Import
+Streams a CSV or JSON Lines feed into PostgreSQL through the same COPY-based
+pipeline as POST /api/v1/admin/properties/import.
+
+Usage:
+    python import_properties.py feed.csv --agent-email agent@guri24.com
+    python import_properties.py feed.jsonl --agent-email agent@guri24.com --batch-size 5000
+"""
+import argparse
+import asyncio
+import sys
+from dotenv import load_dotenv
+
+# Before importing app, whose settings are read at import time
+load_dotenv()
+
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.schemas.property import PropertyImportFormat
+from app.services.cache_service import cache_service
+from app.services.import_service import import_service
+
+CHUNK_SIZE = 1024 * 1024
+
+async def read_chunks(path: str):
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+async def main(args):
+    format = PropertyImportFormat(args.format) if args.format else (
+        PropertyImportFormat.CSV if args.path.lower().endswith(".csv") else PropertyImportFormat.JSONL
+    )
+    if args.batch_size:
+        import_service.batch_size = args.batch_size
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(User).where(User.email == args.agent_email))
+        agent = result.scalar_one_or_none()
+        if not agent:
+            print(f"No user with email {args.agent_email}")
+            return 1
+
+        print(f"Importing {args.path} ({format.value}) as {agent.email}...")
+        # Cached responses and the API workers' indexes are invalidated through Redis
+        report = await import_service.run(session, read_chunks(args.path), format, agent.id)
+    await cache_service.close()
+
+    for error in report.errors:
+        print(f"  row {error.row}: {'; '.join(error.errors)}")
+    if report.errors_truncated:
+        print(f"  ... {report.failed - len(report.errors)} more errors")
+    print(
+        f"Done: {report.rows} rows, {report.inserted} inserted, {report.updated} updated, "
+        f"{report.failed} failed in {report.seconds}s ({report.rows_per_second} rows/s)"
+    )
+    return 0 if report.failed == 0 else 2
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import properties from CSV or JSON Lines")
+    parser.add_argument("path")
+    parser.add_argument("--agent-email", required=True, help="Owner of newly created properties")
+    parser.add_argument("--format", choices=[f.value for f in PropertyImportFormat])
+    parser.add_argument("--batch-size", type=int)
+    sys.exit(asyncio.run(main(parser.parse_args())))
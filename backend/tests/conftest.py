@@ -0,0 +1,148 @@
+from dotenv import dotenv_values
+import os
+
+# Settings require these; the example values are enough for tests that do not touch services
+for key, value in dotenv_values(os.path.join(os.path.dirname(__file__), "..", ".env.example")).items():
+    os.environ.setdefault(key, value)
+
+import asyncio
+import pytest
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+class FakeSession:
+    """
+    AsyncSession stand-in for endpoints and services whose queries are
+    replaced in the test. Every execute() answers with scalar_value.
+    """
+
+    def __init__(self):
+        self.scalar_value = None
+        self.queries = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, stmt):
+        self.queries += 1
+        return FakeResult(self.scalar_value)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def refresh(self, instance):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+@pytest.fixture
+def fake_session() -> FakeSession:
+    return FakeSession()
+
+class FakeRedis:
+    """The few redis.asyncio commands the cache uses, kept in a dict"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    async def aclose(self):
+        pass
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> FakeRedis:
+    """An enabled response cache backed by FakeRedis"""
+    from app.services.cache_service import cache_service
+
+    fake = FakeRedis()
+    monkeypatch.setattr(cache_service, "redis", fake)
+    monkeypatch.setattr(cache_service, "enabled", True)
+    monkeypatch.setattr(cache_service, "_down_until", 0.0)
+    return fake
+
+@pytest.fixture
+def database():
+    """
+    Session factory for the throwaway PostgreSQL database named by
+    TEST_DATABASE_URL, with every table created and emptied; tests using
+    it are skipped without one.
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from sqlalchemy.pool import NullPool
+    from app.database import Base
+    import app.models  # noqa: F401 - registers every table
+
+    # Pooled connections would outlive the event loop of each asyncio.run
+    engine = create_async_engine(url, poolclass=NullPool)
+
+    async def reset_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+            await conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+    asyncio.run(reset_tables())
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    asyncio.run(engine.dispose())
+
+@pytest.fixture
+def add_properties(database):
+    """Insert published properties built from keyword overrides; returns them"""
+    from app.models.property import Property, PropertyType, PropertyPurpose, PropertyStatus
+    from decimal import Decimal
+    import uuid
+
+    def add(*overrides: dict):
+        properties = []
+        for i, values in enumerate(overrides):
+            properties.append(Property(**{
+                "title": f"Apartment {i}",
+                "slug": f"apartment-{uuid.uuid4().hex[:8]}",
+                "type": PropertyType.APARTMENT,
+                "purpose": PropertyPurpose.RENT,
+                "price": Decimal("85000"),
+                "location": "Kilimani",
+                "status": PropertyStatus.PUBLISHED,
+                "agent_id": uuid.uuid4(),
+                **values
+            }))
+
+        async def insert():
+            async with database() as session:
+                session.add_all(properties)
+                await session.commit()
+
+        asyncio.run(insert())
+        return properties
+
+    return add
@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+from app.api.v1.properties import get_properties_batch
+from app.models.property import PropertyStatus
+from app.schemas.property import PropertyBatchRequest
+import asyncio
+import uuid
+
+def fetch(database, keys, user=None):
+    async def run():
+        async with database() as session:
+            return await get_properties_batch(PropertyBatchRequest(ids=keys), user, session)
+    return asyncio.run(run())
+
+def test_results_follow_the_requested_order(database, add_properties):
+    a, b, c = add_properties({}, {}, {})
+    unknown = str(uuid.uuid4())
+
+    response = fetch(database, [str(c.id), a.slug, unknown, str(b.id), "no-such-slug", str(c.id)])
+
+    # Repeated keys are answered once; unknown ids and slugs are dropped and reported
+    assert [p.id for p in response.properties] == [c.id, a.id, b.id]
+    assert response.missing == [unknown, "no-such-slug"]
+
+def test_unpublished_properties_are_missing_for_the_public(database, add_properties):
+    published, draft = add_properties({}, {"status": PropertyStatus.DRAFT})
+    keys = [str(draft.id), str(published.id)]
+
+    public = fetch(database, keys)
+    assert [p.id for p in public.properties] == [published.id]
+    assert public.missing == [str(draft.id)]
+
+    admin = fetch(database, keys, SimpleNamespace(role="admin"))
+    assert [p.id for p in admin.properties] == [draft.id, published.id]
+    assert admin.missing == []
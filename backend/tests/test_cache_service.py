@@ -0,0 +1,80 @@
+from app.services.cache_service import cache_service, PROPERTIES_SCOPE, INDEXES_SCOPE
+import asyncio
+import redis.asyncio as redis
+
+def test_entries_are_read_under_the_current_version(fake_redis):
+    async def run():
+        version, body = await cache_service.get(PROPERTIES_SCOPE, "page=1")
+        await cache_service.set(PROPERTIES_SCOPE, "page=1", version, b"cached")
+        return body, await cache_service.get(PROPERTIES_SCOPE, "page=1")
+
+    miss, (version, hit) = asyncio.run(run())
+
+    assert miss is None
+    assert hit == b"cached"
+    # Versions start from the clock, not zero, so a lost key cannot revive old entries
+    assert version > 1_000_000
+
+def test_invalidate_bumps_the_version_and_hides_every_entry(fake_redis):
+    async def run():
+        version, _ = await cache_service.get(PROPERTIES_SCOPE, "page=1")
+        await cache_service.set(PROPERTIES_SCOPE, "page=1", version, b"old")
+        await cache_service.set(PROPERTIES_SCOPE, "page=2", version, b"old")
+        new_version = await cache_service.invalidate(PROPERTIES_SCOPE)
+        pages = [await cache_service.get(PROPERTIES_SCOPE, key) for key in ("page=1", "page=2")]
+        return version, new_version, pages
+
+    version, new_version, pages = asyncio.run(run())
+
+    assert new_version == version + 1
+    assert pages == [(new_version, None), (new_version, None)]
+
+def test_a_body_computed_before_invalidation_stays_stale(fake_redis):
+    async def run():
+        # A slow request reads, a write invalidates, then the request stores its old result
+        version, _ = await cache_service.get(PROPERTIES_SCOPE, "page=1")
+        await cache_service.invalidate(PROPERTIES_SCOPE)
+        await cache_service.set(PROPERTIES_SCOPE, "page=1", version, b"old")
+        return await cache_service.get(PROPERTIES_SCOPE, "page=1")
+
+    _, body = asyncio.run(run())
+    assert body is None
+
+def test_scopes_are_versioned_independently(fake_redis):
+    async def run():
+        version, _ = await cache_service.get(PROPERTIES_SCOPE, "page=1")
+        await cache_service.set(PROPERTIES_SCOPE, "page=1", version, b"cached")
+        await cache_service.invalidate(INDEXES_SCOPE)
+        return version, await cache_service.get(PROPERTIES_SCOPE, "page=1")
+
+    version, cached = asyncio.run(run())
+    assert cached == (version, b"cached")
+
+def test_failures_bypass_the_cache_for_a_while(fake_redis, monkeypatch):
+    calls = []
+
+    async def broken_get(key):
+        calls.append(key)
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(fake_redis, "get", broken_get)
+
+    async def run():
+        first = await cache_service.get(PROPERTIES_SCOPE, "page=1")
+        second = await cache_service.get(PROPERTIES_SCOPE, "page=1")
+        await cache_service.set(PROPERTIES_SCOPE, "page=1", 1, b"cached")
+        return first, second
+
+    assert asyncio.run(run()) == ((None, None), (None, None))
+    # Only the first lookup reached Redis, and nothing was stored
+    assert len(calls) == 1
+    assert not any(b"cached" == value for value in fake_redis.data.values())
+
+def test_invalidate_is_attempted_even_while_reads_are_bypassed(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache_service, "_down_until", float("inf"))
+
+    async def run():
+        return await cache_service.invalidate(PROPERTIES_SCOPE)
+
+    assert asyncio.run(run()) == 1
+    assert asyncio.run(cache_service.version(PROPERTIES_SCOPE)) is None
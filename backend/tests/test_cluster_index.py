@@ -0,0 +1,87 @@
+from app.models.property import Property, PropertyStatus
+from app.services.cluster_index import ClusterIndex
+import asyncio
+import uuid
+
+WORLD = (-180.0, -85.0, 180.0, 85.0)
+
+def listing(status=PropertyStatus.PUBLISHED, latitude=-1.29, longitude=36.82, id=None) -> Property:
+    return Property(id=id or uuid.uuid4(), status=status, latitude=latitude, longitude=longitude)
+
+def total(index: ClusterIndex, zoom: int) -> int:
+    return sum(cluster["count"] for cluster in index.query(WORLD, zoom))
+
+def test_publish_adds_one_listing_to_every_zoom_level():
+    index = ClusterIndex()
+    a, b = listing(), listing(latitude=-1.2901, longitude=36.8201)
+    index.sync(a)
+    index.sync(b)
+    for zoom in (0, 10, 20):
+        assert total(index, zoom) == 2
+    # Close neighbours share a cluster when zoomed out, which knows no single id
+    [cluster] = index.query(WORLD, 0)
+    assert (cluster["count"], cluster["property_id"]) == (2, None)
+
+def test_single_listing_cluster_names_the_listing():
+    index = ClusterIndex()
+    a = listing()
+    index.sync(a)
+    [cluster] = index.query(WORLD, 5)
+    assert cluster["property_id"] == a.id
+    assert (cluster["latitude"], cluster["longitude"]) == (-1.29, 36.82)
+
+def test_archive_and_delete_remove_the_listing():
+    index = ClusterIndex()
+    a, b = listing(), listing(latitude=-1.3)
+    index.sync(a)
+    index.sync(b)
+
+    a.status = PropertyStatus.ARCHIVED
+    index.sync(a)
+    [cluster] = index.query(WORLD, 0)
+    assert (cluster["count"], cluster["property_id"]) == (1, b.id)
+
+    index.remove(b.id)
+    assert index.query(WORLD, 0) == []
+    # Removing twice, or a listing never indexed, changes nothing
+    index.remove(b.id)
+    index.sync(listing(status=PropertyStatus.DRAFT))
+    assert index.query(WORLD, 0) == []
+
+def test_moving_a_listing_updates_its_cells():
+    index = ClusterIndex()
+    a = listing()
+    index.sync(a)
+    a.latitude, a.longitude = 40.0, -74.0
+    index.sync(a)
+    [cluster] = index.query((-80.0, 30.0, -70.0, 50.0), 10)
+    assert cluster["property_id"] == a.id
+    assert index.query((30.0, -5.0, 40.0, 5.0), 10) == []
+
+def test_listing_without_coordinates_is_not_clustered():
+    index = ClusterIndex()
+    a = listing()
+    index.sync(a)
+    a.latitude = None
+    index.sync(a)
+    assert index.query(WORLD, 0) == []
+
+def test_changes_during_a_rebuild_are_replayed():
+    index = ClusterIndex()
+    stale = listing()
+    kept = listing(latitude=-1.3)
+    added = listing(latitude=10.0, longitude=10.0)
+
+    class RebuildSession:
+        async def execute(self, stmt):
+            # Writes landing while the rebuild reads its snapshot
+            index.sync(added)
+            index.remove(stale.id)
+            return self
+
+        def all(self):
+            return [(stale.id, stale.latitude, stale.longitude), (kept.id, kept.latitude, kept.longitude)]
+
+    asyncio.run(index.rebuild(RebuildSession()))
+    ids = {cluster["property_id"] for cluster in index.query(WORLD, 20)}
+    assert ids == {kept.id, added.id}
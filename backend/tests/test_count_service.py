@@ -0,0 +1,51 @@
+from app.services import count_service as count_module
+from app.services.count_service import CountService
+from app.services.cache_service import cache_service, PROPERTIES_SCOPE
+import asyncio
+
+def make_service(monkeypatch, estimate: int, exact: int) -> CountService:
+    service = CountService()
+    service.exact_threshold = 100
+
+    async def fake_estimate(db, query):
+        return estimate
+
+    async def fake_exact(db, query):
+        return exact
+
+    monkeypatch.setattr(service, "estimate", fake_estimate)
+    monkeypatch.setattr(service, "exact", fake_exact)
+    return service
+
+def test_small_result_sets_are_counted_exactly(monkeypatch, fake_redis):
+    service = make_service(monkeypatch, estimate=40, exact=37)
+    assert asyncio.run(service.count(None, None, "f")) == (37, True)
+
+def test_large_counts_are_cached_under_the_scope_version(monkeypatch, fake_redis, fake_session):
+    monkeypatch.setattr(count_module, "AsyncSessionLocal", lambda: fake_session)
+    service = make_service(monkeypatch, estimate=5000, exact=4321)
+
+    async def run():
+        first = await service.count(None, None, "f")
+        await asyncio.gather(*service._tasks)
+        second = await service.count(None, None, "f")
+        # A write on any worker bumps the version; the cached count is retired
+        await cache_service.invalidate(PROPERTIES_SCOPE)
+        third = await service.count(None, None, "f")
+        await asyncio.gather(*service._tasks)
+        return first, second, third
+
+    assert asyncio.run(run()) == ((5000, False), (4321, False), (5000, False))
+
+def test_count_taken_before_a_write_is_never_served(monkeypatch, fake_redis, fake_session):
+    monkeypatch.setattr(count_module, "AsyncSessionLocal", lambda: fake_session)
+    service = make_service(monkeypatch, estimate=5000, exact=4321)
+
+    async def run():
+        await service.count(None, None, "f")
+        # The write lands while the background count is still running
+        await cache_service.invalidate(PROPERTIES_SCOPE)
+        await asyncio.gather(*service._tasks)
+        return await service.count(None, None, "f")
+
+    assert asyncio.run(run()) == (5000, False)
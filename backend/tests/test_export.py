@@ -0,0 +1,60 @@
+from app.models.property import PropertyStatus
+from app.schemas.property import PropertyExportFormat
+from app.services import export_service as export_module
+from app.services.export_service import EXPORT_FIELDS, export_service
+import asyncio
+import csv
+import gzip
+import io
+import json
+
+def export(database, monkeypatch, format, batch_size=2, **kwargs) -> bytes:
+    monkeypatch.setattr(export_module, "AsyncSessionLocal", database)
+    monkeypatch.setattr(export_service, "batch_size", batch_size)
+
+    async def run():
+        return [chunk async for chunk in export_service.stream(format, **kwargs)]
+    return b"".join(asyncio.run(run()))
+
+def read_csv(body: bytes) -> list:
+    return list(csv.DictReader(io.StringIO(body.decode(), newline="")))
+
+def test_csv_quotes_separators_and_keeps_utf8(database, add_properties, monkeypatch):
+    awkward = 'Two-bed, "garden" flat\nwith a view'
+    add_properties(
+        {"title": awkward, "location": "Mũthaiga", "features": ["parking", "pool, heated"]},
+        {"title": "Plain"}
+    )
+
+    body = export(database, monkeypatch, PropertyExportFormat.CSV)
+    rows = read_csv(body)
+
+    assert list(rows[0]) == EXPORT_FIELDS
+    assert [row["title"] for row in rows] == [awkward, "Plain"]
+    assert rows[0]["location"] == "Mũthaiga"
+    assert "Mũthaiga".encode() in body  # UTF-8, not escaped
+    assert json.loads(rows[0]["features"]) == ["parking", "pool, heated"]
+    # NULL columns are empty cells rather than "None"
+    assert rows[1]["description"] == "" and rows[1]["images"] == ""
+    assert rows[0]["status"] == "published" and rows[0]["price"] == "85000.00"
+
+def test_every_cursor_partition_is_exported_once(database, add_properties, monkeypatch):
+    properties = add_properties(*({} for _ in range(5)))
+
+    rows = read_csv(export(database, monkeypatch, PropertyExportFormat.CSV, batch_size=2))
+
+    # One header for the whole export, not one per partition
+    assert sorted(row["id"] for row in rows) == sorted(str(p.id) for p in properties)
+
+def test_ndjson_and_gzip(database, add_properties, monkeypatch):
+    published, draft = add_properties({"title": 'Quote " and, comma'}, {"status": PropertyStatus.DRAFT})
+
+    body = export(
+        database, monkeypatch, PropertyExportFormat.NDJSON,
+        compress=True, status=PropertyStatus.PUBLISHED
+    )
+    records = [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+
+    assert [record["id"] for record in records] == [str(published.id)]
+    assert records[0]["title"] == 'Quote " and, comma'
+    assert list(records[0]) == EXPORT_FIELDS
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+from decimal import Decimal
+from app.config import settings
+from app.models.property import PropertyType, PropertyPurpose, PropertyStatus
+from app.services.facet_service import facet_source, count_facets
+from app.api.v1.properties import apply_property_filters
+from app.schemas.property import PropertyFilters
+import asyncio
+
+def row(grouping, count, **values):
+    return SimpleNamespace(**{"type": None, "purpose": None, "bedrooms": None, "price_band": None, **values},
+                           grouping=grouping, count=count)
+
+class GroupingSetsResult:
+    """Rows as Postgres returns them for GROUPING SETS ((type), (purpose), (bedrooms), (price_band), ())"""
+
+    async def execute(self, stmt):
+        return [
+            row(0b0111, 3, type=PropertyType.APARTMENT),
+            row(0b0111, 1, type=PropertyType.VILLA),
+            row(0b1011, 4, purpose=PropertyPurpose.RENT),
+            row(0b1101, 2, bedrooms="2"),
+            row(0b1101, 2, bedrooms="studio"),
+            row(0b1110, 4, price_band="0-100000"),
+            row(0b1111, 4),
+        ]
+
+def test_grouping_bits_decode_into_facets():
+    facets = asyncio.run(count_facets(GroupingSetsResult(), facet_source()))
+    assert facets == {
+        "total": 4,
+        "type": {"apartment": 3, "villa": 1},
+        "purpose": {"rent": 4},
+        "bedrooms": {"2": 2, "studio": 2},
+        "price_band": {"0-100000": 4},
+    }
+
+def test_facets_counted_in_the_database(database, add_properties, monkeypatch):
+    monkeypatch.setattr(settings, "FACET_PRICE_BANDS", "100000,1000000")
+    add_properties(
+        {"bedrooms": 0, "price": Decimal("50000")},
+        {"bedrooms": 2, "price": Decimal("150000")},
+        {"bedrooms": 5, "price": Decimal("150000"), "purpose": PropertyPurpose.SALE},
+        {"bedrooms": None, "price": Decimal("2500000"), "type": PropertyType.VILLA, "purpose": PropertyPurpose.SALE},
+        # Filtered out: unpublished
+        {"bedrooms": 3, "status": PropertyStatus.DRAFT},
+    )
+
+    async def run():
+        source = apply_property_filters(facet_source(), PropertyFilters(), is_admin=False)
+        async with database() as session:
+            return await count_facets(session, source)
+
+    assert asyncio.run(run()) == {
+        "total": 4,
+        "type": {"apartment": 3, "villa": 1},
+        "purpose": {"rent": 2, "sale": 2},
+        "bedrooms": {"studio": 1, "2": 1, "4+": 1, "unknown": 1},
+        "price_band": {"0-100000": 1, "100000-1000000": 2, "1000000+": 1},
+    }
@@ -0,0 +1,67 @@
+from app.core.geo import (
+    EARTH_RADIUS_KM, geohash_cell_size, geohash_cover, geohash_encode, parse_bbox, radius_bboxes
+)
+import math
+import pytest
+import random
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+def inside(boxes, lat, lng):
+    return any(min_lng <= lng <= max_lng and min_lat <= lat <= max_lat for min_lng, min_lat, max_lng, max_lat in boxes)
+
+@pytest.mark.parametrize("center", [(-1.29, 36.82), (-17.7, 179.9), (65.0, -179.5), (89.5, 10.0)])
+def test_radius_boxes_enclose_the_circle(center):
+    lat, lng = center
+    radius_km = 150
+    boxes = radius_bboxes(lat, lng, radius_km)
+    rng = random.Random(0)
+    for _ in range(2000):
+        # Points on and near the circle, wrapped into range
+        bearing = rng.uniform(0, 2 * math.pi)
+        d = radius_km * rng.uniform(0.9, 1.0) / EARTH_RADIUS_KM
+        lat1, lng1 = math.radians(lat), math.radians(lng)
+        lat2 = math.asin(math.sin(lat1) * math.cos(d) + math.cos(lat1) * math.sin(d) * math.cos(bearing))
+        lng2 = lng1 + math.atan2(math.sin(bearing) * math.sin(d) * math.cos(lat1), math.cos(d) - math.sin(lat1) * math.sin(lat2))
+        point = (math.degrees(lat2), (math.degrees(lng2) + 540) % 360 - 180)
+        assert haversine_km(lat, lng, *point) <= radius_km + 1e-6
+        assert inside(boxes, *point), point
+
+def test_radius_across_the_antimeridian_is_split():
+    boxes = radius_bboxes(-17.7, 179.9, 50)
+    assert len(boxes) == 2
+    assert inside(boxes, -17.7, -179.8)
+    assert inside(boxes, -17.7, 179.8)
+    assert not inside(boxes, -17.7, 0)
+
+def test_radius_reaching_a_pole_spans_every_longitude():
+    [(min_lng, _, max_lng, max_lat)] = radius_bboxes(89.9, 0, 50)
+    assert (min_lng, max_lng, max_lat) == (-180.0, 180.0, 90.0)
+
+def test_geohash_cover_contains_every_point_of_the_box():
+    bbox = (36.70, -1.40, 36.95, -1.20)
+    cover = geohash_cover(bbox, max_cells=32)
+    assert 0 < len(cover) <= 32
+    rng = random.Random(0)
+    for _ in range(500):
+        lng, lat = rng.uniform(bbox[0], bbox[2]), rng.uniform(bbox[1], bbox[3])
+        assert any(geohash_encode(lat, lng).startswith(prefix) for prefix in cover)
+
+def test_geohash_cover_uses_the_finest_precision_that_fits():
+    bbox = (36.80, -1.30, 36.81, -1.29)
+    precision = len(geohash_cover(bbox)[0])
+    width, height = geohash_cell_size(precision + 1)
+    # One level finer would need more than the allowed number of cells
+    assert (0.01 / width + 1) * (0.01 / height + 1) > 32
+
+def test_geohash_encode_known_value():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+def test_parse_bbox():
+    assert parse_bbox("36.7,-1.4,36.9,-1.2") == (36.7, -1.4, 36.9, -1.2)
+    for value in ["36.7,-1.4,36.9", "36.9,-1.4,36.7,-1.2", "36.7,-1.2,36.9,-1.4", "-181,0,0,1", "a,b,c,d"]:
+        with pytest.raises(ValueError):
+            parse_bbox(value)
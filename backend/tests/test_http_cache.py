@@ -0,0 +1,62 @@
+from app.api.v1 import properties
+from app.core.http_cache import make_etag, body_etag, etag_matches, pack, unpack, public_headers
+from app.models.property import Property, PropertyType, PropertyPurpose, PropertyStatus
+from app.services.view_counter import ViewCounter
+from datetime import datetime
+from decimal import Decimal
+from starlette.requests import Request
+import asyncio
+import uuid
+
+def test_etag_matches():
+    etag = body_etag(b'{"properties":[]}')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+    assert etag_matches("*", etag)
+
+def test_weak_comparison_ignores_the_weak_prefix():
+    etag = make_etag("id", "2026-03-01", weak=True)
+    assert etag.startswith("W/")
+    assert etag_matches(etag.removeprefix("W/"), etag)
+
+def test_list_etag_follows_the_body():
+    assert body_etag(b'{"total":1}') == body_etag(b'{"total":1}')
+    assert body_etag(b'{"total":1}') != body_etag(b'{"total":2}')
+
+def test_pack_round_trip():
+    headers = public_headers(body_etag(b"body"))
+    assert unpack(pack(headers, b"body", {"id": "x"})) == (headers, {"id": "x"}, b"body")
+    assert "Last-Modified" not in headers
+
+def published_property() -> Property:
+    now = datetime(2026, 3, 1, 12, 0)
+    return Property(
+        id=uuid.uuid4(), title="Garden villa in Karen", slug="garden-villa-in-karen",
+        description=None, type=PropertyType.VILLA, purpose=PropertyPurpose.SALE,
+        price=Decimal("45000000"), location="Karen", status=PropertyStatus.PUBLISHED,
+        views=0, agent_id=uuid.uuid4(), created_at=now, updated_at=now, photos=[]
+    )
+
+def get(slug: str, db, if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    request = Request({"type": "http", "method": "GET", "headers": headers})
+    return asyncio.run(properties.get_property(slug, request, None, db))
+
+def test_detail_revalidation(monkeypatch, fake_session, fake_redis):
+    monkeypatch.setattr(properties, "view_counter", ViewCounter())
+    property = published_property()
+    fake_session.scalar_value = property
+
+    first = get(property.slug, fake_session)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert "last-modified" not in first.headers
+
+    # Answered from the response cache without another query
+    queries = fake_session.queries
+    assert get(property.slug, fake_session, etag).status_code == 304
+    assert get(property.slug, fake_session, "*").status_code == 304
+    assert get(property.slug, fake_session, '"stale"').status_code == 200
+    assert fake_session.queries == queries
@@ -0,0 +1,46 @@
+from PIL import Image
+from app.core.images import render_variants, VARIANTS
+import io
+import pytest
+
+def encode(image: Image.Image, format: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    return buffer.getvalue()
+
+def transparent_palette_png() -> bytes:
+    """Left half opaque red, right half transparent"""
+    image = Image.new("P", (2400, 1200), 0)
+    image.putpalette([0, 0, 0, 255, 0, 0] + [0] * 762)
+    image.paste(1, (0, 0, 1200, 1200))
+    return encode(image, "PNG", transparency=0)
+
+@pytest.mark.parametrize("format", ["webp", "jpeg"])
+def test_variants_fit_their_boxes_in_the_requested_format(format):
+    data = encode(Image.new("RGB", (4000, 3000), "teal"), "JPEG")
+    size, variants = render_variants(data, format=format)
+
+    assert size == (4000, 3000)
+    assert set(variants) == set(VARIANTS)
+    for name, box in VARIANTS.items():
+        with Image.open(io.BytesIO(variants[name])) as variant:
+            assert variant.format == format.upper()
+            # 4:3 like the original, scaled down to the bounding box
+            assert variant.size == box
+
+def test_small_images_are_not_upscaled():
+    size, variants = render_variants(encode(Image.new("RGB", (400, 300), "teal"), "PNG"))
+    with Image.open(io.BytesIO(variants["full"])) as full:
+        assert full.size == size == (400, 300)
+
+def test_palette_transparency_is_kept_in_webp():
+    _, variants = render_variants(transparent_palette_png(), format="webp")
+    with Image.open(io.BytesIO(variants["thumb"])) as thumb:
+        assert thumb.mode == "RGBA"
+        assert thumb.getpixel((thumb.width - 1, 0))[3] == 0
+        assert thumb.getpixel((0, 0))[3] == 255
+
+def test_palette_transparency_is_flattened_onto_white_in_jpeg():
+    _, variants = render_variants(transparent_palette_png(), format="jpeg")
+    with Image.open(io.BytesIO(variants["thumb"])) as thumb:
+        assert all(channel > 240 for channel in thumb.getpixel((thumb.width - 1, 0)))
@@ -0,0 +1,44 @@
+from app.schemas.property import PropertyImportFormat
+from app.services.import_service import ImportService
+import asyncio
+import json
+import uuid
+
+DESCRIPTION = "A bright two bedroom apartment close to shops, schools and the bypass."
+
+def feed(titles):
+    for title in titles:
+        record = {
+            "title": title,
+            "description": DESCRIPTION,
+            "type": "apartment",
+            "purpose": "rent",
+            "price": 85000,
+            "location": "Kilimani"
+        }
+        yield (json.dumps(record) + "\n").encode()
+
+async def chunks(titles):
+    for chunk in feed(titles):
+        yield chunk
+
+def test_rejected_batch_reports_only_bad_rows(monkeypatch, fake_session):
+    service = ImportService()
+    service.batch_size = 10
+    loaded = []
+
+    async def load(db, items, agent_id):
+        # The database rejects any batch holding the conflicting row
+        if any(item.title == "Conflicting apartment" for item in items):
+            raise ValueError("duplicate key value violates unique constraint")
+        loaded.extend(item.title for item in items)
+        return len(items), 0
+
+    monkeypatch.setattr(service, "_load", load)
+    titles = ["Sunny apartment one", "Conflicting apartment", "Sunny apartment three"]
+    report = asyncio.run(service.run(fake_session, chunks(titles), PropertyImportFormat.JSONL, uuid.uuid4()))
+
+    assert loaded == ["Sunny apartment one", "Sunny apartment three"]
+    assert (report.inserted, report.failed) == (2, 1)
+    assert [error.row for error in report.errors] == [2]
+    assert "duplicate key" in report.errors[0].errors[0]
@@ -0,0 +1,38 @@
+from app.services.cache_service import cache_service, INDEXES_SCOPE
+from app.services.index_watcher import IndexWatcher
+import asyncio
+
+def watcher(monkeypatch) -> IndexWatcher:
+    watcher = IndexWatcher()
+    watcher.stale_marks = 0
+
+    def mark_stale():
+        watcher.stale_marks += 1
+
+    monkeypatch.setattr(watcher, "mark_stale", mark_stale)
+    return watcher
+
+def test_change_announced_elsewhere_marks_indexes_stale(monkeypatch, fake_redis):
+    api_worker = watcher(monkeypatch)
+
+    async def run():
+        await api_worker.check()
+        await api_worker.check()
+        assert api_worker.stale_marks == 0
+        # e.g. the import CLI, in another process
+        await cache_service.invalidate(INDEXES_SCOPE)
+        await api_worker.check()
+
+    asyncio.run(run())
+    assert api_worker.stale_marks == 1
+
+def test_own_announcement_is_not_rebuilt_twice(monkeypatch, fake_redis):
+    api_worker = watcher(monkeypatch)
+
+    async def run():
+        await api_worker.check()
+        await api_worker.notify()
+        await api_worker.check()
+
+    asyncio.run(run())
+    assert api_worker.stale_marks == 1
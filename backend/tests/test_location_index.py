@@ -0,0 +1,33 @@
+from app.services.background_index import BackgroundIndex
+from app.services.location_index import LocationIndex
+import asyncio
+
+class CountingIndex(BackgroundIndex):
+    def __init__(self, min_refresh_interval: float):
+        super().__init__(refresh_interval=60, min_refresh_interval=min_refresh_interval)
+        self.refreshes = 0
+
+    async def refresh(self):
+        self.refreshes += 1
+
+def test_suggest_matches_any_word_most_listings_first():
+    index = LocationIndex()
+    index.build([("Kilimani, Nairobi", 12), ("Nairobi West", 30), ("Karen", 8)])
+    assert [s["location"] for s in index.suggest("nai")] == ["Nairobi West", "Kilimani, Nairobi"]
+    assert index.suggest("kar") == [{"location": "Karen", "count": 8}]
+
+def test_burst_of_writes_costs_one_rebuild():
+    async def run():
+        index = CountingIndex(min_refresh_interval=0.2)
+        index.start()
+        await asyncio.sleep(0.05)
+        for _ in range(5):
+            index.mark_stale()
+            await asyncio.sleep(0.01)
+        # Still inside the debounce window: only the initial build has run
+        assert index.refreshes == 1
+        await asyncio.sleep(0.3)
+        await index.stop()
+        return index.refreshes
+
+    assert asyncio.run(run()) == 2
@@ -0,0 +1,43 @@
+from fastapi import HTTPException
+from app.core.media import parse_range
+from app.services.storage_backends import LocalBackend
+import os
+import pytest
+
+SIZE = 1000
+
+def test_parse_range():
+    assert parse_range("bytes=0-99", SIZE) == (0, 99)
+    assert parse_range("bytes=900-", SIZE) == (900, 999)
+    assert parse_range("bytes=-100", SIZE) == (900, 999)
+    # Ranges running past the end are cut short
+    assert parse_range("bytes=990-2000", SIZE) == (990, 999)
+    assert parse_range("bytes=-5000", SIZE) == (0, 999)
+
+@pytest.mark.parametrize("header", [
+    None, "", "bytes=", "bytes=-", "bytes=--5", "bytes=5", "bytes=+5-10",
+    "bytes=a-b", "items=0-10", "bytes=0-1,5-6", "bytes=50-10"
+])
+def test_malformed_range_is_ignored(header):
+    assert parse_range(header, SIZE) is None
+
+def test_range_past_the_end_is_unsatisfiable():
+    with pytest.raises(HTTPException) as e:
+        parse_range("bytes=1000-", SIZE)
+    assert e.value.status_code == 416
+    assert e.value.headers["Content-Range"] == f"bytes */{SIZE}"
+
+def test_local_keys_cannot_escape_the_upload_directory(tmp_path):
+    backend = LocalBackend(str(tmp_path / "uploads"))
+    assert backend.path("properties/ab/abc.jpg") == os.path.join(backend.root, "properties", "ab", "abc.jpg")
+    for key in ["../secret", "properties/../../secret", "/etc/passwd", ""]:
+        with pytest.raises(ValueError):
+            backend.path(key)
+
+def test_local_keys_cannot_escape_through_a_symlink(tmp_path):
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "outside").mkdir()
+    os.symlink(tmp_path / "outside", tmp_path / "uploads" / "link")
+    backend = LocalBackend(str(tmp_path / "uploads"))
+    with pytest.raises(ValueError):
+        backend.path("link/file.jpg")
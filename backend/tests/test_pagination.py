@@ -0,0 +1,16 @@
+from app.core.pagination import encode_cursor, decode_cursor, CURSOR_PREV
+from datetime import datetime, timedelta, timezone
+import uuid
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 1, 12, 30, 15, 123456)
+    id = uuid.uuid4()
+    cursor = decode_cursor(encode_cursor(created_at, id, CURSOR_PREV))
+    assert (cursor.created_at, cursor.id, cursor.direction) == (created_at, id, CURSOR_PREV)
+
+def test_aware_cursor_is_normalized_to_naive_utc():
+    # Comparing an aware value with the naive created_at column would fail in the query
+    nairobi = timezone(timedelta(hours=3))
+    cursor = decode_cursor(encode_cursor(datetime(2026, 3, 1, 15, 0, tzinfo=nairobi), uuid.uuid4()))
+    assert cursor.created_at == datetime(2026, 3, 1, 12, 0)
+    assert cursor.created_at.tzinfo is None
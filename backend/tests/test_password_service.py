@@ -0,0 +1,34 @@
+from fastapi import HTTPException
+from app.config import settings
+from app.services.password_service import PasswordHasher
+import asyncio
+import pytest
+import threading
+
+def test_calls_beyond_the_queue_limit_get_503(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_LIMIT", 1)
+    hasher = PasswordHasher()
+    release = threading.Event()
+
+    async def run():
+        # One call running and one queued fill the pool
+        calls = [asyncio.create_task(hasher._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as e:
+            await hasher._run(release.wait)
+        release.set()
+        await asyncio.gather(*calls)
+        # Freed slots are taken again once the workers finish
+        await asyncio.sleep(0.05)
+        assert await hasher._run(lambda: "ok") == "ok"
+        return e.value
+
+    try:
+        error = asyncio.run(run())
+    finally:
+        release.set()
+        hasher.close()
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "1"
+    assert hasher.stats()["rejected"] == 1
@@ -0,0 +1,164 @@
+import pytest
+
+moto_server = pytest.importorskip("moto.server")
+
+from fastapi import BackgroundTasks, HTTPException
+from PIL import Image
+from botocore.stub import Stubber
+from types import SimpleNamespace
+from app.api.v1 import properties
+from app.config import settings
+from app.schemas.property import PropertyImagePresignRequest, PropertyImageCommitRequest
+from app.services.storage_backends import S3Backend
+from app.services.storage_service import storage_service
+from app.services.stored_object_service import stored_object_service
+from app.services.property_image_service import property_image_service
+from app.services.cache_service import cache_service
+import asyncio
+import httpx
+import io
+import socket
+import uuid
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def jpeg_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), "teal").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+@pytest.fixture
+def s3(monkeypatch):
+    """moto standing in for MinIO, reached by the browser under another host name"""
+    port = free_port()
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+    monkeypatch.setattr(settings, "S3_ENDPOINT", f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(settings, "S3_PUBLIC_URL_OVERRIDE", f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(settings, "S3_PRESIGN_ENDPOINT", f"http://localhost:{port}")
+    backend = S3Backend()
+    backend.s3_client.create_bucket(Bucket=backend.bucket)
+    monkeypatch.setattr(storage_service, "backend", backend)
+    yield backend
+    server.stop()
+
+@pytest.fixture
+def listing(monkeypatch):
+    """A property the caller may edit, with database writes recorded instead"""
+    property = SimpleNamespace(id=uuid.uuid4())
+    recorded = SimpleNamespace(claims=[], appended=[])
+
+    async def get_editable_property(db, property_id, user):
+        return property
+
+    async def claim(files):
+        recorded.claims.append(files)
+
+    async def append(db, property_id, images):
+        recorded.appended.extend(url for url, _ in images)
+
+    async def invalidate(scope):
+        pass
+
+    monkeypatch.setattr(properties, "get_editable_property", get_editable_property)
+    monkeypatch.setattr(stored_object_service, "claim", claim)
+    monkeypatch.setattr(property_image_service, "append", append)
+    monkeypatch.setattr(cache_service, "invalidate", invalidate)
+    return property, recorded
+
+def presign(db, property, files):
+    request = PropertyImagePresignRequest(files=files)
+    return asyncio.run(properties.presign_property_images(str(property.id), request, None, db)).uploads
+
+def upload(presigned, content: bytes, content_type: str) -> int:
+    response = httpx.post(
+        presigned.url,
+        data=presigned.fields,
+        files={"file": ("photo.jpg", content, content_type)}
+    )
+    return response.status_code
+
+def commit(db, property, keys):
+    request = PropertyImageCommitRequest(keys=keys)
+    return asyncio.run(properties.commit_property_images(
+        str(property.id), request, BackgroundTasks(), None, db
+    ))
+
+def test_presign_upload_commit(s3, listing, fake_session):
+    property, recorded = listing
+    content = jpeg_bytes()
+
+    [presigned] = presign(fake_session, property, [{"filename": "photo.jpg", "content_type": "image/jpeg", "size": len(content)}])
+    # Signed for the browser-facing endpoint, under this property's prefix
+    assert presigned.url.startswith(settings.S3_PRESIGN_ENDPOINT)
+    assert presigned.key.startswith(properties.upload_prefix(property.id))
+    assert recorded.claims[0][0].key == presigned.key
+
+    assert upload(presigned, content, "image/jpeg") in (200, 201, 204)
+    commit(fake_session, property, [presigned.key])
+
+    [claimed] = recorded.claims[1]
+    assert (claimed.key, claimed.size, claimed.content_type) == (presigned.key, len(content), "image/jpeg")
+    assert recorded.appended == [storage_service.public_url(presigned.key)]
+
+def test_presign_rejects_declared_type_and_size(listing, fake_session):
+    property, recorded = listing
+    with pytest.raises(HTTPException) as e:
+        presign(fake_session, property, [{"filename": "photo.jpg", "content_type": "image/png", "size": 100}])
+    assert e.value.status_code == 415
+    with pytest.raises(HTTPException) as e:
+        presign(fake_session, property, [{"filename": "photo.jpg", "content_type": "image/jpeg", "size": settings.MAX_FILE_SIZE + 1}])
+    assert e.value.status_code == 413
+    assert recorded.claims == []
+
+def test_commit_rejects_content_that_is_not_the_declared_type(s3, listing, fake_session):
+    property, recorded = listing
+    content = b"MZ\x90\x00 not an image at all"
+
+    [presigned] = presign(fake_session, property, [{"filename": "photo.jpg", "content_type": "image/jpeg", "size": len(content)}])
+    assert upload(presigned, content, "image/jpeg") in (200, 201, 204)
+
+    with pytest.raises(HTTPException) as e:
+        commit(fake_session, property, [presigned.key])
+    assert e.value.status_code == 415
+    # The rejected object is removed and nothing is attached
+    assert s3.head(presigned.key) is None
+    assert recorded.appended == []
+
+def test_commit_rejects_oversized_upload(s3, listing, monkeypatch, fake_session):
+    property, recorded = listing
+    content = jpeg_bytes()
+
+    [presigned] = presign(fake_session, property, [{"filename": "photo.jpg", "content_type": "image/jpeg", "size": len(content)}])
+    assert upload(presigned, content, "image/jpeg") in (200, 201, 204)
+
+    # Stored objects are checked against the limit in force at commit time
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", len(content) - 1)
+    with pytest.raises(HTTPException) as e:
+        commit(fake_session, property, [presigned.key])
+    assert e.value.status_code == 413
+    assert s3.head(presigned.key) is None
+    assert recorded.appended == []
+
+@pytest.mark.parametrize("status_code", [403, 404])
+def test_head_treats_forbidden_and_missing_objects_alike(status_code):
+    # Without ListBucket, S3 answers 403 instead of 404 for a missing key
+    backend = S3Backend()
+    with Stubber(backend.s3_client) as stub:
+        stub.add_client_error("head_object", service_error_code=str(status_code), http_status_code=status_code)
+        assert backend.head("properties/uploads/x/missing.jpg") is None
+
+def test_commit_of_forbidden_upload_is_not_found(listing, fake_session, monkeypatch):
+    property, recorded = listing
+    backend = S3Backend()
+    monkeypatch.setattr(storage_service, "backend", backend)
+    key = f"{properties.upload_prefix(property.id)}{uuid.uuid4()}.jpg"
+    with Stubber(backend.s3_client) as stub:
+        stub.add_client_error("head_object", service_error_code="403", http_status_code=403)
+        with pytest.raises(HTTPException) as e:
+            commit(fake_session, property, [key])
+    assert e.value.status_code == 400
+    assert recorded.appended == []
@@ -0,0 +1,137 @@
+from sqlalchemy import select
+from types import SimpleNamespace
+from app.api.v1.properties import reorder_property_images, delete_property_image
+from app.models.property import Property
+from app.models.property_image import PropertyImage
+from app.models.stored_object import StoredObject
+from app.schemas.property import PropertyImageOrder
+from app.services import stored_object_service as stored_object_module
+from app.services.property_image_service import property_image_service
+from app.services.stored_object_service import stored_object_service
+from app.services.storage_service import storage_service, StoredFile
+from fastapi import HTTPException
+import asyncio
+import pytest
+import uuid
+
+def stored_urls(count: int) -> list:
+    keys = [f"test/{uuid.uuid4()}.jpg" for _ in range(count)]
+    return [storage_service.public_url(key) for key in keys]
+
+@pytest.fixture
+def gallery(database, add_properties, monkeypatch):
+    """A property with three stored images a, b, c, each referenced once"""
+    monkeypatch.setattr(stored_object_module, "AsyncSessionLocal", database)
+    (property,) = add_properties({})
+    urls = stored_urls(3)
+
+    async def setup():
+        await stored_object_service.claim([
+            StoredFile(key=storage_service.key_for_url(url), url=url, sha256=None, size=10, content_type="image/jpeg")
+            for url in urls
+        ])
+        async with database() as session:
+            await property_image_service.append(session, property.id, [(url, f"sha-{i}") for i, url in enumerate(urls)])
+            await session.commit()
+
+    asyncio.run(setup())
+    return property, urls
+
+async def load(database, property_id) -> Property:
+    async with database() as session:
+        return await session.get(Property, property_id)
+
+async def ref_counts(database, urls) -> list:
+    async with database() as session:
+        counts = dict((await session.execute(
+            select(StoredObject.key, StoredObject.ref_count)
+            .where(StoredObject.key.in_([storage_service.key_for_url(url) for url in urls]))
+        )).all())
+    return [counts[storage_service.key_for_url(url)] for url in urls]
+
+def test_append_numbers_on_and_skips_images_already_shown(database, gallery):
+    property, (a, b, c) = gallery
+    (d,) = stored_urls(1)
+
+    async def run():
+        async with database() as session:
+            added = await property_image_service.append(session, property.id, [(b, None), (d, None)])
+            await session.commit()
+        return added, await load(database, property.id)
+
+    added, loaded = asyncio.run(run())
+
+    assert added == [d]
+    assert loaded.images == [a, b, c, d]
+    # Positions only order the gallery; a skipped image may leave a gap
+    positions = [photo.position for photo in loaded.photos]
+    assert positions[:3] == [0, 1, 2] and positions[3] > 2
+
+def test_replace_reorders_kept_rows_in_place(database, gallery):
+    property, (a, b, c) = gallery
+
+    async def run():
+        async with database() as session:
+            loaded = await session.get(Property, property.id)
+            before = {photo.url: photo.id for photo in loaded.photos}
+            # c becomes the cover, b is dropped
+            await property_image_service.replace(session, loaded, [c, a])
+            await session.commit()
+        return before, await load(database, property.id), await ref_counts(database, [a, b, c])
+
+    before, loaded, counts = asyncio.run(run())
+
+    assert loaded.images == [c, a]
+    assert [photo.position for photo in loaded.photos] == [0, 1]
+    # Kept images keep their rows and hashes
+    assert [photo.id for photo in loaded.photos] == [before[c], before[a]]
+    assert [photo.sha256 for photo in loaded.photos] == ["sha-2", "sha-0"]
+    assert counts == [1, 0, 1]
+
+def test_reorder_sets_the_cover(database, gallery, fake_redis):
+    property, (a, b, c) = gallery
+    owner = SimpleNamespace(id=property.agent_id, role="agent")
+
+    async def run(ids):
+        async with database() as session:
+            loaded = await session.get(Property, property.id)
+            ids = [{photo.url: photo.id for photo in loaded.photos}[url] for url in ids]
+            return await reorder_property_images(str(property.id), PropertyImageOrder(ids=ids), owner, session)
+
+    reordered = asyncio.run(run([b, c, a]))
+    assert reordered.images == [b, c, a]
+    assert asyncio.run(load(database, property.id)).images == [b, c, a]
+
+    # Every image exactly once, or nothing changes
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run([b, b, a]))
+    assert error.value.status_code == 400
+    assert asyncio.run(load(database, property.id)).images == [b, c, a]
+
+def test_remove_keeps_the_other_positions(database, gallery, fake_redis):
+    property, (a, b, c) = gallery
+    owner = SimpleNamespace(id=property.agent_id, role="agent")
+
+    async def run():
+        loaded = await load(database, property.id)
+        async with database() as session:
+            await delete_property_image(str(property.id), loaded.photos[1].id, owner, session)
+        return await load(database, property.id), await ref_counts(database, [a, b, c])
+
+    loaded, counts = asyncio.run(run())
+
+    assert loaded.images == [a, c]
+    assert [photo.position for photo in loaded.photos] == [0, 2]
+    assert counts == [1, 0, 1]
+
+def test_removing_an_unknown_image_is_not_found(database, gallery, fake_redis):
+    property, _ = gallery
+    owner = SimpleNamespace(id=property.agent_id, role="agent")
+
+    async def run():
+        async with database() as session:
+            await delete_property_image(str(property.id), uuid.uuid4(), owner, session)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run())
+    assert error.value.status_code == 404
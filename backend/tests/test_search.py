@@ -0,0 +1,61 @@
+from sqlalchemy import select
+from app.models.property import Property
+from app.services import search_service, term_stats as term_stats_module
+from app.services.search_service import search_condition, search_rank, build_tsquery
+from app.services.term_stats import TermStatistics
+import asyncio
+import pytest
+
+def test_build_tsquery_prefix_matches_every_term():
+    assert build_tsquery("Villa, Karen!") == "villa:* & karen:*"
+    assert build_tsquery("!!!") is None
+
+def test_idf_favours_rare_terms_and_sums_over_prefixes():
+    stats = TermStatistics()
+    stats.build(100, [("apartment", 80), ("apartments", 10), ("penthouse", 2)])
+    assert stats.document_frequency("apartment") == 90
+    assert stats.document_frequency("apart") == 90
+    assert stats.document_frequency("pent") == 2
+    assert stats.document_frequency("villa") == 0
+    assert stats.idf("penthouse") > stats.idf("apartment") > 0
+
+def test_document_frequency_is_capped_by_the_document_count():
+    stats = TermStatistics()
+    # Several lexemes under one prefix can occur in the same document
+    stats.build(10, [("karen", 8), ("karengata", 5)])
+    assert stats.document_frequency("karen") == 10
+
+def rank(database, text: str, matching_only: bool = False):
+    async def run():
+        query = select(Property.title).order_by(search_rank(text).desc(), Property.title)
+        if matching_only:
+            query = query.where(search_condition(text))
+        async with database() as session:
+            return (await session.execute(query)).scalars().all()
+    return asyncio.run(run())
+
+@pytest.fixture
+def refreshed_stats(database, monkeypatch):
+    """Term statistics rebuilt from the test database"""
+    monkeypatch.setattr(term_stats_module, "AsyncSessionLocal", database)
+    stats = TermStatistics()
+    monkeypatch.setattr(search_service, "term_stats", stats)
+    return stats
+
+def test_rare_terms_outrank_common_ones(database, add_properties, refreshed_stats):
+    add_properties(
+        *[{"title": f"Apartment number {i}"} for i in range(6)],
+        {"title": "Penthouse"}
+    )
+    asyncio.run(refreshed_stats.refresh())
+    assert refreshed_stats.document_count == 7
+    assert refreshed_stats.idf("penthouse") > refreshed_stats.idf("apartment")
+    assert rank(database, "apartment penthouse")[0] == "Penthouse"
+
+def test_title_match_outranks_description_match(database, add_properties, refreshed_stats):
+    add_properties(
+        {"title": "Family home", "description": "Quiet street near a garden centre and schools"},
+        {"title": "Garden cottage", "description": "Quiet street near schools"},
+    )
+    asyncio.run(refreshed_stats.refresh())
+    assert rank(database, "garden", matching_only=True) == ["Garden cottage", "Family home"]
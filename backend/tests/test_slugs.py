@@ -0,0 +1,76 @@
+from app.models.property import PropertyType, PropertyPurpose, PropertyStatus
+from app.services.slug_service import slug_service, create_slug
+from decimal import Decimal
+import asyncio
+import pytest
+import uuid
+
+def test_create_slug():
+    assert create_slug("  Sunny 2BR Apartment, Kilimani! ") == "sunny-2br-apartment-kilimani"
+    assert create_slug("!!!") == "property"
+
+@pytest.mark.parametrize("slug, base, expected", [
+    ("foo", "foo", True),
+    ("foo-2", "foo", True),
+    ("foo-bar-2", "foo", False),
+    ("foo-2-3", "foo", False),
+    ("foo-2-3", "foo-2", True),
+    ("foo-20", "foo-2", False),
+    ("foo-1234567890", "foo", False),
+    ("foo.2", "foo", False),
+])
+def test_is_sibling(slug, base, expected):
+    assert slug_service.is_sibling(slug, base) is expected
+
+def suffixes(database, bases, exclude_id=None):
+    async def run():
+        async with database() as session:
+            return await slug_service.highest_suffixes(session, bases, exclude_id)
+    return asyncio.run(run())
+
+def allocate(database, base):
+    async def run():
+        async with database() as session:
+            return await slug_service.allocate(session, base)
+    return asyncio.run(run())
+
+def test_suffixes_ignore_other_bases(database, add_properties):
+    add_properties(*[{"slug": slug} for slug in ["foo", "foo-2", "foo-bar-7", "foo-bar", "foobar-9", "foo-1234567890"]])
+    assert suffixes(database, ["foo", "foo-bar", "foobar", "free"]) == {"foo": 2, "foo-bar": 7, "foobar": 9}
+    assert allocate(database, "foo") == "foo-3"
+    assert allocate(database, "free") == "free"
+
+def test_base_ending_in_digits(database, add_properties):
+    add_properties(*[{"slug": slug} for slug in ["unit-2", "unit-20", "unit-2-4"]])
+    # unit-2 and unit-20 are also counters of unit
+    assert suffixes(database, ["unit", "unit-2", "unit-20"]) == {"unit": 20, "unit-2": 4, "unit-20": 0}
+    assert allocate(database, "unit") == "unit-21"
+    assert allocate(database, "unit-2") == "unit-2-5"
+
+def test_own_slug_is_excluded_on_rename(database, add_properties):
+    [own] = add_properties({"slug": "foo"})
+    assert suffixes(database, ["foo"], exclude_id=own.id) == {}
+
+def test_insert_skips_a_slug_taken_meanwhile(database, add_properties, monkeypatch):
+    add_properties({"slug": "garden-villa"})
+    fields = {
+        "title": "Garden villa", "type": PropertyType.VILLA, "purpose": PropertyPurpose.SALE,
+        "price": Decimal("45000000"), "location": "Karen", "status": PropertyStatus.PUBLISHED,
+        "agent_id": uuid.uuid4()
+    }
+    allocate = slug_service.allocate
+    stale = iter(["garden-villa"])
+
+    async def racing_allocate(db, base, exclude_id=None):
+        # The first allocation was made before a concurrent create took it
+        return next(stale, None) or await allocate(db, base, exclude_id)
+
+    monkeypatch.setattr(slug_service, "allocate", racing_allocate)
+
+    async def run():
+        async with database() as session:
+            property = await slug_service.insert(session, fields, "garden-villa")
+            await session.commit()
+            return property
+
+    assert asyncio.run(run()).slug == "garden-villa-1"
@@ -0,0 +1,45 @@
+from app.api.v1 import properties
+from app.api.v1.properties import correct_filters
+from app.schemas.property import PropertyFilters
+from app.services.spelling_index import SpellingIndex
+import asyncio
+
+# (word, document frequency) rows as returned by ts_stat over all weights;
+# "garden" only ever appears in descriptions
+VOCABULARY = [("karen", 40), ("kilimani", 25), ("villa", 30), ("garden", 3)]
+
+def make_index() -> SpellingIndex:
+    index = SpellingIndex()
+    index.build(VOCABULARY)
+    return index
+
+def test_description_term_is_not_corrected():
+    index = make_index()
+    assert index.correct_term("garden") == "garden"
+    assert index.correct("villa with garden") is None
+
+def test_misspelling_is_corrected():
+    index = make_index()
+    assert index.correct("kilimni") == "kilimani"
+
+def test_correction_skipped_when_original_matches(monkeypatch, fake_session):
+    monkeypatch.setattr(properties, "spelling_index", make_index())
+    filters = PropertyFilters(search="kilimni")
+
+    # Answers the "does the query as typed match anything" probe
+    fake_session.scalar_value = True
+    result = asyncio.run(correct_filters(fake_session, filters, is_admin=False))
+    assert result.search == "kilimni"
+    assert result.corrections == {}
+    assert fake_session.queries == 1
+
+    fake_session.scalar_value = False
+    result = asyncio.run(correct_filters(fake_session, filters, is_admin=False))
+    assert result.search == "kilimani"
+    assert result.corrections == {"search": "kilimani"}
+
+def test_no_probe_without_corrections(monkeypatch, fake_session):
+    monkeypatch.setattr(properties, "spelling_index", make_index())
+    filters = PropertyFilters(search="garden")
+    assert asyncio.run(correct_filters(fake_session, filters, is_admin=False)) is filters
+    assert fake_session.queries == 0
@@ -0,0 +1,100 @@
+from sqlalchemy import select, update
+from app.models.stored_object import StoredObject
+from app.services import stored_object_service as stored_object_module
+from app.services.stored_object_service import StoredObjectService
+from app.services.storage_service import storage_service, StoredFile
+from app.services.image_service import image_service
+from datetime import datetime, timedelta
+import asyncio
+import pytest
+import uuid
+
+def new_key() -> str:
+    return f"test/{uuid.uuid4()}.jpg"
+
+def stored_file(key: str) -> StoredFile:
+    return StoredFile(key=key, url=storage_service.public_url(key), sha256=None, size=10, content_type="image/jpeg")
+
+@pytest.fixture
+def objects(database, monkeypatch):
+    """StoredObjectService on the test database, with storage deletes recorded"""
+    monkeypatch.setattr(stored_object_module, "AsyncSessionLocal", database)
+    deleted = []
+
+    async def delete_keys(keys):
+        deleted.extend(keys)
+
+    monkeypatch.setattr(storage_service, "delete_keys", delete_keys)
+    service = StoredObjectService()
+    service.grace_period = 3600
+    return service, database, deleted
+
+async def get_row(database, key: str) -> StoredObject:
+    async with database() as session:
+        return (await session.execute(select(StoredObject).where(StoredObject.key == key))).scalar_one_or_none()
+
+async def move_refs(service, database, before, after):
+    async with database() as session:
+        await service.update_refs(session, before, after)
+        await session.commit()
+
+def test_double_claim_keeps_one_unreferenced_row(objects):
+    service, database, _ = objects
+    key = new_key()
+
+    async def run():
+        await service.claim([stored_file(key)])
+        await service.claim([stored_file(key), stored_file(key)])
+        return await get_row(database, key)
+
+    row = asyncio.run(run())
+    assert row.ref_count == 0
+    assert row.released_at is not None
+
+def test_release_to_zero_starts_the_grace_period(objects):
+    service, database, _ = objects
+    key = new_key()
+    url = storage_service.public_url(key)
+
+    async def run():
+        await service.claim([stored_file(key)])
+        # Two galleries share the object, then drop it one after the other
+        await move_refs(service, database, [], [url])
+        await move_refs(service, database, [], [url])
+        shared = await get_row(database, key)
+        await move_refs(service, database, [url], [])
+        kept = await get_row(database, key)
+        await move_refs(service, database, [url], [])
+        released = await get_row(database, key)
+        return shared, kept, released
+
+    shared, kept, released = asyncio.run(run())
+    assert (shared.ref_count, shared.released_at) == (2, None)
+    assert (kept.ref_count, kept.released_at) == (1, None)
+    assert released.ref_count == 0
+    assert released.released_at is not None
+
+def test_collect_garbage_skips_referenced_and_recent_objects(objects):
+    service, database, deleted = objects
+    referenced, recent, expired = new_key(), new_key(), new_key()
+
+    async def run():
+        await service.claim([stored_file(key) for key in (referenced, recent, expired)])
+        await move_refs(service, database, [], [storage_service.public_url(referenced)])
+        async with database() as session:
+            await session.execute(
+                update(StoredObject)
+                .where(StoredObject.key.in_([referenced, expired]))
+                .values(released_at=datetime.utcnow() - timedelta(hours=2))
+            )
+            await session.commit()
+        collected = await service.collect_garbage()
+        return collected, [await get_row(database, key) for key in (referenced, recent, expired)]
+
+    collected, (referenced_row, recent_row, expired_row) = asyncio.run(run())
+    assert collected >= 1
+    assert expired_row is None
+    assert referenced_row is not None and recent_row is not None
+    assert expired in deleted
+    assert set(image_service.variant_keys(expired)) <= set(deleted)
+    assert referenced not in deleted and recent not in deleted
@@ -0,0 +1,85 @@
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from typing import List
+from app.core.uploads import UploadLimitMiddleware, PartSizeCounter, sniff_extension, check_magic_bytes
+import pytest
+
+BOUNDARY = b"test-boundary"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 8
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 12
+
+def multipart(*files: bytes) -> bytes:
+    body = b""
+    for i, content in enumerate(files):
+        body += (
+            b"--" + BOUNDARY + b"\r\n"
+            + f'Content-Disposition: form-data; name="files"; filename="photo{i}.jpg"\r\n'.encode()
+            + b"Content-Type: image/jpeg\r\n\r\n"
+            + content + b"\r\n"
+        )
+    return body + b"--" + BOUNDARY + b"--\r\n"
+
+def chunked(body: bytes, size: int = 1000):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_body_size=20_000, max_part_size=6_000)
+
+    @app.post("/upload")
+    async def upload(files: List[UploadFile] = File(...)):
+        return {"sizes": [file.size for file in files]}
+
+    return TestClient(app)
+
+def post(client, content):
+    return client.post(
+        "/upload", content=content,
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY.decode()}"}
+    )
+
+def test_upload_within_limits(client):
+    response = post(client, chunked(multipart(b"a" * 5000, b"b" * 5000)))
+    assert response.status_code == 200
+    assert response.json() == {"sizes": [5000, 5000]}
+
+def test_declared_length_over_limit_is_refused_up_front(client):
+    response = post(client, multipart(*[b"a" * 5000] * 5))
+    assert response.status_code == 413
+
+def test_streamed_body_over_limit(client):
+    # No Content-Length: only counting the chunks can stop it
+    response = post(client, chunked(multipart(*[b"a" * 5000] * 5)))
+    assert response.status_code == 413
+    assert "20000 bytes" in response.json()["detail"]
+
+def test_part_over_limit(client):
+    response = post(client, chunked(multipart(b"a" * 100, b"b" * 8000)))
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("File exceeds")
+
+def largest_part(body: bytes, chunk_size: int) -> int:
+    counter = PartSizeCounter(BOUNDARY)
+    return max(counter.feed(chunk) for chunk in chunked(body, chunk_size))
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_part_sizes_survive_delimiters_split_across_chunks(chunk_size):
+    body = multipart(b"a" * 300, b"b" * 100)
+    # The largest part is its headers plus 300 bytes of content
+    assert 300 < largest_part(body, len(body)) < 400
+    assert largest_part(body, chunk_size) == largest_part(body, len(body))
+
+def test_sniff_extension():
+    assert sniff_extension(PNG) == "png"
+    assert sniff_extension(JPEG) == "jpg"
+    assert sniff_extension(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert sniff_extension(b"RIFF\x00\x00\x00\x00WAVEfmt ") is None
+    assert sniff_extension(b"MZ\x90\x00") is None
+
+def test_magic_bytes_must_match_the_extension():
+    check_magic_bytes("photo.jpeg", JPEG)
+    with pytest.raises(HTTPException) as e:
+        check_magic_bytes("photo.jpg", PNG)
+    assert e.value.status_code == 415
@@ -0,0 +1,104 @@
+from sqlalchemy import select
+from app.models.property import Property
+from app.services import view_counter as view_counter_module
+from app.services.view_counter import ViewCounter
+import asyncio
+import pytest
+
+@pytest.fixture
+def counter(database, monkeypatch) -> ViewCounter:
+    """A ViewCounter flushing to the test database in batches of two"""
+    monkeypatch.setattr(view_counter_module, "AsyncSessionLocal", database)
+    counter = ViewCounter()
+    counter.batch_size = 2
+    return counter
+
+async def stored_views(database, properties) -> list:
+    async with database() as session:
+        rows = dict((await session.execute(
+            select(Property.id, Property.views).where(Property.id.in_([p.id for p in properties]))
+        )).all())
+    return [rows[p.id] for p in properties]
+
+def test_flush_adds_buffered_views_in_batches(database, add_properties, counter):
+    properties = add_properties({"views": 10}, {"views": None}, {})
+
+    async def run():
+        for property, times in zip(properties, (3, 1, 2)):
+            for _ in range(times):
+                counter.record(property.id)
+        await counter.flush()
+        # A second flush with nothing buffered writes nothing
+        await counter.flush()
+        return await stored_views(database, properties)
+
+    assert asyncio.run(run()) == [13, 1, 2]
+    assert not counter._by_id
+
+def test_flush_leaves_updated_at_alone(database, add_properties, counter):
+    (property,) = add_properties({})
+
+    async def run():
+        async with database() as session:
+            before = await session.scalar(select(Property.updated_at).where(Property.id == property.id))
+        counter.record(property.id)
+        await counter.flush()
+        async with database() as session:
+            return before, await session.scalar(select(Property.updated_at).where(Property.id == property.id))
+
+    before, after = asyncio.run(run())
+    assert after == before
+
+def test_failed_flush_keeps_the_views(database, add_properties, counter, monkeypatch):
+    (property,) = add_properties({"views": 0})
+
+    class BrokenSession:
+        async def __aenter__(self):
+            raise ConnectionError("database is down")
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def run():
+        counter.record(property.id)
+        counter.record(property.id)
+        monkeypatch.setattr(view_counter_module, "AsyncSessionLocal", BrokenSession)
+        await counter.flush()
+        # Views recorded after the failure are added to the retained ones
+        counter.record(property.id)
+        monkeypatch.setattr(view_counter_module, "AsyncSessionLocal", database)
+        await counter.flush()
+        return await stored_views(database, [property])
+
+    assert asyncio.run(run()) == [3]
+
+def test_views_recorded_during_a_flush_wait_for_the_next(database, add_properties, counter, monkeypatch):
+    (property,) = add_properties({"views": 0})
+    statement = counter._update_statement
+
+    def record_while_flushing(batch):
+        counter.record(property.id)
+        return statement(batch)
+
+    monkeypatch.setattr(counter, "_update_statement", record_while_flushing)
+
+    async def run():
+        counter.record(property.id)
+        await counter.flush()
+        return await stored_views(database, [property])
+
+    assert asyncio.run(run()) == [1]
+    assert counter._by_id[property.id] == 1
+
+def test_stop_writes_out_what_is_left(database, add_properties, counter):
+    (property,) = add_properties({"views": 5})
+    counter.interval = 3600
+
+    async def run():
+        counter.start()
+        counter.record(property.id)
+        await counter.stop()
+        return await stored_views(database, [property])
+
+    assert asyncio.run(run()) == [6]
+    assert counter._task is None